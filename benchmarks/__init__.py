@@ -0,0 +1,8 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Benchmarks of the decoders and encoders, over a generated corpus of PDUs.
+
+Run them with `make bench` (or `python -m benchmarks --help` for the options).
+"""
@@ -0,0 +1,80 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Command line of the benchmarks.
+
+    python -m benchmarks                                    # prints the results
+    python -m benchmarks --save benchmarks/baseline.json    # stores a new baseline
+    python -m benchmarks --compare benchmarks/baseline.json # fails on regressions
+"""
+
+import argparse
+import json
+import platform
+import sys
+
+from typing import Any, Dict, List, Optional
+
+from .corpus import generate
+from .suite import compare, measure_import_time, run
+
+
+def _print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"{'benchmark':<24}{'ops/s':>11}{'p50 µs':>9}{'p90 µs':>9}{'p99 µs':>9}{'peak B':>9}{'vs base':>9}")
+    for name, measures in results['benchmarks'].items():
+        change = ''
+        if baseline and name in baseline['benchmarks']:
+            base = baseline['benchmarks'][name]
+            expected = base['ops_per_sec'] * measures['reference'] / base['reference']
+            change = f"{(measures['ops_per_sec'] / expected - 1) * 100:+.0f}%"
+        print(f"{name:<24}{measures['ops_per_sec']:>11.0f}{measures['p50_us']:>9.1f}{measures['p90_us']:>9.1f}"
+              f"{measures['p99_us']:>9.1f}{measures['peak_bytes']:>9.0f}{change:>9}")
+    print(f"import smspdudecoder.easy: {results['import_ms']:.1f} ms")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--count', type=int, default=1000, help="number of PDUs of each kind in the corpus")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the corpus")
+    parser.add_argument('--repeat', type=int, default=7, help="number of timed passes over the corpus")
+    parser.add_argument('--save', metavar='FILE', help="writes the results to FILE, as a new baseline")
+    parser.add_argument('--compare', metavar='FILE', help="compares the results with the baseline in FILE")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="accepted slowdown, as a fraction of the baseline (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if (baseline['count'], baseline['seed']) != (args.count, args.seed):
+            parser.error("the baseline was measured with another corpus")
+
+    corpus = generate(args.count, args.seed)
+    import_ms, import_reference_ms = measure_import_time()
+    results = {
+        'python': platform.python_version(),
+        'count': args.count,
+        'seed': args.seed,
+        'import_ms': import_ms,
+        'import_reference_ms': import_reference_ms,
+        'benchmarks': run(corpus, args.repeat),
+    }
+    _print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+            baseline_file.write('\n')
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Generation of a realistic, reproducible corpus of PDUs.
+
+Most messages are short GSM 7-bit texts from international numbers; the corpus also contains UCS2 and binary
+messages, alphanumeric senders, parts of concatenated messages (with 8-bit and 16-bit references), and SMS-SUBMIT
+TP-DUs with the four validity period formats.
+"""
+
+import random
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from smspdudecoder.codecs import GSM, UCS2
+from smspdudecoder.elements import Date, Number, TypeOfAddress
+
+__all__ = [
+    'Corpus',
+    'generate',
+]
+
+# characters of the basic GSM alphabet, with a few characters of the extension table
+GSM_CHARACTERS = GSM.ALPHABET[32:] + '€[]{}'
+UCS2_CHARACTERS = 'abcdefgh ,.éèàçü€ДЖЯ中文字😀'
+ALPHANUMERIC_SENDERS = ('MyBank', 'Delivery', 'INFO', 'Design@Home', 'Taxi 24', 'PROMO')
+
+
+class Corpus:
+    """
+    PDUs (as hex strings) and values of each kind, used as inputs of the benchmarks.
+    """
+    def __init__(self) -> None:
+        self.deliver: List[str] = []
+        self.submit: List[str] = []
+        self.gsm_texts: List[str] = []
+        self.ucs2_texts: List[str] = []
+        self.dates: List[bytes] = []
+        self.addresses: List[bytes] = []
+
+    @property
+    def gsm_octets(self) -> List[bytes]:
+        return [GSM.encode_bytes(text) for text in self.gsm_texts]
+
+    @property
+    def ucs2_octets(self) -> List[bytes]:
+        return [text.encode('utf-16be') for text in self.ucs2_texts]
+
+    @property
+    def outgoing(self) -> List[Tuple[str, str]]:
+        # (recipient, text) of messages to encode
+        return [('+33612345678', text) for text in self.gsm_texts + self.ucs2_texts]
+
+
+def _text(rnd: random.Random, characters: str, max_length: int) -> str:
+    # short messages are the most common
+    length = min(max_length, int(rnd.expovariate(1 / 40)) + 1)
+    return ''.join(rnd.choice(characters) for _ in range(length))
+
+
+def _number(rnd: random.Random) -> str:
+    return ''.join(rnd.choice('0123456789') for _ in range(rnd.choice((10, 11, 11, 12))))
+
+
+def _address(rnd: random.Random, alphanumeric: bool) -> str:
+    if alphanumeric:
+        name = rnd.choice(ALPHANUMERIC_SENDERS)
+        septets = len(GSM.encode_septets(name))
+        # the length is expressed in semi-octets
+        return f'{(septets * 7 + 3) // 4:02X}D0' + GSM.encode(name)
+    number = _number(rnd)
+    toa = TypeOfAddress.encode({'ton': rnd.choice(('international', 'international', 'national')), 'npi': 'isdn'})
+    return f'{len(number):02X}' + toa.upper() + Number.encode(number)
+
+
+def _smsc(rnd: random.Random) -> str:
+    if rnd.random() < 0.2:
+        return '00'
+    number = Number.encode(_number(rnd))
+    return f'{len(number) // 2 + 1:02X}91' + number
+
+
+def _date(rnd: random.Random) -> datetime:
+    offset = timedelta(minutes=15 * rnd.randint(-48, 56))
+    return datetime(2020, 1, 1, tzinfo=timezone(offset)) + timedelta(seconds=rnd.randrange(4 * 365 * 86400))
+
+
+def _user_data_header(rnd: random.Random) -> bytes:
+    parts_count = rnd.randint(2, 4)
+    part_number = rnd.randint(1, parts_count)
+    if rnd.random() < 0.7:
+        return bytes((5, 0x00, 3, rnd.randrange(256), parts_count, part_number))
+    reference = rnd.randrange(65536)
+    return bytes((6, 0x08, 4, reference >> 8, reference & 0xFF, parts_count, part_number))
+
+
+def _user_data(rnd: random.Random, dcs: int, udhi: bool, corpus: Corpus) -> str:
+    header = _user_data_header(rnd) if udhi else b''
+    if dcs == 0x00:
+        text = _text(rnd, GSM_CHARACTERS, 140 if udhi else 150)
+        corpus.gsm_texts.append(text)
+        septets = GSM.encode_septets(text)
+        # the text starts on the first septet boundary after the header
+        header_septets = (len(header) * 8 + 6) // 7
+        packed = GSM.pack_septets(bytes(header_septets) + septets)
+        return f'{header_septets + len(septets):02X}' + (header + packed[len(header):]).hex().upper()
+    if dcs == 0x08:
+        text = _text(rnd, UCS2_CHARACTERS, 60)
+        corpus.ucs2_texts.append(text)
+        data = header + bytes.fromhex(UCS2.encode(text))
+    else:
+        data = header + bytes(rnd.randrange(256) for _ in range(rnd.randint(1, 120)))
+    return f'{len(data):02X}' + data.hex().upper()
+
+
+def _deliver(rnd: random.Random, corpus: Corpus) -> str:
+    dcs = rnd.choices((0x00, 0x08, 0x04), (80, 15, 5))[0]
+    udhi = rnd.random() < 0.2
+    # TP-MTI deliver, TP-MMS set when there are no more messages
+    first_octet = 0x04 | (0x40 if udhi else 0)
+    sender = _address(rnd, rnd.random() < 0.25)
+    scts = Date.encode(_date(rnd)).upper()
+    corpus.dates.append(bytes.fromhex(scts))
+    corpus.addresses.append(bytes.fromhex(sender))
+    return _smsc(rnd) + f'{first_octet:02X}' + sender + '00' + f'{dcs:02X}' + scts + _user_data(rnd, dcs, udhi, corpus)
+
+
+def _submit(rnd: random.Random, corpus: Corpus) -> str:
+    dcs = rnd.choices((0x00, 0x08, 0x04), (80, 15, 5))[0]
+    udhi = rnd.random() < 0.2
+    vpf = rnd.randrange(4)
+    first_octet = 0x01 | (vpf << 3) | (0x40 if udhi else 0)
+    vp = {
+        0: '',
+        # enhanced format, relative validity in seconds
+        1: '02' + f'{rnd.randrange(256):02X}' + '0000000000',
+        2: f'{rnd.randrange(256):02X}',
+        3: Date.encode(_date(rnd)).upper(),
+    }[vpf]
+    recipient = _address(rnd, False)
+    return (_smsc(rnd) + f'{first_octet:02X}' + f'{rnd.randrange(256):02X}' + recipient + '00' + f'{dcs:02X}' + vp
+            + _user_data(rnd, dcs, udhi, corpus))
+
+
+def generate(count: int = 1000, seed: int = 0) -> Corpus:
+    """
+    Generates a corpus of count SMS-DELIVER and count SMS-SUBMIT TP-DUs. The same seed gives the same corpus.
+    """
+    rnd = random.Random(seed)
+    corpus = Corpus()
+    for _ in range(count):
+        corpus.deliver.append(_deliver(rnd, corpus))
+        corpus.submit.append(_submit(rnd, corpus))
+    return corpus
@@ -0,0 +1,207 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Measurements of throughput, latency, allocations and import time, and comparison with a baseline.
+
+Throughput depends on the machine, and on its load: results are compared with the baseline after scaling them by
+the speed of a reference pure-Python workload, measured along with each benchmark. Import times are scaled by the
+import time of a few standard modules. Allocations are compared as is.
+"""
+
+import gc
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+from smspdudecoder.codecs import GSM, UCS2
+from smspdudecoder.easy import read_incoming_sms
+from smspdudecoder.elements import Date
+from smspdudecoder.fields import Address, SMSDeliver, SMSSubmit
+
+from .corpus import Corpus
+
+__all__ = [
+    'BENCHMARKS',
+    'Benchmark',
+    'compare',
+    'measure_import_time',
+    'run',
+]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    function: Callable[[Any], Any]
+    inputs: Callable[[Corpus], Sequence[Any]]
+
+
+BENCHMARKS = (
+    Benchmark('GSM.decode', GSM.decode, lambda corpus: corpus.gsm_octets),
+    Benchmark('GSM.encode', GSM.encode, lambda corpus: corpus.gsm_texts),
+    Benchmark('UCS2.decode', UCS2.decode, lambda corpus: corpus.ucs2_octets),
+    Benchmark('UCS2.encode', UCS2.encode, lambda corpus: corpus.ucs2_texts),
+    Benchmark('Date.decode', Date.decode, lambda corpus: corpus.dates),
+    Benchmark('Address.decode', Address.decode, lambda corpus: corpus.addresses),
+    Benchmark('SMSDeliver.decode', SMSDeliver.decode, lambda corpus: corpus.deliver),
+    Benchmark('SMSSubmit.decode', SMSSubmit.decode, lambda corpus: corpus.submit),
+    Benchmark('easy.read_incoming_sms', read_incoming_sms, lambda corpus: corpus.deliver),
+    Benchmark('SMSSubmit.encode_parts', lambda message: list(SMSSubmit.encode_parts(*message)),
+              lambda corpus: corpus.outgoing),
+)
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    # nearest-rank percentile
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _pass(function: Callable[[Any], Any], inputs: Sequence[Any]) -> float:
+    start = time.perf_counter()
+    for value in inputs:
+        function(value)
+    return time.perf_counter() - start
+
+
+def _latencies(function: Callable[[Any], Any], inputs: Sequence[Any]) -> List[float]:
+    # includes the overhead of the clock, about 0.1 µs on most platforms
+    clock = time.perf_counter_ns
+    latencies = []
+    for value in inputs:
+        start = clock()
+        function(value)
+        latencies.append((clock() - start) / 1000)
+    latencies.sort()
+    return latencies
+
+
+def _allocations(function: Callable[[Any], Any], inputs: Sequence[Any]) -> Dict[str, float]:
+    peaks = 0
+    retained = 0
+    tracemalloc.start()
+    try:
+        for value in inputs:
+            # clearing the traces resets the peak as well
+            tracemalloc.clear_traces()
+            result = function(value)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks += peak
+            retained += current
+            del result
+    finally:
+        tracemalloc.stop()
+    return {
+        'peak_bytes': round(peaks / len(inputs), 1),
+        'result_bytes': round(retained / len(inputs), 1),
+    }
+
+
+def run(corpus: Corpus, repeat: int = 7, benchmarks: Sequence[Benchmark] = BENCHMARKS) -> Dict[str, Dict[str, float]]:
+    """
+    Runs the benchmarks over the corpus. Returns the measures of each benchmark, by name.
+    """
+    results = dict()
+    for benchmark in benchmarks:
+        inputs = benchmark.inputs(corpus)
+        # warm up the caches
+        for value in inputs:
+            benchmark.function(value)
+        gc.collect()
+        gc.disable()
+        try:
+            # passes of the benchmark alternate with runs of the reference workload, so that both see the same load
+            best = reference_best = float('inf')
+            for _ in range(repeat):
+                reference_best = min(reference_best, _pass(_reference_workload, _REFERENCE_INPUTS))
+                best = min(best, _pass(benchmark.function, inputs))
+            reference = len(_REFERENCE_INPUTS) / reference_best
+            ops = len(inputs) / best
+            latencies = _latencies(benchmark.function, inputs)
+        finally:
+            gc.enable()
+        result = {
+            'calls': len(inputs),
+            'reference': round(reference, 1),
+            'ops_per_sec': round(ops, 1),
+            'p50_us': round(_percentile(latencies, 0.50), 2),
+            'p90_us': round(_percentile(latencies, 0.90), 2),
+            'p99_us': round(_percentile(latencies, 0.99), 2),
+        }
+        result.update(_allocations(benchmark.function, inputs))
+        results[benchmark.name] = result
+    return results
+
+
+_REFERENCE_TABLE = {value: str(value) for value in range(256)}
+_REFERENCE_DATA = bytes(range(256)) * 16
+_REFERENCE_INPUTS = [_REFERENCE_DATA] * 20
+
+
+def _reference_workload(data: bytes) -> None:
+    ''.join([_REFERENCE_TABLE[octet] for octet in data])
+    sum(octet >> 4 for octet in data)
+
+
+# standard modules whose import time is the reference for the import time of the package
+REFERENCE_MODULES = 'json, decimal, email.message, argparse'
+
+
+def _import_time(modules: str, env: Dict[str, str]) -> float:
+    code = f'import time; start = time.perf_counter(); import {modules}; print(time.perf_counter() - start)'
+    output = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE, env=env).stdout
+    return float(output) * 1000
+
+
+def measure_import_time(module: str = 'smspdudecoder.easy', repeat: int = 30) -> Tuple[float, float]:
+    """
+    Returns the median times (in milliseconds) to import the module, and the reference standard modules, in new
+    interpreters. Both are timed in turn, so that a slower machine makes both slower, and medians are steadier than
+    best times.
+
+    Imports are timed with warm bytecode, as installed packages are imported: the interpreters write bytecode (to a
+    temporary directory, from Python 3.8) even if PYTHONDONTWRITEBYTECODE is set, and a first import is not timed.
+    """
+    with tempfile.TemporaryDirectory() as cache:
+        env = {name: value for name, value in os.environ.items() if name != 'PYTHONDONTWRITEBYTECODE'}
+        env['PYTHONPYCACHEPREFIX'] = cache
+        _import_time(module, env)
+        _import_time(REFERENCE_MODULES, env)
+        times = []
+        reference_times = []
+        for _ in range(repeat):
+            times.append(_import_time(module, env))
+            reference_times.append(_import_time(REFERENCE_MODULES, env))
+    return round(statistics.median(times), 2), round(statistics.median(reference_times), 2)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25) -> List[str]:
+    """
+    Compares results with a baseline, both as returned by the command line. Returns the regressions.
+
+    Throughputs are scaled by the speed of the reference workload, and import times by the import time of the
+    reference modules, before being compared. A regression is a throughput lower, or an import time or allocations
+    greater, than the baseline by more than tolerance (a fraction of the baseline).
+    """
+    regressions = []
+    for name, measures in baseline['benchmarks'].items():
+        if name not in current['benchmarks']:
+            regressions.append(f"{name}: missing")
+            continue
+        result = current['benchmarks'][name]
+        expected_ops = measures['ops_per_sec'] * result['reference'] / measures['reference']
+        if result['ops_per_sec'] < expected_ops * (1 - tolerance):
+            regressions.append(f"{name}: {result['ops_per_sec']:.0f} ops/s, expected {expected_ops:.0f}")
+        if result['peak_bytes'] > measures['peak_bytes'] * (1 + tolerance):
+            regressions.append(f"{name}: {result['peak_bytes']:.0f} bytes allocated per call, "
+                               f"expected {measures['peak_bytes']:.0f}")
+    expected_import = baseline['import_ms'] * current['import_reference_ms'] / baseline['import_reference_ms']
+    if current['import_ms'] > expected_import * (1 + tolerance):
+        regressions.append(f"import: {current['import_ms']:.1f} ms, expected {expected_import:.1f}")
+    return regressions
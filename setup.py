@@ -19,10 +19,14 @@ if __name__ == '__main__':
         packages=['smspdudecoder'],
         include_package_data=True,
         zip_safe=False,
-        install_requires=[
-            'bitstring >= 3.1',
-            'pytz',
-        ],
+        install_requires=[],
+        extras_require={
+            'numpy': ['numpy'],
+            'arrow': ['pyarrow'],
+        },
+        entry_points={
+            'console_scripts': ['smspdudecoder=smspdudecoder.cli:main'],
+        },
         classifiers=[
             'Development Status :: 5 - Production/Stable',
             'Intended Audience :: Developers',
@@ -0,0 +1,9 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import sys
+
+from .cli import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Reading of modem output with asyncio, from one or several modems.
+
+Small PDUs are decoded on the event loop, and large ones in an executor, so that bursts of messages do not stall the
+other tasks of the loop. Messages of several modems are merged through bounded queues, taken in turn from each modem.
+"""
+
+import asyncio
+
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple
+from typing import TYPE_CHECKING
+
+from .fields import decode_any
+from .modem import ModemError, ModemStreamParser
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+__all__ = [
+    'Decoder',
+    'merge_modem_streams',
+    'read_modem_stream',
+]
+
+# maximum number of bytes read from a stream at once
+_READ_SIZE = 1 << 16
+
+
+class Decoder:
+    """
+    Decodes PDUs read from modems, on the event loop when they are shorter than offload_octets octets, and in the
+    executor (by default, the default executor of the loop) otherwise.
+
+    Counters of the PDUs decoded on the loop and in the executor are kept in `inline` and `offloaded`.
+    """
+    def __init__(self, offload_octets: int = 100, executor: Optional['Executor'] = None) -> None:
+        self.offload_octets = offload_octets
+        self.executor = executor
+        self.inline = 0
+        self.offloaded = 0
+
+    async def decode(self, pdu: str) -> Dict[str, Any]:
+        """
+        Decodes a PDU with `fields.decode_any`, as `modem.read_modem_output` does.
+        """
+        if len(pdu) // 2 >= self.offload_octets:
+            self.offloaded += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, decode_any, pdu)
+        self.inline += 1
+        message = decode_any(pdu)
+        # reading buffered lines does not give control back to the loop: other tasks run between messages here
+        await asyncio.sleep(0)
+        return message
+
+
+async def read_modem_stream(reader: asyncio.StreamReader, strict: bool = True, decoder: Optional[Decoder] = None
+                            ) -> AsyncIterator[Tuple[Optional[int], Optional[str], Dict[str, Any]]]:
+    """
+    Reads modem output from a stream, such as the reader of `asyncio.open_connection`, until its end.
+
+    Yields (index, status, message) tuples, as `modem.read_modem_output` does, and raises ModemError when the modem
+    reports an error. If strict is False, PDUs that can not be decoded, and lines that can not be parsed, are skipped
+    instead of raising an exception.
+
+    Output is read in chunks, with a `modem.ModemStreamParser`: a PDU is decoded as soon as its last octet is read.
+
+    >>> async def main():
+    ...     reader = asyncio.StreamReader()
+    ...     reader.feed_data(b'+CMT: ,24\\r\\n07916407058099F9040B916407950303F100008921222140140004D4E2940A\\r\\n')
+    ...     reader.feed_eof()
+    ...     return [sms['user_data']['data'] async for index, status, sms in read_modem_stream(reader)]
+    >>> asyncio.run(main())
+    ['TEST']
+    """
+    if decoder is None:
+        decoder = Decoder()
+    parser = ModemStreamParser(decode=None)
+    while True:
+        data = await reader.read(_READ_SIZE)
+        for event in parser.feed(data) if data else parser.feed_eof():
+            if event[0] == 'ok':
+                continue
+            if event[0] == 'error':
+                raise ModemError(event[1])
+            if event[0] == 'invalid':
+                # line too long, or that can not be parsed
+                if strict:
+                    raise event[4]
+                continue
+            _, index, status, pdu = event
+            try:
+                message = await decoder.decode(pdu)
+            except Exception:
+                if strict:
+                    raise
+                continue
+            yield index, status, message
+        if not data:
+            break
+
+
+async def merge_modem_streams(streams: Mapping[str, asyncio.StreamReader], maxsize: int = 16, strict: bool = True,
+                              decoder: Optional[Decoder] = None
+                              ) -> AsyncIterator[Tuple[str, Optional[int], Optional[str], Dict[str, Any]]]:
+    """
+    Reads the output of several modems, given as streams by name, until the end of all streams.
+
+    Yields (name, index, status, message) tuples. Each modem is read by its own task into a queue of at most maxsize
+    messages: a modem is not read any further while its queue is full, and queues are taken from in turn, so that a
+    busy modem does not delay the messages of the others.
+
+    An error of a modem (ModemError, or decoding errors if strict is True) is raised once the messages read before it
+    are yielded, and stops the reading of all modems.
+    """
+    if decoder is None:
+        decoder = Decoder()
+    ready = asyncio.Event()
+    queues: Dict[str, 'asyncio.Queue[Tuple[Optional[int], Optional[str], Dict[str, Any]]]'] = {}
+    tasks: Dict[str, 'asyncio.Task[None]'] = {}
+
+    async def pump(name: str, reader: asyncio.StreamReader) -> None:
+        async for item in read_modem_stream(reader, strict, decoder):
+            await queues[name].put(item)
+            ready.set()
+
+    for name, reader in streams.items():
+        queues[name] = asyncio.Queue(maxsize)
+        tasks[name] = asyncio.ensure_future(pump(name, reader))
+        tasks[name].add_done_callback(lambda task: ready.set())
+    active: List[str] = list(streams)
+    try:
+        while active:
+            ready.clear()
+            for name in list(active):
+                queue = queues[name]
+                if not queue.empty():
+                    yield (name,) + queue.get_nowait()
+                elif tasks[name].done():
+                    active.remove(name)
+                    # raises the error of the modem, if any
+                    tasks[name].result()
+            if active and all(queues[name].empty() for name in active) and not ready.is_set():
+                await ready.wait()
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
@@ -0,0 +1,224 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Memory-mapped archives of PDUs, stored as hex strings, one per line.
+
+The offsets of the lines are found once, and saved to a sidecar index file (an `array('Q')` in native byte order),
+so that an archive can be opened again, and accessed at random, without reading it. PDUs are read from the memory
+map as slices, without reading lines into Python strings.
+"""
+
+import mmap
+import os
+import tempfile
+
+from array import array
+from bisect import bisect_left
+from binascii import unhexlify
+from itertools import accumulate, chain, compress, repeat
+from operator import add
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union, overload
+
+from .fields import SMSDeliver
+
+__all__ = [
+    'PDUArchive',
+]
+
+# size of the parts of the archive split into lines at once, when it is scanned
+_SCAN_CHUNK_SIZE = 1 << 22
+
+_WHITESPACE = b' \t\r\n\x0b\x0c'
+
+_INDEX_MAGIC = 0x3158444955445053  # b'SPDUIDX1', read as a little-endian integer
+# magic number, archive size and modification time, followed by the offsets
+_INDEX_HEADER_LENGTH = 3
+
+
+class PDUArchive:
+    """
+    Archive of hex PDUs, one per line, in a memory-mapped file.
+
+    The index is read from index_path (the archive path followed by '.idx' by default) when it matches the size and
+    modification time of the archive. Otherwise, the archive is scanned, and the index is saved unless save_index is
+    False, or the index can not be written (such as in a read-only directory). Indexes are replaced atomically, so
+    that processes opening the archive at the same time never read a partial index.
+
+    Items are the hex PDUs, as read-only memoryviews over the archive, and slices are lists of them. They must be
+    released before the archive is closed.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     path = os.path.join(directory, 'sms.log')
+    ...     with open(path, 'w') as log:
+    ...         _ = log.write('07916407058099F9040B916407950303F100008921222140140004D4E2940A\\n' * 3)
+    ...     with PDUArchive(path) as archive:
+    ...         print(len(archive), archive.decode(2)['user_data']['data'], os.path.exists(path + '.idx'))
+    3 TEST True
+    """
+    def __init__(self, path: str, index_path: Optional[str] = None, save_index: bool = True) -> None:
+        self.path = path
+        self.index_path = path + '.idx' if index_path is None else index_path
+        with open(path, 'rb') as archive_file:
+            stat = os.fstat(archive_file.fileno())
+            # empty files can not be mapped
+            self._mmap = mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else None
+        self._data = memoryview(self._mmap if self._mmap is not None else b'')
+        self._header = array('Q', (_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns))
+        offsets = self._load_index()
+        if offsets is None:
+            offsets = self._scan()
+            if save_index:
+                self._save_index(offsets)
+        # offsets of the PDUs, followed by the size of the archive
+        self.offsets = offsets
+
+    def _load_index(self) -> Optional[array]:
+        try:
+            with open(self.index_path, 'rb') as index_file:
+                content = index_file.read()
+        except FileNotFoundError:
+            return None
+        index = array('Q')
+        header_size = _INDEX_HEADER_LENGTH * index.itemsize
+        if len(content) % index.itemsize or content[:header_size] != self._header.tobytes():
+            return None
+        index.frombytes(content[header_size:])
+        # the offsets end with the size of the archive
+        if not index or index[-1] != self._header[1]:
+            return None
+        return index
+
+    def _save_index(self, offsets: array) -> None:
+        directory, name = os.path.split(os.path.abspath(self.index_path))
+        try:
+            descriptor, temporary_path = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', dir=directory)
+        except OSError:
+            return
+        try:
+            with open(descriptor, 'wb') as index_file:
+                self._header.tofile(index_file)
+                offsets.tofile(index_file)
+            os.replace(temporary_path, self.index_path)
+        except OSError:
+            try:
+                os.unlink(temporary_path)
+            except OSError:
+                pass
+
+    def _scan(self) -> array:
+        offsets = array('Q')
+        position = 0
+        size = len(self._data)
+        while position < size:
+            # whole lines, of about _SCAN_CHUNK_SIZE octets
+            end = self._mmap.find(b'\n', min(position + _SCAN_CHUNK_SIZE, size)) + 1 or size
+            lines = self._mmap[position:end].split(b'\n')
+            starts = accumulate(chain((position,), map(add, map(len, lines), repeat(1))))
+            # blank lines are skipped
+            offsets.extend(compress(starts, map(bytes.strip, lines)))
+            position = end
+        offsets.append(size)
+        return offsets
+
+    def close(self) -> None:
+        """
+        Unmaps the archive. Raises BufferError if PDUs read from the archive are not released yet.
+        """
+        self._data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> 'PDUArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _span(self, index: int) -> Tuple[int, int]:
+        start = self.offsets[index]
+        end = self.offsets[index + 1]
+        data = self._data
+        # lines may start with spaces, and the next offset is the one of the next non-blank line
+        while data[start] in _WHITESPACE:
+            start += 1
+        while data[end - 1] in _WHITESPACE:
+            end -= 1
+        return start, end
+
+    @overload
+    def __getitem__(self, index: int) -> memoryview: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[memoryview]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[memoryview, List[memoryview]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Archive index out of range")
+        start, end = self._span(index)
+        return self._data[start:end]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def decode(self, index: int, decoder: Callable[[Any], Any] = SMSDeliver.decode) -> Any:
+        """
+        Decodes the PDU at the given index, with `SMSDeliver.decode` by default.
+        """
+        with self[index] as pdu:
+            return decoder(unhexlify(pdu))
+
+    def decode_range(self, start: int = 0, stop: Optional[int] = None,
+                     decoder: Callable[[Any], Any] = SMSDeliver.decode,
+                     strict: bool = True) -> Iterator[Tuple[int, Any]]:
+        """
+        Decodes the PDUs from start to stop (the end of the archive by default), yielding (index, message) tuples.
+
+        If strict is False, PDUs that can not be decoded are skipped instead of raising an exception.
+        """
+        for index in range(*slice(start, stop).indices(len(self))):
+            try:
+                message = self.decode(index, decoder)
+            except Exception:
+                if strict:
+                    raise
+                continue
+            yield index, message
+
+    def partitions(self, count: int) -> List[range]:
+        """
+        Splits the indexes of the archive into at most count ranges of about the same size in octets, for instance to
+        decode an archive in several processes, each opening the archive (which then reads the saved index).
+
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as directory:
+        ...     path = os.path.join(directory, 'sms.log')
+        ...     with open(path, 'w') as log:
+        ...         _ = log.write('00\\n' * 10)
+        ...     with PDUArchive(path, save_index=False) as archive:
+        ...         archive.partitions(3)
+        [range(0, 4), range(4, 7), range(7, 10)]
+        """
+        if count < 1:
+            raise ValueError("The number of partitions must be positive")
+        offsets = self.offsets
+        length = len(self)
+        boundaries = [0]
+        for part in range(1, count):
+            # first PDU starting at or after the part-th fraction of the archive
+            target = offsets[0] + (offsets[length] - offsets[0]) * part // count if length else 0
+            boundary = bisect_left(offsets, target, boundaries[-1], length)
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+        if length > boundaries[-1]:
+            boundaries.append(length)
+        return [range(start, stop) for start, stop in zip(boundaries, boundaries[1:])]
@@ -0,0 +1,230 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Batch decoding of PDUs, optionally spread over a pool of processes or threads.
+
+PDUs are sent to workers in chunks. Results come back in order (or as soon as their chunk is decoded), and errors
+are reported per item instead of aborting the whole batch.
+"""
+
+import os
+import time
+
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # imported when decoding, as they pull in multiprocessing, which is slow to import
+    from concurrent.futures import Executor, Future
+
+__all__ = [
+    'BatchItem',
+    'BatchResults',
+    'BatchStats',
+    'decode_many',
+]
+
+
+class BatchItem(NamedTuple):
+    """
+    Outcome of the decoding of the PDU at the given position of the batch: either result or error is None.
+    """
+    position: int
+    result: Any
+    error: Optional[BaseException]
+
+
+class BatchStats:
+    """
+    Counters of a batch, updated while results are consumed.
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Seconds elapsed since the batch started, until it finished (or until now if it is still running).
+        """
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        """
+        Number of decoded PDUs (including errors) per second.
+        """
+        elapsed = self.elapsed
+        return self.count / elapsed if elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f'<BatchStats count={self.count} errors={self.errors} '
+            f'elapsed={self.elapsed:.3f}s throughput={self.throughput:.0f}/s>'
+        )
+
+
+class _Packed(tuple):
+    """
+    Packed dictionary: a (keys, values) tuple, told apart from the tuples of results.
+    """
+    __slots__ = ()
+
+
+# Key tuples of packed dictionaries are shared, so that pickle only serializes them once per chunk
+_PACKED_KEYS: Dict[Tuple[str, ...], Tuple[str, ...]] = dict()
+
+
+def _pack(value: Any) -> Any:
+    """
+    Converts nested dictionaries to compact (keys, values) tuples.
+
+    >>> _pack({'a': 1, 'b': [{'c': None}]})
+    (('a', 'b'), (1, [(('c',), (None,))]))
+    """
+    if isinstance(value, dict):
+        keys = tuple(value)
+        return _Packed((_PACKED_KEYS.setdefault(keys, keys), tuple([_pack(v) for v in value.values()])))
+    if isinstance(value, list):
+        return [_pack(v) for v in value]
+    return value
+
+
+def _unpack(value: Any) -> Any:
+    """
+    Reverse operation of `_pack`. Tuples of results are left untouched.
+
+    >>> _unpack(_pack({'a': (1, 2), 'b': [{'c': None}]}))
+    {'a': (1, 2), 'b': [{'c': None}]}
+    """
+    if type(value) is _Packed:
+        keys, values = value
+        return dict(zip(keys, [_unpack(v) for v in values]))
+    if isinstance(value, list):
+        return [_unpack(v) for v in value]
+    return value
+
+
+def _decode_chunk(decoder: Callable[[Any], Any], start: int, pdus: List[Any], pack: bool) -> List[Tuple[Any, ...]]:
+    results: List[Tuple[Any, ...]] = list()
+    for position, pdu in enumerate(pdus, start):
+        try:
+            result = decoder(pdu)
+        except Exception as e:
+            results.append((position, None, e))
+        else:
+            results.append((position, _pack(result) if pack else result, None))
+    return results
+
+
+class BatchResults:
+    """
+    Iterable over the `BatchItem` of a batch. The batch is decoded lazily, while iterating.
+    """
+    def __init__(self, decoder: Callable[[Any], Any], pdus: Iterable[Any], workers: Optional[int],
+                 executor: Union[str, 'Executor'], chunksize: int, ordered: bool) -> None:
+        if chunksize < 1:
+            raise ValueError("Chunk size must be positive")
+        if isinstance(executor, str) and executor not in ('process', 'thread'):
+            raise ValueError(f"Unknown executor \"{executor}\"")
+        self.decoder = decoder
+        self.pdus = pdus
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.executor = executor
+        self.chunksize = chunksize
+        self.ordered = ordered
+        self.stats = BatchStats()
+
+    def _chunks(self) -> Iterator[Tuple[int, List[Any]]]:
+        pdus = iter(self.pdus)
+        start = 0
+        while True:
+            chunk = list(islice(pdus, self.chunksize))
+            if not chunk:
+                return
+            yield start, chunk
+            start += len(chunk)
+
+    def _decoded_chunks(self) -> Iterator[List[Tuple[Any, ...]]]:
+        if not self.workers:
+            for start, chunk in self._chunks():
+                yield _decode_chunk(self.decoder, start, chunk, False)
+            return
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+        owned = isinstance(self.executor, str)
+        pool: 'Executor'
+        if self.executor == 'process':
+            pool = ProcessPoolExecutor(max_workers=self.workers)
+        elif self.executor == 'thread':
+            pool = ThreadPoolExecutor(max_workers=self.workers)
+        else:
+            pool = self.executor # type: ignore
+        pack = not isinstance(pool, ThreadPoolExecutor)
+        # a bounded number of chunks is in flight, so that huge batches are not loaded in memory at once
+        max_pending = 2 * self.workers
+        pending: Deque['Future'] = deque()
+        chunks = self._chunks()
+        try:
+            while True:
+                for start, chunk in islice(chunks, max_pending - len(pending)):
+                    future = pool.submit(_decode_chunk, self.decoder, start, chunk, pack)
+                    pending.append(future)
+                if not pending:
+                    return
+                if self.ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = done.pop()
+                    pending.remove(future)
+                results = future.result()
+                if pack:
+                    results = [(position, _unpack(result), error) for position, result, error in results]
+                yield results
+        finally:
+            for future in pending:
+                future.cancel()
+            if owned:
+                pool.shutdown()
+
+    def __iter__(self) -> Iterator[BatchItem]:
+        stats = self.stats
+        stats.started = time.perf_counter()
+        stats.finished = None
+        for results in self._decoded_chunks():
+            for item in results:
+                stats.count += 1
+                if item[2] is not None:
+                    stats.errors += 1
+                yield BatchItem(*item)
+        stats.finished = time.perf_counter()
+
+
+def decode_many(decoder: Callable[[Any], Any], pdus: Iterable[Any], workers: Optional[int] = None,
+                executor: Union[str, 'Executor'] = 'process', chunksize: int = 1000,
+                ordered: bool = True) -> BatchResults:
+    """
+    Decodes PDUs with the given decoder (which must be picklable when using processes, such as
+    `SMSDeliver.decode`), and returns an iterable of `BatchItem`.
+
+    - workers: number of workers, defaults to the number of CPUs. Use 0 to decode in the current thread.
+    - executor: 'process', 'thread', or an existing `concurrent.futures.Executor`.
+    - chunksize: number of PDUs sent to a worker at once.
+    - ordered: if False, results are returned as soon as their chunk is decoded.
+
+    Results cross the process boundaries as compact tuples. Throughput can be read from the `stats` attribute.
+
+    >>> results = decode_many(int, ['12', 'X', '3'], workers=0)
+    >>> [(item.position, item.result, type(item.error).__name__) for item in results]
+    [(0, 12, 'NoneType'), (1, None, 'ValueError'), (2, 3, 'NoneType')]
+    >>> results.stats.count, results.stats.errors
+    (3, 1)
+    """
+    return BatchResults(decoder, pdus, workers, executor, chunksize, ordered)
@@ -0,0 +1,159 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Bounded caches of decoded PDUs and fields, for PDUs and addresses that are decoded over and over again: retries,
+listings of the same storage, duplicate deliveries, or the same senders and SMS-C.
+
+Cached results are shared: dictionaries are copied when they are read, so that changing a result does not change
+the cache.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple
+
+from .fields import Address, SMSC, SMSDeliver
+from .reader import PDUData
+
+__all__ = [
+    'CacheStats',
+    'CachedDecoder',
+    'LRUCache',
+    'disable_field_caches',
+    'enable_field_caches',
+]
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """
+    Cache of at most maxsize values, dropping the least recently used value first.
+
+    >>> cache = LRUCache(maxsize=2)
+    >>> [cache.get(key, str.upper) for key in ('a', 'b', 'a', 'c', 'b')]
+    ['A', 'B', 'A', 'C', 'B']
+    >>> cache.stats
+    CacheStats(hits=1, misses=4, evictions=2, size=2, maxsize=2)
+    """
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 1:
+            raise ValueError("The size of the cache must be positive")
+        self.maxsize = maxsize
+        # values, from the least to the most recently used
+        self.values: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def get(self, key: Hashable, compute: Callable[[Any], Any]) -> Any:
+        """
+        Returns the value of the key, computed with compute(key) if it is not cached yet.
+        Exceptions raised by compute are not cached.
+        """
+        values = self.values
+        try:
+            value = values[key]
+        except KeyError:
+            self.misses += 1
+            value = values[key] = compute(key)
+            if len(values) > self.maxsize:
+                values.popitem(last=False)
+                self.evictions += 1
+            return value
+        values.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def clear(self) -> None:
+        """
+        Drops all values. Counters are kept.
+        """
+        self.values.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self.values), self.maxsize)
+
+
+def _copy(value: Any) -> Any:
+    # copies dictionaries and lists, other values of decoded PDUs being immutable
+    if type(value) is dict:
+        value = value.copy()
+        for key, item in value.items():
+            if type(item) is dict or type(item) is list:
+                value[key] = _copy(item)
+    elif type(value) is list:
+        value = [_copy(item) if type(item) is dict or type(item) is list else item for item in value]
+    return value
+
+
+class CachedDecoder:
+    """
+    Decoder of PDUs (`SMSDeliver.decode` by default) with an LRUCache of results, by PDU.
+
+    Hex strings and raw octets are cached separately, and hex strings are not normalized: the same PDU in lowercase
+    and uppercase is cached twice. File-like objects and readers are decoded without cache.
+
+    Results are copied when copy is True. Immutable results, such as the records of `SMSDeliver.decode_record`,
+    do not need to be.
+
+    >>> decode = CachedDecoder(SMSDeliver.decode, maxsize=1000)
+    >>> for _ in range(3):
+    ...     sms = decode('07916407058099F9040B916407950303F100008921222140140004D4E2940A')
+    >>> sms['user_data']['data'], decode.cache.stats.hits
+    ('TEST', 2)
+    """
+    def __init__(self, decoder: Callable[[Any], Any] = SMSDeliver.decode, maxsize: int = 4096,
+                 copy: bool = True) -> None:
+        self.decoder = decoder
+        self.cache = LRUCache(maxsize)
+        self.copy = copy
+
+    def __call__(self, pdu_data: PDUData) -> Any:
+        if isinstance(pdu_data, (bytearray, memoryview)):
+            pdu_data = bytes(pdu_data)
+        elif not isinstance(pdu_data, (str, bytes)):
+            return self.decoder(pdu_data)
+        result = self.cache.get(pdu_data, self.decoder)
+        return _copy(result) if self.copy else result
+
+
+def enable_field_caches(maxsize: int = 4096) -> Dict[str, LRUCache]:
+    """
+    Caches decoded addresses (`Address.read` and `Address.read_record`) and SMS-C information (`SMSC.read` and
+    `SMSC.read_record`) by encoded value, in LRUCaches of maxsize values, which are returned by field name. These caches
+    are used by all decoders of the process, including records and exports.
+
+    >>> caches = enable_field_caches(maxsize=100)
+    >>> [Address.decode('0BD0CDE6DB5DCE03')['number'] for _ in range(2)]
+    ['MMoney', 'MMoney']
+    >>> caches['address'].stats
+    CacheStats(hits=1, misses=1, evictions=0, size=1, maxsize=100)
+    >>> disable_field_caches()
+    """
+    Address.cache = LRUCache(maxsize)
+    SMSC.cache = LRUCache(maxsize)
+    return {'address': Address.cache, 'smsc': SMSC.cache}
+
+
+def disable_field_caches() -> None:
+    """
+    Stops caching decoded addresses and SMS-C information.
+    """
+    Address.cache = None
+    SMSC.cache = None
@@ -0,0 +1,209 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Decodes SMS PDUs from files or the standard input, to JSON Lines or CSV.
+
+    python -m smspdudecoder capture.log > sms.jsonl
+    python -m smspdudecoder --input modem --format csv --workers 4 --errors errors.jsonl < modem.log > sms.csv
+
+Input is read one hex PDU per line, or as the output of a modem in PDU mode (+CMGL, +CMGR and +CMT responses).
+SMS-DELIVER, SMS-SUBMIT and SMS-STATUS-REPORT TP-DUs are told apart by their Message Type Indicator.
+
+The exit status is 1 if some PDUs could not be decoded, or if the modem reported errors.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from datetime import datetime
+from functools import partial
+from itertools import tee
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .batch import decode_many
+from .easy import read_incoming_sms, read_outgoing_sms, read_status_report
+from .fields import SMSDeliver, SMSStatusReport, SMSSubmit, decoder_for_tpdu
+from .modem import ModemOutputParser
+
+__all__ = [
+    'CSV_COLUMNS',
+    'main',
+]
+
+# buffer sizes of input and output files
+_BUFFER_SIZE = 1 << 20
+
+CSV_COLUMNS = ('type', 'number', 'date', 'content', 'reference', 'parts_count', 'part_number', 'message_ref', 'status')
+
+# types and simplified readers of TP-DUs, by decoder
+_TYPES = {
+    SMSDeliver: ('deliver', read_incoming_sms),
+    SMSSubmit: ('submit', read_outgoing_sms),
+    SMSStatusReport: ('status-report', read_status_report),
+}
+
+# (source, line number, PDU, fields of the modem response, error) of the PDUs to decode, and of the modem errors,
+# whose PDU is the line of the error
+_Input = Tuple[str, int, str, Optional[Dict[str, Any]], Optional[str]]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex().upper()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _convert(item: Tuple[str, Optional[Dict[str, Any]]], output_format: str, easy: bool) -> Any:
+    # decodes a PDU in a worker, and returns a JSON line, or a CSV row
+    pdu, modem_fields = item
+    data = bytes.fromhex(pdu)
+    decoder = decoder_for_tpdu(data)
+    message_type, read_easy = _TYPES[decoder]
+    if output_format == 'csv':
+        sms = read_easy(data)
+        if decoder is SMSDeliver:
+            partial_sms = sms['partial'] or {}
+            return [message_type, sms['sender'], sms['date'].isoformat(), sms['content'], partial_sms.get('reference'),
+                    partial_sms.get('parts_count'), partial_sms.get('part_number'), None, None]
+        if decoder is SMSSubmit:
+            return [message_type, sms['recipient'], None, sms['content'], None, None, None, None, None]
+        return [message_type, sms['recipient'], sms['discharge_date'].isoformat(), None, None, None, None,
+                sms['reference'], sms['reason'] or sms['status']]
+    message = read_easy(data) if easy else decoder.decode(data)
+    record: Dict[str, Any] = {'type': message_type}
+    if modem_fields is not None:
+        record['modem'] = modem_fields
+    record.update(message)
+    return json.dumps(record, ensure_ascii=False, default=_json_default)
+
+
+def _read_lines(sources: List[str]) -> Iterator[Tuple[str, int, str]]:
+    for source in sources:
+        if source == '-':
+            input_file = sys.stdin.buffer
+        else:
+            input_file = open(source, 'rb', buffering=_BUFFER_SIZE)
+        try:
+            for line_number, line in enumerate(input_file, 1):
+                yield source, line_number, line.decode('latin-1')
+        finally:
+            if input_file is not sys.stdin.buffer:
+                input_file.close()
+
+
+def _read_pdus(sources: List[str], input_format: str) -> Iterator[_Input]:
+    lines = _read_lines(sources)
+    if input_format == 'lines':
+        for source, line_number, line in lines:
+            line = line.strip()
+            if line:
+                yield source, line_number, line, None, None
+        return
+    parser = ModemOutputParser()
+    for source, line_number, line in lines:
+        try:
+            event = parser.feed_line(line)
+        except Exception as error:
+            parser.pending = parser.pending_length = None
+            event = ('invalid', None, None, line.strip(), error)
+        if event is None or event[0] == 'ok':
+            continue
+        if event[0] == 'error':
+            yield source, line_number, event[1], None, 'ModemError'
+        elif event[0] == 'invalid':
+            # lines that can not be parsed, such as message headers of text mode
+            yield source, line_number, event[3], None, f'{type(event[4]).__name__}: {event[4]}'
+        else:
+            _, index, status, pdu = event
+            yield source, line_number, pdu, {'index': index, 'status': status}, None
+
+
+def _write_error(errors_file: Optional[TextIO], source: str, line_number: int, pdu: str, error: str) -> None:
+    if errors_file is not None:
+        record = {'source': source, 'line': line_number, 'pdu': pdu, 'error': error}
+        errors_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def _open_output(path: Optional[str]) -> TextIO:
+    if path is None or path == '-':
+        return open(sys.stdout.fileno(), 'w', buffering=_BUFFER_SIZE, encoding='utf-8', newline='', closefd=False)
+    return open(path, 'w', buffering=_BUFFER_SIZE, encoding='utf-8', newline='')
+
+
+def _decode(inputs: Iterable[_Input], output: TextIO, errors_file: Optional[TextIO], output_format: str,
+            easy: bool, workers: int, chunksize: int) -> Tuple[int, int, int]:
+    inputs, sources = tee(inputs)
+    results = decode_many(partial(_convert, output_format=output_format, easy=easy),
+                          ((pdu, modem_fields) for _, _, pdu, modem_fields, error in inputs if error is None),
+                          workers=workers, chunksize=chunksize)
+    writer = csv.writer(output, lineterminator='\n')
+    if output_format == 'csv':
+        writer.writerow(CSV_COLUMNS)
+    items = iter(results)
+    modem_errors = 0
+    # results are ordered: they are matched with the sources of their PDUs, and modem errors are written in between
+    for source, line_number, pdu, _, error in sources:
+        if error is not None:
+            _write_error(errors_file, source, line_number, pdu, error)
+            modem_errors += 1
+            continue
+        item = next(items)
+        if item.error is not None:
+            _write_error(errors_file, source, line_number, pdu, f'{type(item.error).__name__}: {item.error}')
+        elif output_format == 'csv':
+            writer.writerow(item.result)
+        else:
+            output.write(item.result)
+            output.write('\n')
+    # finishes the batch, which shuts its workers down
+    next(items, None)
+    return results.stats.count, results.stats.errors, modem_errors
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m smspdudecoder', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('files', nargs='*', default=['-'], metavar='FILE',
+                        help="files to decode, the standard input by default (or with -)")
+    parser.add_argument('--input', choices=('lines', 'modem'), default='lines',
+                        help="one hex PDU per line (default), or modem output")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl',
+                        help="JSON Lines of decoded fields (default), or CSV of the sender or recipient, date, text, "
+                             "concatenation, and status of status reports")
+    parser.add_argument('--easy', action='store_true',
+                        help="writes the simplified messages of the easy module as JSON")
+    parser.add_argument('-o', '--output', metavar='FILE', help="output file, the standard output by default")
+    parser.add_argument('--errors', metavar='FILE',
+                        help="writes the PDUs that can not be decoded, and their errors, to FILE as JSON Lines")
+    parser.add_argument('-w', '--workers', type=int, default=0,
+                        help="number of decoding processes, 0 (default) to decode in the current process")
+    parser.add_argument('--chunksize', type=int, default=1000, help="number of PDUs sent to a process at once")
+    parser.add_argument('-q', '--quiet', action='store_true', help="does not print the summary")
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("the number of workers can not be negative")
+    if args.chunksize < 1:
+        parser.error("the chunk size must be positive")
+
+    started = time.perf_counter()
+    output = _open_output(args.output)
+    errors_file = open(args.errors, 'w', buffering=_BUFFER_SIZE, encoding='utf-8') if args.errors else None
+    try:
+        inputs = _read_pdus(args.files, args.input)
+        count, errors, modem_errors = _decode(inputs, output, errors_file, args.format, args.easy, args.workers,
+                                              args.chunksize)
+    finally:
+        output.close()
+        if errors_file is not None:
+            errors_file.close()
+    elapsed = time.perf_counter() - started
+
+    if not args.quiet:
+        print(f"{count - errors} PDUs decoded, {errors} errors, {modem_errors} modem errors, "
+              f"in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.0f} PDUs/s)", file=sys.stderr)
+    return 1 if errors or modem_errors else 0
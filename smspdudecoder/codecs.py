@@ -3,14 +3,75 @@
 
 """
 Implementation of different codecs used in SMS PDUs, according to the GSM 03.38 specification.
+
+National language locking and single shift tables (3GPP TS 23.038) are bundled for Turkish, Spanish, Portuguese,
+the Indic languages and Urdu. Other tables can be added with `GSM.add_shift_tables`.
 """
 
 from binascii import hexlify
 from binascii import unhexlify
-from bitstring import BitStream
+from codecs import charmap_decode
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
 
 __all__ = ['GSM', 'UCS2']
 
+# Under these sizes, (un)packing septets one by one is faster than the mask-based method
+_SMALL_PACKED_LENGTH = 32
+_SMALL_SEPTETS_COUNT = 64
+
+
+def _encoding_table(alphabet: str, alphabet_ext: Dict[int, str], char_ext: int) -> Dict[int, str]:
+    table = {k: '\x80' for k in range(128)}
+    for septet, char in enumerate(alphabet):
+        table[ord(char)] = chr(septet)
+    if alphabet[0x20] == ' ':
+        # unassigned septets of locking shift tables are decoded as spaces, which are encoded as 0x20
+        table[ord(' ')] = ' '
+    for septet, char in alphabet_ext.items():
+        # characters of both tables are encoded with a single septet
+        if table.get(ord(char), '\x80') == '\x80':
+            table[ord(char)] = chr(char_ext) + chr(septet)
+    table[ord(alphabet[char_ext])] = '\x80'
+    return table
+
+
+# Layout of the Indic locking shift tables (3GPP TS 23.038 A.3.4 to A.3.12): offsets of characters in the Unicode
+# block of the script, and characters shared by all scripts. The character at 0x60 and the last five ones are not
+# part of the layout.
+_INDIC_LOCKING_SHIFT: List[Union[int, str]] = [
+    1, 2, 3, *range(0x05, 0x0C), '\n', 0x0C, 0x0D, '\r', 0x0E, 0x0F, *range(0x10, 0x1B), '\x1B', *range(0x1B, 0x1F),
+    ' ', '!', *range(0x1F, 0x25), ')', '(', 0x25, 0x26, ',', 0x27, '.', 0x28, *'0123456789:;', 0x29, 0x2A, 0x2B, '?',
+    *range(0x2C, 0x3A), 0x3C, 0x3D, *range(0x3E, 0x4E),
+]
+
+
+def _indic_locking_shift(block: int, unassigned: Tuple[int, ...], characters: str) -> str:
+    # unassigned offsets are decoded as spaces, and characters are the ones at 0x60 and from 0x7B
+    alphabet = ''.join(' ' if offset in unassigned else chr(block + offset) if isinstance(offset, int) else offset
+                       for offset in _INDIC_LOCKING_SHIFT)
+    return alphabet + characters[0] + 'abcdefghijklmnopqrstuvwxyz' + characters[1:]
+
+
+# characters shared by the Indic and Urdu single shift tables (3GPP TS 23.038 A.2.4 to A.2.13), by runs starting at
+# a septet
+_INDIC_SINGLE_SHIFT = {
+    0x00: '@£$¥¿"¤%&\'\f*+', 0x0E: '-/<=>¡^¡_#*', 0x28: '{}', 0x2F: '\\', 0x3C: '[~]',
+    0x40: '|ABCDEFGHIJKLMNOPQRSTUVWXYZ', 0x65: '€',
+}
+
+
+def _indic_single_shift(characters: Dict[int, str]) -> Dict[int, str]:
+    # characters of the script are given by runs starting at a septet too, spaces being unassigned septets
+    table: Dict[int, str] = {}
+    for runs in (_INDIC_SINGLE_SHIFT, characters):
+        for start, run in runs.items():
+            table.update((start + k, char) for k, char in enumerate(run) if char != ' ')
+    return table
+
+
+# codecs of national language shift tables, by (locking shift, single shift) language identifiers
+_LANGUAGE_CODECS: Dict[Tuple[int, int], Type['GSM']] = {}
+
 
 class GSM:
     """
@@ -37,10 +98,185 @@ class GSM:
 
     CHAR_EXT = 0x1B
 
+    # text to septets translation table, characters that can not be encoded being mapped to a non-ASCII character
+    ENCODING_TABLE = _encoding_table(ALPHABET, ALPHABET_EXT, CHAR_EXT)
+
+    # extended alphabet indexed by septet, undefined characters being decoded as spaces
+    ALPHABET_EXT_TABLE = ''.join(map(ALPHABET_EXT.get, range(128), ' ' * 128))
+
+    # national language identifiers, signalled by the Information Elements 0x24 (single shift) and 0x25 (locking
+    # shift) of the User Data Header
+    LANGUAGES = {
+        'turkish': 1,
+        'spanish': 2,
+        'portuguese': 3,
+        'bengali': 4,
+        'gujarati': 5,
+        'hindi': 6,
+        'kannada': 7,
+        'malayalam': 8,
+        'oriya': 9,
+        'punjabi': 10,
+        'tamil': 11,
+        'telugu': 12,
+        'urdu': 13,
+    }
+
+    # national language locking shift tables, replacing the alphabet, by language identifier
+    LOCKING_SHIFTS = {
+        1: (
+            '@£$¥€éùıòÇ\nĞğ\rÅåΔ_ΦΓΛΩΠΨΣΘΞ\x1BŞşßÉ !"#¤%&\'()*+,-./0123456789:;<=>?'
+            'İABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§çabcdefghijklmnopqrstuvwxyzäöñüà'
+        ),
+        3: (
+            '@£$¥êéúíóç\nÔô\rÁáΔ_ªÇÀ∞^\\€Ó|\x1BÂâÊÉ !"#º%&\'()*+,-./0123456789:;<=>?'
+            'ÍABCDEFGHIJKLMNOPQRSTUVWXYZÃÕÚÜ§~abcdefghijklmnopqrstuvwxyzãõ`üà'
+        ),
+        4: _indic_locking_shift(0x0980, (0x0D, 0x0E, 0x11, 0x12, 0x29, 0x31, 0x33, 0x34, 0x35, 0x45, 0x46, 0x49, 0x4A),
+                                '\u09CE\u09D7\u09DC\u09DD\u09F0\u09F1'),
+        5: _indic_locking_shift(0x0A80, (0x0E, 0x12, 0x29, 0x31, 0x34, 0x46, 0x4A),
+                                '\u0AD0\u0AE0\u0AE1\u0AE2\u0AE3\u0AF1'),
+        6: _indic_locking_shift(0x0900, (), '\u0950\u0972\u097B\u097C\u097E\u097F'),
+        7: _indic_locking_shift(0x0C80, (0x01, 0x0D, 0x11, 0x29, 0x34, 0x45, 0x49),
+                                '\u0CD5\u0CD6\u0CE0\u0CE1\u0CE2\u0CE3'),
+        8: _indic_locking_shift(0x0D00, (0x01, 0x0D, 0x11, 0x29, 0x3C, 0x45, 0x49),
+                                '\u0D57\u0D60\u0D61\u0D62\u0D63\u0D79'),
+        9: _indic_locking_shift(0x0B00, (0x0D, 0x0E, 0x11, 0x12, 0x29, 0x31, 0x34, 0x45, 0x46, 0x49, 0x4A),
+                                '\u0B56\u0B57\u0B60\u0B61\u0B62\u0B63'),
+        10: _indic_locking_shift(0x0A00, (0x0B, 0x0C, 0x0D, 0x0E, 0x11, 0x12, 0x29, 0x31, 0x34, 0x37, 0x3D, 0x43, 0x44,
+                                          0x45, 0x46, 0x49, 0x4A),
+                                 '\u0A51\u0A70\u0A71\u0A72\u0A73\u0A74'),
+        11: _indic_locking_shift(0x0B80, (0x01, 0x0B, 0x0C, 0x0D, 0x11, 0x16, 0x17, 0x18, 0x1B, 0x1D, 0x20, 0x21, 0x22,
+                                          0x25, 0x26, 0x27, 0x2B, 0x2C, 0x2D, 0x3C, 0x3D, 0x43, 0x44, 0x45, 0x49),
+                                 '\u0BD0\u0BD7\u0BF0\u0BF1\u0BF2\u0BF9'),
+        12: _indic_locking_shift(0x0C00, (0x0D, 0x11, 0x29, 0x34, 0x3C, 0x45, 0x49),
+                                 '\u0C55\u0C56\u0C60\u0C61\u0C62\u0C63'),
+        13: (
+            '\u0627\u0622\u0628\u067B\u0680\u067E\u06A6\u062A\u06C2\u067F\n\u0679\u067D\r\u067A\u067C'
+            '\u062B\u062C\u0681\u0684\u0683\u0685\u0686\u0687\u062D\u062E\u062F\x1B\u068C\u0688\u0689\u068A'
+            ' !\u068F\u068D\u0630\u0631\u0691\u0693)(\u0699\u0632,\u0696.\u0698'
+            '0123456789:;\u069A\u0633\u0634?'
+            '\u0635\u0636\u0637\u0638\u0639\u0641\u0642\u06A9\u06AA\u06AB\u06AF\u06B3\u06B1\u0644\u0645\u0646'
+            '\u06BA\u06BB\u06BC\u0648\u06C4\u06D5\u06C1\u06BE\u0621\u06CC\u06D0\u06D2\u064D\u0650\u064F\u0657'
+            '\u0654abcdefghijklmnopqrstuvwxyz\u0655\u0651\u0653\u0656\u0670'
+        ),
+    }
+
+    # national language single shift tables, replacing the extended alphabet, by language identifier
+    SINGLE_SHIFTS = {
+        1: {
+            10: '\f', 20: '^', 40: '{', 41: '}', 47: '\\', 60: '[', 61: '~', 62: ']', 64: '|', 71: 'Ğ', 73: 'İ',
+            83: 'Ş', 99: 'ç', 101: '€', 103: 'ğ', 105: 'ı', 115: 'ş',
+        },
+        2: {
+            9: 'ç', 10: '\f', 20: '^', 40: '{', 41: '}', 47: '\\', 60: '[', 61: '~', 62: ']', 64: '|', 65: 'Á',
+            73: 'Í', 79: 'Ó', 85: 'Ú', 97: 'á', 101: '€', 105: 'í', 111: 'ó', 117: 'ú',
+        },
+        3: {
+            5: 'ê', 9: 'ç', 10: '\f', 11: 'Ô', 12: 'ô', 14: 'Á', 15: 'á', 18: 'Φ', 19: 'Γ', 20: '^',
+            21: 'Ω', 22: 'Π', 23: 'Ψ', 24: 'Σ', 25: 'Θ', 31: 'Ê', 40: '{', 41: '}', 47: '\\', 60: '[',
+            61: '~', 62: ']', 64: '|', 65: 'À', 73: 'Í', 79: 'Ó', 85: 'Ú', 91: 'Ã', 92: 'Õ', 97: 'Â',
+            101: '€', 105: 'í', 111: 'ó', 117: 'ú', 123: 'ã', 124: 'õ', 127: 'â',
+        },
+        4: _indic_single_shift({
+            0x19: '\u09E6\u09E7', 0x1C: '\u09E8\u09E9\u09EA\u09EB\u09EC\u09ED\u09EE\u09EF\u09DF\u09E0\u09E1\u09E2',
+            0x2A: '\u09E3\u09F2\u09F3\u09F4\u09F5', 0x30: '\u09F6\u09F7\u09F8\u09F9\u09FA',
+        }),
+        5: _indic_single_shift({
+            0x19: '\u0964\u0965', 0x1C: '\u0AE6\u0AE7\u0AE8\u0AE9\u0AEA\u0AEB\u0AEC\u0AED\u0AEE\u0AEF',
+        }),
+        6: _indic_single_shift({
+            0x19: '\u0964\u0965', 0x1C: '\u0966\u0967\u0968\u0969\u096A\u096B\u096C\u096D\u096E\u096F\u0951\u0952',
+            0x2A: '\u0953\u0954\u0958\u0959\u095A',
+            0x30: '\u095B\u095C\u095D\u095E\u095F\u0960\u0961\u0962\u0963\u0970\u0971',
+        }),
+        7: _indic_single_shift({
+            0x19: '\u0964\u0965', 0x1C: '\u0CE6\u0CE7\u0CE8\u0CE9\u0CEA\u0CEB\u0CEC\u0CED\u0CEE\u0CEF\u0CDE\u0CF1',
+            0x2A: '\u0CF2',
+        }),
+        8: _indic_single_shift({
+            0x19: '\u0964\u0965', 0x1C: '\u0D66\u0D67\u0D68\u0D69\u0D6A\u0D6B\u0D6C\u0D6D\u0D6E\u0D6F\u0D70\u0D71',
+            0x2A: '\u0D72\u0D73\u0D74\u0D75\u0D7A', 0x30: '\u0D7B\u0D7C\u0D7D\u0D7E\u0D7F',
+        }),
+        9: _indic_single_shift({
+            0x19: '\u0964\u0965', 0x1C: '\u0B66\u0B67\u0B68\u0B69\u0B6A\u0B6B\u0B6C\u0B6D\u0B6E\u0B6F\u0B5C\u0B5D',
+            0x2A: '\u0B5F\u0B70\u0B71',
+        }),
+        10: _indic_single_shift({
+            0x19: '\u0964\u0965', 0x1C: '\u0A66\u0A67\u0A68\u0A69\u0A6A\u0A6B\u0A6C\u0A6D\u0A6E\u0A6F\u0A59\u0A5A',
+            0x2A: '\u0A5B\u0A5C\u0A5E\u0A75',
+        }),
+        11: _indic_single_shift({
+            0x19: '\u0964\u0965', 0x1C: '\u0BE6\u0BE7\u0BE8\u0BE9\u0BEA\u0BEB\u0BEC\u0BED\u0BEE\u0BEF\u0BF3\u0BF4',
+            0x2A: '\u0BF5\u0BF6\u0BF7\u0BF8\u0BFA',
+        }),
+        12: _indic_single_shift({
+            0x19: '\u0964\u0965', 0x1C: '\u0C66\u0C67\u0C68\u0C69\u0C6A\u0C6B\u0C6C\u0C6D\u0C6E\u0C6F\u0C58\u0C59',
+            0x2A: '\u0C78\u0C79\u0C7A\u0C7B\u0C7C', 0x30: '\u0C7D\u0C7E\u0C7F',
+        }),
+        13: _indic_single_shift({
+            0x19: '\u0600\u0601', 0x1C: '\u06F0\u06F1\u06F2\u06F3\u06F4\u06F5\u06F6\u06F7\u06F8\u06F9\u060C\u060D',
+            0x2A: '\u060E\u060F\u0610\u0611\u0612',
+            0x30: '\u0613\u0614\u061B\u061F\u0640\u0652\u0658\u066B\u066C\u0672\u0673\u06CD', 0x3F: '\u06D4',
+        }),
+    }
+
+    @classmethod
+    def for_language(cls, locking_shift: int = 0, single_shift: int = 0) -> Type['GSM']:
+        """
+        Returns the codec of national language shift tables, given by their language identifiers (0 for the default
+        alphabet or extended alphabet). It has the same methods as `GSM`, with tables computed once.
+
+        As required by 3GPP TS 23.038, the default tables are used instead of unknown ones.
+
+        >>> turkish = GSM.for_language(1, 1)
+        >>> turkish.encode('Ağaç'), turkish.decode('4146180C')
+        ('4146180C', 'Ağaç')
+        >>> GSM.for_language(0, 2).encode_septets('Canción')
+        b'Canci\\x1bon'
+        """
+        key = (locking_shift if locking_shift in GSM.LOCKING_SHIFTS else 0,
+               single_shift if single_shift in GSM.SINGLE_SHIFTS else 0)
+        if key == (0, 0):
+            return GSM
+        codec = _LANGUAGE_CODECS.get(key)
+        if codec is None:
+            alphabet = GSM.LOCKING_SHIFTS.get(key[0], GSM.ALPHABET)
+            alphabet_ext = GSM.SINGLE_SHIFTS.get(key[1], GSM.ALPHABET_EXT)
+            codec = _LANGUAGE_CODECS[key] = type(f'GSM_{key[0]}_{key[1]}', (GSM,), {
+                'ALPHABET': alphabet,
+                'ALPHABET_EXT': alphabet_ext,
+                'ALPHABET_EXT_INV': dict([(v[1], v[0]) for v in alphabet_ext.items()]),
+                'ENCODING_TABLE': _encoding_table(alphabet, alphabet_ext, GSM.CHAR_EXT),
+                'ALPHABET_EXT_TABLE': ''.join(map(alphabet_ext.get, range(128), ' ' * 128)),
+            })
+        return codec
+
+    @classmethod
+    def add_shift_tables(cls, language: int, locking_shift: Optional[str] = None,
+                         single_shift: Optional[Dict[int, str]] = None) -> None:
+        """
+        Adds (or replaces) the locking shift table (the 128 characters of the alphabet) and the single shift table
+        (characters by septet) of a language, for the tables which are not bundled.
+        """
+        if not 0 < language < 0x100:
+            raise ValueError(f"Invalid language identifier {language}")
+        if locking_shift is not None:
+            if len(locking_shift) != 128 or locking_shift[GSM.CHAR_EXT] != '\x1B':
+                raise ValueError("Locking shift tables have 128 characters, with an escape at 0x1B")
+            GSM.LOCKING_SHIFTS[language] = locking_shift
+        if single_shift is not None:
+            if not all(0 <= septet < 128 and septet != GSM.CHAR_EXT for septet in single_shift):
+                raise ValueError("Invalid septet in single shift table")
+            GSM.SINGLE_SHIFTS[language] = dict(single_shift)
+        for key in list(_LANGUAGE_CODECS):
+            if language in key:
+                del _LANGUAGE_CODECS[key]
+
     @classmethod
-    def decode(cls, data: str, strip_padding: bool = False) -> str:
+    def decode(cls, data: Union[str, bytes, bytearray, memoryview], strip_padding: bool = False) -> str:
         r"""
-        Returns decoded message from PDU string.
+        Returns decoded message from PDU string (or from packed octets).
 
         When strip_padding argument equals True, checks if the last symbol is a padding character (CR) and removes it.
 
@@ -64,25 +300,65 @@ class GSM:
 
         >>> GSM.decode('AA58ACA6AA8D1A', True)
         '*115*5#'
-        """
-        reversed_bits = BitStream(hex=cls.reversed_octets(data)).bin
-        septets = [int(reversed_bits[k:k+7], 2) for k in range(len(reversed_bits)-7, -1, -7)]
-        res = ''
-        is_extended = False
-        for char_index in septets:
-            if char_index == cls.CHAR_EXT:
-                is_extended = True
-                continue
-            if is_extended:
-                is_extended = False
-                res += cls.ALPHABET_EXT.get(char_index, ' ')
-            else:
-                res += cls.ALPHABET[char_index]
 
+        Packed octets can be decoded directly:
+
+        >>> GSM.decode(b'\xe82\x9b\xfd\x06')
+        'hello'
+        """
+        if isinstance(data, str):
+            data = bytes.fromhex(data)
+        septets = cls.unpack_septets(data)
+        res = cls.decode_septets(septets)
         if strip_padding and len(septets) % 8 == 0 and res.endswith('\r'):
             return res[:-1]
         return res
 
+    @classmethod
+    def unpack_septets(cls, data: Union[bytes, bytearray, memoryview]) -> bytes:
+        """
+        Unpacks 7-bit characters from packed octets, and returns one septet per byte.
+
+        Trailing bits that do not make a full septet are ignored.
+
+        >>> GSM.unpack_septets(bytes.fromhex('E8329BFD06'))
+        b'hello'
+        """
+        septets_count = len(data) * 8 // 7
+        if len(data) < _SMALL_PACKED_LENGTH:
+            value = int.from_bytes(data, 'little')
+            return bytes([(value >> k) & 0x7F for k in range(0, 7 * septets_count, 7)])
+        # Every 7 octets hold 8 septets. The k-th septets of all groups are extracted at once with a mask over
+        # the whole integer: they then start every 56 bits, so every 7 octets.
+        groups_count = -(-len(data) // 7)
+        size = 7 * groups_count
+        value = int.from_bytes(data, 'little')
+        mask = int.from_bytes(b'\x7F\x00\x00\x00\x00\x00\x00' * groups_count, 'little')
+        result = bytearray(8 * groups_count)
+        for k in range(8):
+            result[k::8] = ((value >> (7 * k)) & mask).to_bytes(size, 'little')[::7]
+        del result[septets_count:]
+        return bytes(result)
+
+    @classmethod
+    def decode_septets(cls, septets: bytes) -> str:
+        """
+        Returns the text represented by unpacked septets, handling escapes to the extended alphabet.
+
+        >>> GSM.decode_septets(bytes([0x32, 0x20, 0x1B, 0x65]))
+        '2 €'
+        """
+        if cls.CHAR_EXT not in septets:
+            return charmap_decode(septets, 'strict', cls.ALPHABET)[0]
+        chunks = septets.split(bytes([cls.CHAR_EXT]))
+        res = [charmap_decode(chunks[0], 'strict', cls.ALPHABET)[0]]
+        for chunk in chunks[1:]:
+            # an empty chunk is an escape followed by another escape (or by nothing)
+            if chunk:
+                res.append(cls.ALPHABET_EXT_TABLE[chunk[0]])
+                res.append(charmap_decode(chunk[1:], 'strict', cls.ALPHABET)[0])
+        return ''.join(res)
+
     @classmethod
     def encode(cls, data: str, with_padding: bool = False) -> str:
         """
@@ -120,30 +396,103 @@ class GSM:
         >>> GSM.encode('1234567', with_padding=True)
         '31D98C56B3DD1A'
         """
-        chars = list()
-        for char in data:
-            try:
-                # tries the standard alphabet
-                char_index = cls.ALPHABET.index(char)
-            except ValueError:
-                chars.append(cls.CHAR_EXT)
-                # tries the extended alphabet
-                try:
-                    char_index = cls.ALPHABET_EXT_INV[char]
-                except KeyError:
-                    char_index = cls.CHAR_EXT
-            if char_index == cls.CHAR_EXT:
-                raise ValueError(f"Char \"{char}\" can not be encoded with the GSM 7-bit codec")
-            chars.append(char_index)
+        return cls.encode_bytes(data, with_padding).hex().upper()
 
-        if with_padding:
-            if len(chars) % 8 == 0 and data[-1:] == '\r':
-                chars.append(cls.ALPHABET.index('\r'))
-            if len(chars) % 8 == 7:
-                chars.append(cls.ALPHABET.index('\r'))
+    @classmethod
+    def encode_bytes(cls, data: str, with_padding: bool = False) -> bytes:
+        """
+        Same as `encode`, but returns the packed octets instead of their hex representation.
+
+        >>> GSM.encode_bytes("hello")
+        b'\\xe82\\x9b\\xfd\\x06'
+        """
+        return cls._pack_septets(cls._padded_septets(data, with_padding), bytearray())
+
+    @classmethod
+    def encode_many(cls, data: Iterable[str], with_padding: bool = False,
+                    raw: bool = False) -> Iterator[Union[str, bytes]]:
+        """
+        Encodes several messages, yielding PDU strings (or packed octets if raw is True) in the same order.
+
+        Working buffers are shared between messages, which makes it cheaper than repeated calls to `encode`.
+
+        >>> list(GSM.encode_many(["hello", "1234567"], with_padding=True))
+        ['E8329BFD06', '31D98C56B3DD1A']
+        """
+        buffer = bytearray()
+        for message in data:
+            packed = cls._pack_septets(cls._padded_septets(message, with_padding), buffer)
+            yield packed if raw else packed.hex().upper()
 
-        res = '0' * (len(chars) % 8) + ''.join([f'{char:07b}' for char in chars][::-1])
-        return cls.reversed_octets(BitStream(bin=res).hex.upper())
+    @classmethod
+    def encode_septets(cls, data: str) -> bytes:
+        """
+        Returns one septet per byte for the given text. Characters of the extended alphabet use two septets.
+
+        >>> GSM.encode_septets("2 €")
+        b'2 \\x1be'
+        """
+        septets = data.translate(cls.ENCODING_TABLE)
+        if not septets.isascii():
+            for char in data:
+                if not cls.ENCODING_TABLE.get(ord(char), '\x80').isascii():
+                    raise ValueError(f"Char \"{char}\" can not be encoded with the GSM 7-bit codec")
+        return septets.encode('ascii')
+
+    @classmethod
+    def is_encodable(cls, data: str) -> bool:
+        """
+        Tells whether the text can be encoded with the GSM 7-bit codec.
+
+        >>> GSM.is_encodable("2 € par mois"), GSM.is_encodable("Привет")
+        (True, False)
+        """
+        return data.translate(cls.ENCODING_TABLE).isascii()
+
+    @classmethod
+    def pack_septets(cls, septets: bytes) -> bytes:
+        """
+        Packs septets (one per byte) into octets. Reverse operation of `unpack_septets`.
+
+        >>> GSM.pack_septets(b'hello')
+        b'\\xe82\\x9b\\xfd\\x06'
+        """
+        return cls._pack_septets(septets, bytearray())
+
+    @classmethod
+    def _padded_septets(cls, data: str, with_padding: bool) -> bytes:
+        septets = cls.encode_septets(data)
+        if with_padding:
+            if len(septets) % 8 == 0 and data[-1:] == '\r':
+                septets += b'\r'
+            if len(septets) % 8 == 7:
+                septets += b'\r'
+        return septets
+
+    @staticmethod
+    def _pack_septets(septets: bytes, buffer: bytearray) -> bytes:
+        # the buffer is only written at every 7th position, and must be zero elsewhere
+        septets_count = len(septets)
+        if septets_count < _SMALL_SEPTETS_COUNT:
+            value = 0
+            for k, septet in enumerate(septets):
+                value |= septet << (7 * k)
+        else:
+            # Reverse of the mask-based unpacking: the k-th septets of all 8-septet groups are spread every 7 octets,
+            # then shifted in place.
+            groups_count = -(-septets_count // 8)
+            septets = bytes(septets) + bytes(8 * groups_count - septets_count)
+            size = 7 * groups_count
+            if len(buffer) < size:
+                buffer.extend(bytes(size - len(buffer)))
+            window = memoryview(buffer)[:size]
+            value = 0
+            for k in range(8):
+                window[::7] = septets[k::8]
+                value |= int.from_bytes(window, 'little') << (7 * k)
+            window[::7] = bytes(groups_count)
+            window.release()
+        return value.to_bytes((7 * septets_count + 7) // 8, 'little')
 
     @classmethod
     def reversed_octets(cls, data: str) -> str:
@@ -176,13 +525,18 @@ class UCS2:
         return hexlify(data.encode('utf-16be')).decode('ascii').upper()
 
     @classmethod
-    def decode(cls, data: str) -> str:
+    def decode(cls, data: Union[str, bytes, bytearray, memoryview]) -> str:
         """
-        Returns decoded message from PDU string.
+        Returns decoded message from PDU string (or from raw octets).
 
         Example:
 
         >>> UCS2.decode('004C006F00720065006D00200049007000730075006D')
         'Lorem Ipsum'
+
+        >>> UCS2.decode(b'\\x00O\\x00K')
+        'OK'
         """
-        return unhexlify(data).decode('utf-16be')
+        if isinstance(data, str):
+            data = unhexlify(data)
+        return str(data, 'utf-16be')
@@ -0,0 +1,240 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Detection of duplicate incoming messages, such as messages redelivered by SMS-C, or the same message received by
+several modems.
+
+Messages are fingerprinted by sender, date, concatenation reference and part, and user data, and looked up in
+rotating Bloom filters: checks are O(1), memory does not grow with the number of messages, and a small share of new
+messages (the false positive rate) is taken for duplicates.
+"""
+
+import math
+import time
+
+from collections import deque
+from datetime import datetime
+from hashlib import blake2b
+from typing import Any, Callable, Deque, Dict, List
+
+from .reader import PDUData, PDUReader
+
+__all__ = [
+    'BloomFilter',
+    'Deduplicator',
+    'fingerprint',
+    'fingerprint_pdu',
+]
+
+
+def fingerprint_pdu(pdu_data: PDUData) -> bytes:
+    """
+    Returns the fingerprint of an SMS-DELIVER PDU: its sender, data coding scheme, service center time stamp and user
+    data (including the concatenation information element), as raw octets.
+
+    Neither texts nor dates are decoded. The SMS-C information, the first octet and the protocol identifier are left
+    out, as they may change when a message is redelivered, or received by another modem.
+
+    >>> fingerprint_pdu('07916407058099F9040B916407950303F100008921222140140004D4E2940A').hex().upper()
+    '0B916407950303F1008921222140140004D4E2940A'
+    >>> fingerprint_pdu('00240B916407950303F17F008921222140140004D4E2940A').hex().upper()
+    '0B916407950303F1008921222140140004D4E2940A'
+    """
+    reader = PDUReader.wrap(pdu_data)
+    data = reader.load()
+    start = reader.position
+    sender = start + 2 + reader.read_octet()
+    reader.seek(sender)
+    pid = sender + 2 + (reader.read_octet() + 1) // 2
+    if pid + 10 > len(data):
+        raise ValueError("Unexpected end of PDU")
+    return bytes(data[sender:pid]) + bytes(data[pid + 1:])
+
+
+def fingerprint(sms: Dict[str, Any]) -> bytes:
+    """
+    Returns the fingerprint of a message, as returned by `easy.read_incoming_sms` or `fields.SMSDeliver.decode`: the
+    same message gives the same fingerprint, whichever function returned it.
+
+    >>> sms = {'sender': '+46705930301', 'date': None, 'content': 'TEST', 'partial': False}
+    >>> fingerprint(sms)
+    b"('+46705930301', None, None, None, 'TEST')"
+    """
+    if 'user_data' in sms:
+        sender = sms['sender']['number']
+        if sms['sender']['toa']['ton'] == 'international':
+            sender = '+' + sender
+        date = sms['scts']
+        content = sms['user_data']['data']
+        reference = part_number = None
+        header = sms['user_data'].get('header')
+        for element in (header or {}).get('elements', ()):
+            if element['iei'] in (0x00, 0x08):
+                el_data = element['data']
+                reference = f"{el_data['reference']}-{el_data['parts_count']}"
+                part_number = el_data['part_number']
+    else:
+        sender, date, content = sms['sender'], sms['date'], sms['content']
+        partial = sms['partial'] or {}
+        reference, part_number = partial.get('reference'), partial.get('part_number')
+    if isinstance(date, datetime):
+        date = date.isoformat()
+    return repr((sender, date, reference, part_number, content)).encode('utf-8', 'surrogatepass')
+
+
+class BloomFilter:
+    """
+    Bloom filter of size octets, holding up to capacity fingerprints with the given false positive rate.
+
+    >>> bloom = BloomFilter.for_size(1024, 0.001)
+    >>> bloom.capacity, bloom.hashes
+    (569, 10)
+    >>> bloom.add(b'hello'), bloom.add(b'hello'), b'hello' in bloom, b'world' in bloom
+    (False, True, True, False)
+    """
+    __slots__ = ('bits', 'size', 'hashes', 'capacity', 'count')
+
+    # 32-bit hashes in the longest BLAKE2b digest
+    MAX_HASHES = 16
+
+    def __init__(self, size: int, hashes: int, capacity: int) -> None:
+        if size < 1 or not 1 <= hashes <= self.MAX_HASHES:
+            raise ValueError(f"Bloom filters need at least one octet, and 1 to {self.MAX_HASHES} hash functions")
+        self.bits = bytearray(size)
+        self.size = size * 8
+        self.hashes = hashes
+        self.capacity = capacity
+        self.count = 0
+
+    @classmethod
+    def for_size(cls, size: int, error_rate: float) -> 'BloomFilter':
+        """
+        Returns a filter of size octets, with as many hash functions and as much capacity as the false positive rate
+        allows.
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("The false positive rate must be between 0 and 1")
+        hashes = min(max(1, round(-math.log2(error_rate))), cls.MAX_HASHES)
+        capacity = int(-size * 8 / hashes * math.log(1 - error_rate ** (1 / hashes)))
+        return cls(size, hashes, capacity)
+
+    def positions(self, fingerprint: bytes) -> List[int]:
+        """
+        Returns the positions of the bits of a fingerprint, from 32-bit hashes cut from a single digest.
+        """
+        digest = blake2b(fingerprint, digest_size=4 * self.hashes).digest()
+        size = self.size
+        return [value % size for value in memoryview(digest).cast('I')]
+
+    def contains(self, positions: List[int]) -> bool:
+        bits = self.bits
+        for position in positions:
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def set(self, positions: List[int]) -> None:
+        bits = self.bits
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def clear(self) -> None:
+        self.bits[:] = bytes(len(self.bits))
+        self.count = 0
+
+    def add(self, fingerprint: bytes) -> bool:
+        """
+        Adds a fingerprint, and returns whether it was (probably) already added.
+        """
+        positions = self.positions(fingerprint)
+        if self.contains(positions):
+            return True
+        self.set(positions)
+        return False
+
+    def __contains__(self, fingerprint: bytes) -> bool:
+        return self.contains(self.positions(fingerprint))
+
+
+class Deduplicator:
+    """
+    Tells duplicate messages apart, among the messages seen for at least `window` seconds.
+
+    Fingerprints are added to the newest of `generations` Bloom filters, sharing `max_bytes` octets. The oldest filter
+    is cleared and reused as the newest one every window / (generations - 1) seconds (once per elapsed period after an
+    idle gap), or as soon as the newest one holds as many fingerprints as the false positive rate allows: in this case,
+    counted in `forced_rotations`, messages are remembered for less than `window` seconds.
+
+    >>> deduplicator = Deduplicator(window=60, max_bytes=1 << 16)
+    >>> pdu = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+    >>> deduplicator.seen_pdu(pdu), deduplicator.seen_pdu(pdu)
+    (False, True)
+    >>> sms = {'sender': '+46705930301', 'date': None, 'content': 'TEST', 'partial': False}
+    >>> deduplicator.seen(sms), deduplicator.seen(sms), deduplicator.duplicates
+    (False, True, 2)
+    """
+    def __init__(self, window: float = 86400.0, error_rate: float = 0.001, max_bytes: int = 16 << 20,
+                 generations: int = 4, clock: Callable[[], float] = time.monotonic) -> None:
+        if generations < 2:
+            raise ValueError("At least 2 generations are needed")
+        self.window = window
+        self.error_rate = error_rate
+        self.clock = clock
+        # the false positive rate of a check is at most the sum of the rates of the filters
+        self.filters: Deque[BloomFilter] = deque(
+            BloomFilter.for_size(max_bytes // generations, error_rate / generations) for _ in range(generations))
+        self.rotation_period = window / (generations - 1)
+        # time of the last scheduled rotation, advanced by whole periods
+        self.rotated = clock()
+        # counters
+        self.checked = 0
+        self.duplicates = 0
+        self.rotations = 0
+        self.forced_rotations = 0
+
+    def check(self, fingerprint: bytes) -> bool:
+        """
+        Returns whether a fingerprint was (probably) seen in the window, and adds it otherwise.
+        """
+        self.checked += 1
+        # after an idle gap, the filters of every elapsed period are dropped, and all of them after a whole window
+        periods = int((self.clock() - self.rotated) // self.rotation_period)
+        if periods > 0:
+            for _ in range(min(periods, len(self.filters))):
+                self.rotate()
+            self.rotated += periods * self.rotation_period
+        elif self.filters[-1].count >= self.filters[-1].capacity:
+            self.forced_rotations += 1
+            self.rotate()
+        newest = self.filters[-1]
+        positions = newest.positions(fingerprint)
+        for bloom in reversed(self.filters):
+            if bloom.contains(positions):
+                self.duplicates += 1
+                return True
+        newest.set(positions)
+        return False
+
+    def seen(self, sms: Dict[str, Any]) -> bool:
+        """
+        Returns whether a message, as returned by `easy.read_incoming_sms` or `fields.SMSDeliver.decode`, is a
+        duplicate.
+        """
+        return self.check(fingerprint(sms))
+
+    def seen_pdu(self, pdu_data: PDUData) -> bool:
+        """
+        Returns whether an SMS-DELIVER PDU is a duplicate, without decoding it.
+        """
+        return self.check(fingerprint_pdu(pdu_data))
+
+    def rotate(self) -> None:
+        """
+        Drops the oldest filter, and reuses it as the newest one. The schedule of the periodic rotations is not changed.
+        """
+        oldest = self.filters.popleft()
+        oldest.clear()
+        self.filters.append(oldest)
+        self.rotations += 1
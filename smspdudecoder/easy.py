@@ -1,19 +1,24 @@
 # Copyright (c) Qotto, 2018-2023
 # Open-source software, see LICENSE file for details
 
-from io import StringIO
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
-from .fields import SMSDeliver, SMSSubmit
+from .batch import BatchResults, decode_many
+from .fields import SMSDeliver, SMSStatusReport, SMSSubmit
+from .reader import PDUData
 
 __all__ = [
     'read_incoming_sms',
+    'read_incoming_sms_many',
     'read_outgoing_sms',
+    'read_outgoing_sms_many',
+    'read_status_report',
+    'read_status_report_many',
 ]
 
 
-def read_incoming_sms(data: str) -> Dict[str, Any]:
-    sms = SMSDeliver.decode(StringIO(data))
+def read_incoming_sms(data: PDUData) -> Dict[str, Any]:
+    sms = SMSDeliver.decode(data)
     sender = sms['sender']['number']
     if sms['sender']['toa']['ton'] == 'international':
         sender = '+' + sender
@@ -38,8 +43,8 @@ def read_incoming_sms(data: str) -> Dict[str, Any]:
     }
 
 
-def read_outgoing_sms(data: str) -> Dict[str, Any]:
-    sms = SMSSubmit.decode(StringIO(data))
+def read_outgoing_sms(data: PDUData) -> Dict[str, Any]:
+    sms = SMSSubmit.decode(data)
     recipient = sms['recipient']['number']
     if sms['recipient']['toa']['ton'] == 'international':
         recipient = '+' + recipient
@@ -48,3 +53,40 @@ def read_outgoing_sms(data: str) -> Dict[str, Any]:
         'recipient': recipient,
         'content': content,
     }
+
+
+def read_status_report(data: PDUData) -> Dict[str, Any]:
+    report = SMSStatusReport.decode(data)
+    recipient = report['recipient']['number']
+    if report['recipient']['toa']['ton'] == 'international':
+        recipient = '+' + recipient
+    return {
+        'recipient': recipient,
+        'reference': report['message-ref'],
+        'date': report['scts'],
+        'discharge_date': report['dt'],
+        'delivered': report['status']['category'] == 'completed',
+        'status': report['status']['category'],
+        'reason': report['status']['reason'],
+    }
+
+
+def read_incoming_sms_many(data: Iterable[PDUData], **options) -> BatchResults:
+    """
+    Batch version of `read_incoming_sms`, see `smspdudecoder.batch.decode_many` for the available options.
+    """
+    return decode_many(read_incoming_sms, data, **options)
+
+
+def read_outgoing_sms_many(data: Iterable[PDUData], **options) -> BatchResults:
+    """
+    Batch version of `read_outgoing_sms`, see `smspdudecoder.batch.decode_many` for the available options.
+    """
+    return decode_many(read_outgoing_sms, data, **options)
+
+
+def read_status_report_many(data: Iterable[PDUData], **options) -> BatchResults:
+    """
+    Batch version of `read_status_report`, see `smspdudecoder.batch.decode_many` for the available options.
+    """
+    return decode_many(read_status_report, data, **options)
@@ -7,15 +7,13 @@ Various elements used in TP-DU, according to GSM 03.40.
 All these elements are encoded in strings and decoded in native Python objects.
 """
 
+from datetime import date
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
-from io import StringIO
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
-import pytz
-
-from bitstring import BitStream
+from .records import TypeOfAddressRecord
 
 __all__ = [
     'Date',
@@ -23,6 +21,8 @@ __all__ = [
     'TypeOfAddress',
 ]
 
+_T = TypeVar('_T')
+
 
 def swap_nibbles(data: str) -> str:
     """
@@ -33,10 +33,61 @@ def swap_nibbles(data: str) -> str:
     >>> swap_nibbles('0123')
     '1032'
     """
-    res = ''
-    for k in range(0, len(data), 2):
-        res += data[k+1] + data[k]
-    return res
+    if len(data) % 2:
+        raise ValueError("Odd number of semi-octets")
+    encoded = data.encode()
+    swapped = bytearray(len(encoded))
+    swapped[::2] = encoded[1::2]
+    swapped[1::2] = encoded[::2]
+    return swapped.decode()
+
+
+# octets with swapped nibbles
+_SWAPPED_NIBBLES = bytes(((octet & 0x0F) << 4) | (octet >> 4) for octet in range(256))
+
+# decimal value of the swapped BCD octets, 0xFF when one of the nibbles is not a decimal digit
+_BCD_VALUES = bytes(
+    (octet & 0x0F) * 10 + (octet >> 4) if (octet & 0x0F) < 10 and (octet >> 4) < 10 else 0xFF
+    for octet in range(256)
+)
+
+
+def _octet_table(decode_octet: Callable[[int], _T]) -> Tuple[Optional[_T], ...]:
+    """
+    Returns the results of decode_octet for all octet values, with None for the octets it rejects.
+    """
+    table: List[Optional[_T]] = []
+    for octet in range(256):
+        try:
+            table.append(decode_octet(octet))
+        except ValueError:
+            table.append(None)
+    return tuple(table)
+
+
+def _timezone_offset(octet: int) -> Optional[timedelta]:
+    # the sign is the fourth bit, the absolute value is in quarters of an hour
+    tens, units = octet & 0x07, octet >> 4
+    if units > 9:
+        return None
+    offset = timedelta(minutes=15 * (tens * 10 + units))
+    return -offset if octet & 0x08 else offset
+
+
+# time zone offsets and shared time zones, by octet (None when the octet is not a valid offset)
+_TIMEZONE_OFFSETS = tuple(_timezone_offset(octet) for octet in range(256))
+_TIMEZONES = tuple(None if offset is None else timezone(offset) for offset in _TIMEZONE_OFFSETS)
+
+_SECOND = timedelta(seconds=1)
+
+# days between the epoch and the first day of each year of the century
+_DAYS_SINCE_2000 = tuple(date(2000 + year, 1, 1).toordinal() - date(1970, 1, 1).toordinal() for year in range(100))
+# days in each month, and days before each month, for regular and leap years
+_DAYS_IN_MONTH = (
+    (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+    (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+)
+_DAYS_BEFORE_MONTH = tuple(tuple(sum(days[1:month]) for month in range(13)) for days in _DAYS_IN_MONTH)
 
 
 class Date:
@@ -44,9 +95,9 @@ class Date:
     Date representation.
     """
     @classmethod
-    def decode(cls, data: str) -> datetime:
+    def decode(cls, data: Union[str, bytes, bytearray, memoryview]) -> datetime:
         """
-        Returns a datetime object, read from the PDU.
+        Returns a datetime object, read from the PDU (hex string or raw octets).
         Keep in mind that the resulting datetime is timezone-aware and always converted to UTC.
 
         Examples:
@@ -66,20 +117,59 @@ class Date:
 
         >>> (Date.decode('11101131522400') - Date.decode('11101131521440')).total_seconds()
         3601.0
+
+        >>> Date.decode(bytes.fromhex('70402132522400'))
+        datetime.datetime(2007, 4, 12, 23, 25, 42, tzinfo=datetime.timezone.utc)
         """
-        io_data = StringIO(swap_nibbles(data))
-        year = 2000 + int(io_data.read(2))
-        month = int(io_data.read(2))
-        day = int(io_data.read(2))
-        hour = int(io_data.read(2))
-        minute = int(io_data.read(2))
-        second = int(io_data.read(2))
-        tz_data = int(io_data.read(2), 16)
-        tz_multiplier = -1 if tz_data & 0x80 else +1
-        tz_offset_abs = int(f'{tz_data&0x7f:x}')
-        tz_delta = timedelta(minutes=15*tz_multiplier*tz_offset_abs)
-        local_date = datetime(year, month, day, hour, minute, second, tzinfo=timezone(tz_delta))
-        return local_date.astimezone(timezone.utc)
+        year, month, day, hour, minute, second, tz = cls.decode_components(data)
+        utc_date = datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
+        return utc_date - tz.utcoffset(None)
+
+    @classmethod
+    def decode_timestamp(cls, data: Union[str, bytes, bytearray, memoryview]) -> int:
+        """
+        Same as `decode`, but returns a POSIX timestamp (seconds since the epoch), without building datetime objects.
+
+        >>> Date.decode_timestamp('70402132522400')
+        1176420342
+        >>> Date.decode_timestamp('70402132522423') == Date.decode('70402132522423').timestamp()
+        True
+        """
+        year, month, day, hour, minute, second, tz = cls.decode_components(data)
+        # years are 2000 to 2099, so that every fourth year is a leap year
+        leap = year % 4 == 0
+        if not (1 <= month <= 12 and 1 <= day <= _DAYS_IN_MONTH[leap][month] and hour <= 23 and minute <= 59
+                and second <= 59):
+            raise ValueError("Invalid date")
+        days = _DAYS_SINCE_2000[year - 2000] + _DAYS_BEFORE_MONTH[leap][month] + day - 1
+        return days * 86400 + hour * 3600 + minute * 60 + second - tz.utcoffset(None) // _SECOND
+
+    @classmethod
+    def decode_components(cls, data: Union[str, bytes, bytearray, memoryview]) -> Tuple[int, int, int, int, int, int,
+                                                                                        timezone]:
+        """
+        Returns the (year, month, day, hour, minute, second, tzinfo) components of the date, in local time.
+        Time zones are shared, and components are not checked against the calendar.
+
+        >>> Date.decode_components('70402132522423')
+        (2007, 4, 12, 23, 25, 42, datetime.timezone(datetime.timedelta(seconds=28800)))
+        >>> *components, tz = Date.decode_components('70402132522423')
+        >>> datetime(*components, tzinfo=tz) == Date.decode('70402132522423')
+        True
+        """
+        if isinstance(data, str):
+            data = bytes.fromhex(data)
+        elif isinstance(data, memoryview):
+            data = data.tobytes()
+        if len(data) != 7:
+            raise ValueError("Invalid date length")
+        year, month, day, hour, minute, second = values = data[:6].translate(_BCD_VALUES)
+        if 0xFF in values:
+            raise ValueError("Invalid semi-octets in date")
+        tz = _TIMEZONES[data[6]]
+        if tz is None:
+            raise ValueError("Invalid semi-octets in time zone")
+        return 2000 + year, month, day, hour, minute, second, tz
 
     @classmethod
     def encode(cls, date: datetime) -> str:
@@ -91,10 +181,10 @@ class Date:
         >>> Date.encode(datetime(2018, 1, 1))
         '81101000000000'
 
-        >>> Date.encode(pytz.timezone('Europe/Paris').localize(datetime(2020, 1, 29, 13, 25, 41)))
+        >>> Date.encode(datetime(2020, 1, 29, 13, 25, 41, tzinfo=timezone(timedelta(hours=1))))
         '02109231521440'
 
-        >>> Date.encode(pytz.timezone('US/Pacific').localize(datetime(2013, 3, 25, 23, 1, 56)))
+        >>> Date.encode(datetime(2013, 3, 25, 23, 1, 56, tzinfo=timezone(timedelta(hours=-7))))
         '3130523210658a'
         """
         result = date.strftime('%y%m%d%H%M%S')
@@ -115,9 +205,9 @@ class Number:
     Telephone number representation.
     """
     @classmethod
-    def decode(cls, data: str) -> str:
+    def decode(cls, data: Union[str, bytes, bytearray, memoryview]) -> str:
         """
-        Decodes a telephone number from PDU hex string.
+        Decodes a telephone number from PDU hex string (or from raw octets).
 
         Example:
 
@@ -125,8 +215,13 @@ class Number:
         '15551234567'
         >>> Number.decode('1032547698')
         '0123456789'
+        >>> Number.decode(b'\\x21\\xF3')
+        '123'
         """
-        data = swap_nibbles(data)
+        if isinstance(data, str):
+            data = swap_nibbles(data)
+        else:
+            data = bytes(data).translate(_SWAPPED_NIBBLES).hex().upper()
         if data[-1:] == 'F':
             data = data[:-1]
         return data
@@ -178,27 +273,39 @@ class TypeOfAddress:
     }
     NPI_INV = dict([(v[1], v[0]) for v in NPI.items()])
 
+    # decoded octets and shared records, by octet value (None when the octet is invalid)
+    _DICTS: Tuple[Optional[Dict[str, str]], ...]
+    _RECORDS: Tuple[Optional[TypeOfAddressRecord], ...]
+
     @classmethod
-    def decode(cls, data: str) -> Dict[str, str]:
+    def decode(cls, data: Union[str, int]) -> Dict[str, str]:
         """
-        Decodes the Type Of Address octet. Returns a dictionary.
+        Decodes the Type Of Address octet (hex string or octet value). Returns a dictionary.
 
         Example:
 
         >>> TypeOfAddress.decode('91')
         {'ton': 'international', 'npi': 'isdn'}
+        >>> TypeOfAddress.decode(0xD0)
+        {'ton': 'alphanumeric', 'npi': 'unknown'}
         """
-        io_data = BitStream(hex=data)
-        first_bit = io_data.read('bool')
-        if not first_bit:
+        octet = int(data, 16) if isinstance(data, str) else data
+        result = cls._DICTS[octet]
+        if result is None:
+            return cls._decode_octet(octet) # raises the appropriate error
+        return result.copy()
+
+    @classmethod
+    def _decode_octet(cls, octet: int) -> Dict[str, str]:
+        if not octet & 0x80:
             raise ValueError("Invalid first bit of the Type Of Address octet")
         # Type Of Number
-        ton = cls.TON.get(io_data.read('bits:3').uint)
+        ton = cls.TON.get((octet >> 4) & 0b111)
         if ton is None:
             assert False, "Type-Of-Number bits should be exaustive"
             raise ValueError("Invalid Type Of Number bits")
         # Numbering Plan Identification
-        npi =  cls.NPI.get(io_data.read('bits:4').uint)
+        npi = cls.NPI.get(octet & 0b1111)
         if npi is None:
             raise ValueError("Invalid Numbering Plan Identification bits")
         return {
@@ -206,6 +313,22 @@ class TypeOfAddress:
             'npi': npi,
         }
 
+    @classmethod
+    def decode_record(cls, data: Union[str, int]) -> TypeOfAddressRecord:
+        """
+        Same as `decode`, but returns a shared record.
+
+        >>> TypeOfAddress.decode_record(0x91)
+        TypeOfAddressRecord(ton='international', npi='isdn')
+        >>> TypeOfAddress.decode_record('91') is TypeOfAddress.decode_record(0x91)
+        True
+        """
+        octet = int(data, 16) if isinstance(data, str) else data
+        record = cls._RECORDS[octet]
+        if record is None:
+            return TypeOfAddressRecord(**cls._decode_octet(octet)) # raises the appropriate error
+        return record
+
     @classmethod
     def encode(cls, data: Dict[str, str]) -> str:
         """
@@ -223,3 +346,7 @@ class TypeOfAddress:
         if npi is None:
             raise ValueError("Invalid Numbering Plan Identification")
         return f'{0x80 | (ton << 4) | npi:02x}'
+
+
+TypeOfAddress._DICTS = _octet_table(TypeOfAddress._decode_octet)
+TypeOfAddress._RECORDS = tuple(None if toa is None else TypeOfAddressRecord(**toa) for toa in TypeOfAddress._DICTS)
@@ -0,0 +1,223 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Export of SMS-DELIVER messages as columns, to CSV or to Arrow IPC streams.
+
+Messages are decoded straight into column buffers, without building a dictionary per message, and are written in
+record batches of a fixed size, so that the memory used does not depend on the number of messages.
+"""
+
+import csv
+
+from array import array
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .elements import Date
+from .fields import DCS, SMSC, Address, PDUHeader, UserData
+from .reader import PDUData, PDUReader
+
+__all__ = [
+    'COLUMNS',
+    'DeliverColumns',
+    'iter_deliver_columns',
+    'write_arrow',
+    'write_csv',
+]
+
+COLUMNS = (
+    'sender',
+    'sender_ton',
+    'sender_npi',
+    'smsc',
+    'scts',
+    'encoding',
+    'reference',
+    'parts_count',
+    'part_number',
+    'text',
+)
+
+
+class DeliverColumns:
+    """
+    Columns of decoded SMS-DELIVER messages (see `COLUMNS`).
+
+    The timestamps (scts) are POSIX timestamps. Concatenation columns are 0 for messages which are not concatenated.
+    Texts are stored in UTF-8, one after another, the i-th one being between text_offsets[i] and text_offsets[i + 1].
+    The content of binary messages is stored as a hex string.
+
+    >>> columns = DeliverColumns()
+    >>> columns.append('07916407058099F9040B916407950303F100008921222140140004D4E2940A')
+    >>> columns.sender, columns.scts, columns.text(0)
+    (['46705930301'], array('q', [4070088281]), 'TEST')
+    """
+    def __init__(self) -> None:
+        self.sender: List[str] = []
+        self.sender_ton: List[str] = []
+        self.sender_npi: List[str] = []
+        self.smsc: List[Optional[str]] = []
+        self.scts = array('q')
+        self.encoding: List[str] = []
+        self.reference = array('q')
+        self.parts_count = array('q')
+        self.part_number = array('q')
+        self.text_offsets = array('q', [0])
+        self.text_data = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.sender)
+
+    def append(self, pdu_data: PDUData) -> None:
+        """
+        Decodes an SMS-DELIVER TP-DU, and appends it to the columns. Columns are left as is if it can not be decoded.
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            smsc = SMSC.read_record(reader).number
+            udhi = PDUHeader.read_record(reader).udhi
+            sender = Address.read_record(reader)
+            reader.read_octet()
+            encoding = DCS.ENCODINGS[reader.read_octet()]
+            scts = Date.decode_timestamp(reader.read(7))
+            user_data = UserData.read_record(reader, udhi, encoding)
+        concatenation: Any = (0, 0, 0)
+        if user_data.header is not None:
+            for element in user_data.header.elements:
+                if element.iei in (0x00, 0x08):
+                    concatenation = element.data
+                    break
+        data = user_data.data
+        text = data.hex().upper() if isinstance(data, bytes) else data
+        self.sender.append(sender.number)
+        self.sender_ton.append(sender.toa.ton)
+        self.sender_npi.append(sender.toa.npi)
+        self.smsc.append(smsc)
+        self.scts.append(scts)
+        self.encoding.append(encoding)
+        self.reference.append(concatenation[0])
+        self.parts_count.append(concatenation[1])
+        self.part_number.append(concatenation[2])
+        self.text_data += text.encode('utf-8', 'surrogatepass')
+        self.text_offsets.append(len(self.text_data))
+
+    def text(self, index: int) -> str:
+        """
+        Returns the text of the message at the given index.
+        """
+        return self.text_data[self.text_offsets[index]:self.text_offsets[index + 1]].decode('utf-8', 'surrogatepass')
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """
+        Yields the messages as tuples of values, in the order of `COLUMNS`.
+        """
+        texts = map(self.text, range(len(self)))
+        return zip(self.sender, self.sender_ton, self.sender_npi, self.smsc, self.scts, self.encoding, self.reference,
+                   self.parts_count, self.part_number, texts)
+
+    def to_arrow(self) -> Any:
+        """
+        Returns the columns as a `pyarrow.RecordBatch`. Buffers of numbers and texts are not copied.
+
+        Concatenation columns are null for messages which are not concatenated.
+        """
+        import pyarrow
+        import pyarrow.compute
+
+        count = len(self)
+
+        def numbers(values: array, validity: Any = None) -> Any:
+            return pyarrow.Array.from_buffers(pyarrow.int64(), count, [validity, pyarrow.py_buffer(values)])
+
+        # the values of a boolean array are a bitmap, used as validity bitmap of the concatenation columns
+        concatenated = pyarrow.compute.not_equal(numbers(self.parts_count), 0).buffers()[1]
+
+        return pyarrow.RecordBatch.from_arrays([
+            pyarrow.array(self.sender, pyarrow.string()),
+            pyarrow.array(self.sender_ton, pyarrow.string()),
+            pyarrow.array(self.sender_npi, pyarrow.string()),
+            pyarrow.array(self.smsc, pyarrow.string()),
+            numbers(self.scts).view(pyarrow.timestamp('s', 'UTC')),
+            pyarrow.array(self.encoding, pyarrow.string()),
+            numbers(self.reference, concatenated),
+            numbers(self.parts_count, concatenated),
+            numbers(self.part_number, concatenated),
+            pyarrow.Array.from_buffers(pyarrow.large_string(), count, [
+                None, pyarrow.py_buffer(self.text_offsets), pyarrow.py_buffer(self.text_data),
+            ]),
+        ], names=list(COLUMNS))
+
+
+def iter_deliver_columns(pdus: Iterable[PDUData], batch_size: int = 10000,
+                         strict: bool = True) -> Iterator[DeliverColumns]:
+    """
+    Decodes SMS-DELIVER TP-DUs, yielding columns of at most batch_size messages.
+
+    If strict is False, PDUs that can not be decoded are skipped instead of raising an exception.
+
+    >>> pdus = ['07916407058099F9040B916407950303F100008921222140140004D4E2940A'] * 3
+    >>> [len(columns) for columns in iter_deliver_columns(pdus, batch_size=2)]
+    [2, 1]
+    """
+    columns = DeliverColumns()
+    for pdu in pdus:
+        try:
+            columns.append(pdu)
+        except Exception:
+            if strict:
+                raise
+            continue
+        if len(columns) >= batch_size:
+            yield columns
+            columns = DeliverColumns()
+    if len(columns):
+        yield columns
+
+
+def write_csv(pdus: Iterable[PDUData], output: TextIO, batch_size: int = 10000, strict: bool = True) -> int:
+    """
+    Decodes SMS-DELIVER TP-DUs, and writes them to a CSV file, opened with newline=''. Returns the number of messages.
+
+    >>> import io
+    >>> output = io.StringIO()
+    >>> write_csv(['07916407058099F9040B916407950303F100008921222140140004D4E2940A'], output)
+    1
+    >>> print(output.getvalue())
+    sender,sender_ton,sender_npi,smsc,scts,encoding,reference,parts_count,part_number,text
+    46705930301,international,isdn,46705008999,4070088281,gsm,0,0,0,TEST
+    <BLANKLINE>
+    """
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(COLUMNS)
+    count = 0
+    for columns in iter_deliver_columns(pdus, batch_size, strict):
+        writer.writerows(columns.rows())
+        count += len(columns)
+    return count
+
+
+def write_arrow(pdus: Iterable[PDUData], sink: Any, batch_size: int = 10000, strict: bool = True) -> int:
+    """
+    Decodes SMS-DELIVER TP-DUs, and writes them to an Arrow IPC stream, in record batches of batch_size messages.
+    The sink is a path or a file-like object. Returns the number of messages.
+
+    Requires pyarrow.
+    """
+    try:
+        import pyarrow.ipc
+    except ImportError:
+        raise ImportError("Arrow export requires pyarrow") from None
+    count = 0
+    writer = None
+    try:
+        for columns in iter_deliver_columns(pdus, batch_size, strict):
+            batch = columns.to_arrow()
+            if writer is None:
+                writer = pyarrow.ipc.new_stream(sink, batch.schema)
+            writer.write_batch(batch)
+            count += len(columns)
+        if writer is None:
+            writer = pyarrow.ipc.new_stream(sink, DeliverColumns().to_arrow().schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
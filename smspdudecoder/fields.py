@@ -4,21 +4,157 @@
 """
 TP-DU fields according to GSM 03.40.
 
-Unlike elements, fields represent independent datagram chunks, and are decoded from a file-like object.
+Unlike elements, fields represent independent datagram chunks. They are decoded from PDU data: a hex string,
+a file-like object containing a hex string, raw octets (bytes, bytearray or memoryview), or a `PDUReader`.
+
+Each field has a `decode` class method, accepting any kind of PDU data, and a `read` class method, reading the field
+from a `PDUReader` at its current position.
 
 Fields may contain one or multiple elements.
 """
 
+from .batch import BatchResults
+from .batch import decode_many
 from .codecs import GSM
 from .codecs import UCS2
 from .elements import Date
 from .elements import Number
 from .elements import TypeOfAddress
-from binascii import unhexlify
-from bitstring import BitStream
+from .elements import _octet_table
+from .planning import USER_DATA_LENGTH
+from .planning import capacity
+from .planning import concatenated_header_length
+from .planning import plan_segments
+from .planning import split_units
+from .reader import PDUData
+from .reader import PDUReader
+from .records import AddressRecord
+from .records import ConcatenatedSMSRecord
+from .records import DCSRecord
+from .records import DeliverRecord
+from .records import InformationElementRecord
+from .records import OutgoingPDUHeaderRecord
+from .records import PDUHeaderRecord
+from .records import StatusRecord
+from .records import StatusReportHeaderRecord
+from .records import StatusReportRecord
+from .records import SubmitRecord
+from .records import UserDataHeaderRecord
+from .records import UserDataRecord
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
 from io import StringIO
+from itertools import count
+from sys import intern
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+# decoders of dates (timestamps and validity periods), by format
+_DATE_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    'datetime': Date.decode,
+    'timestamp': Date.decode_timestamp,
+    'components': Date.decode_components,
+}
+
+
+def _date_decoder(dates: str) -> Callable[[Any], Any]:
+    decoder = _DATE_DECODERS.get(dates)
+    if decoder is None:
+        raise ValueError(f"Unknown format of dates \"{dates}\", expected one of {', '.join(_DATE_DECODERS)}")
+    return decoder
+
+
+def _decode_number(ton: str, encoded_number: Union[bytes, bytearray, memoryview]) -> str:
+    if ton == 'alphanumeric':
+        return GSM.decode(encoded_number)
+    return Number.decode(encoded_number)
+
+
+def _encode_number(number: str) -> Tuple[int, bytes]:
+    """
+    Returns the Type Of Address octet and the semi-octets of a telephone number, international if it starts with +.
+    """
+    if number.startswith('+'):
+        return 0x91, bytes.fromhex(Number.encode(number[1:]))
+    return 0x81, bytes.fromhex(Number.encode(number))
+
 
-from typing import Any, Dict
+# references of concatenated messages, when they are not given
+_references = count()
+
+
+def _encoding(data: Union[str, bytes], encoding: Optional[str], elements: Sequence[Tuple[int, bytes]] = ()) -> str:
+    if encoding is not None:
+        return encoding
+    if not isinstance(data, str):
+        return 'binary'
+    return 'gsm' if _gsm_codec(elements).is_encodable(data) else 'ucs2'
+
+
+def _gsm_codec(elements: Sequence[Tuple[int, bytes]]) -> Any:
+    # codec of the national language shift tables given by Information Elements 0x24 and 0x25, if any
+    languages = [0, 0]
+    for iei, value in elements:
+        if iei in (0x24, 0x25) and len(value) == 1:
+            languages[0x25 - iei] = value[0]
+    return GSM.for_language(*languages)
+
+
+def _language_elements(data: Union[str, bytes], encoding: Optional[str], language: Union[None, int, str],
+                       elements: Sequence[Tuple[int, bytes]]) -> Sequence[Tuple[int, bytes]]:
+    """
+    Adds the Information Elements of the national language shift tables encoding a text in GSM 7-bit, when the
+    default alphabet can not encode it: the single shift table, the locking shift table, or both, whichever gives
+    the fewest parts and the shortest user data.
+    """
+    if language is None or encoding not in (None, 'gsm') or not isinstance(data, str):
+        return elements
+    plan = plan_segments(data, encoding, language, elements)
+    if plan.encoding != 'gsm' or _gsm_codec(elements) is not GSM:
+        return elements
+    return list(elements) + plan.elements
+
+
+def _units(data: Union[str, bytes], encoding: str, codec: Any = GSM) -> bytes:
+    # septets for GSM 7-bit, UTF-16 code units for UCS2, octets for binary data
+    if encoding not in DCS.OCTETS:
+        raise ValueError(f"Unknown encoding \"{encoding}\"")
+    if encoding == 'binary':
+        if isinstance(data, str):
+            raise TypeError("Binary data must be bytes")
+        return bytes(data)
+    if not isinstance(data, str):
+        raise TypeError("Text must be a string")
+    if encoding == 'gsm':
+        return codec.encode_septets(data)
+    return data.encode('utf-16be')
+
+
+def _user_data_parts(data: Union[str, bytes], encoding: str, elements: Sequence[Tuple[int, bytes]],
+                     reference: Optional[int], reference_bits: int) -> List[Tuple[bool, bytes]]:
+    """
+    Returns the (udhi, encoded user data) of the parts of a message: a single part if it fits, or the parts of
+    a concatenated message otherwise.
+    """
+    units = _units(data, encoding, _gsm_codec(elements))
+    encoded_elements = [InformationElement.encode_bytes(iei, value) for iei, value in elements]
+    header = UserDataHeader.encode_bytes(encoded_elements) if encoded_elements else b''
+    if len(units) <= capacity(encoding, len(header)):
+        return [(bool(header), UserData._encode_units(units, encoding, header))]
+    header_length = concatenated_header_length(len(header), reference_bits)
+    chunks = [units[start:end] for start, end in split_units(units, encoding, capacity(encoding, header_length))]
+    if len(chunks) > 0xFF:
+        raise ValueError("Message too long")
+    if reference is None:
+        reference = next(_references)
+    reference %= 1 << reference_bits
+    parts = []
+    for number, chunk in enumerate(chunks, 1):
+        concatenation = InformationElement.encode_concatenated_sms(reference, len(chunks), number, reference_bits)
+        part_header = UserDataHeader.encode_bytes([concatenation] + encoded_elements)
+        parts.append((True, UserData._encode_units(chunk, encoding, part_header)))
+    return parts
 
 
 class Address:
@@ -26,7 +162,7 @@ class Address:
     GSM address representation. Typically a telephone number, or an alphanumeric identifier.
     """
     @classmethod
-    def decode(cls, pdu_data: StringIO) -> Dict[str, Any]:
+    def decode(cls, pdu_data: PDUData) -> Dict[str, Any]:
         """
         Decodes an address from PDU.
 
@@ -44,27 +180,102 @@ class Address:
 
         >>> Address.decode(StringIO('14D0C4F23C7D760390EF7619'))
         {'length': 20, 'toa': {'ton': 'alphanumeric', 'npi': 'unknown'}, 'number': 'Design@Home'}
+
+        Raw octets are accepted as well:
+
+        >>> Address.decode(bytes.fromhex('0B915155214365F7'))
+        {'length': 11, 'toa': {'ton': 'international', 'npi': 'isdn'}, 'number': '15551234567'}
         """
-        length = int(pdu_data.read(2), 16)
-        toa = TypeOfAddress.decode(pdu_data.read(2))
-        encoded_number = pdu_data.read(length + length % 2)
-        if toa['ton'] == 'alphanumeric':
-            number = GSM.decode(encoded_number)
-        else:
-            number = Number.decode(encoded_number)
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader)
+
+    @classmethod
+    def decode_record(cls, pdu_data: PDUData) -> AddressRecord:
+        """
+        Same as `decode`, but returns a record. Numbers are interned.
+
+        >>> Address.decode_record('0B915155214365F7')
+        AddressRecord(length=11, toa=TypeOfAddressRecord(ton='international', npi='isdn'), number='15551234567')
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read_record(reader)
+
+    # optional LRUCache of decoded addresses, by encoded address (see `cache.enable_field_caches`)
+    cache: Optional[Any] = None
+
+    @classmethod
+    def read(cls, reader: PDUReader) -> Dict[str, Any]:
+        if cls.cache is None:
+            return cls._read(reader)
+        # cached records are shared, and converted to new dictionaries
+        return cls._read_cached(reader).to_dict()
+
+    @classmethod
+    def _read_cached(cls, reader: PDUReader) -> AddressRecord:
+        start = reader.position
+        # the length is expressed in semi-octets
+        reader.seek(start + 2 + (reader.read_octet() + 1) // 2)
+        return cls.cache.get(bytes(reader.data[start:reader.position]), cls._decode_cached)
+
+    @classmethod
+    def _decode_cached(cls, encoded: bytes) -> AddressRecord:
+        return cls._read_record(PDUReader(encoded))
+
+    @classmethod
+    def _read(cls, reader: PDUReader) -> Dict[str, Any]:
+        # the length is expressed in semi-octets
+        length = reader.read_octet()
+        toa = TypeOfAddress.decode(reader.read_octet())
         return {
             'length': length,
             'toa': toa,
-            'number': number,
+            'number': _decode_number(toa['ton'], reader.read((length + 1) // 2)),
         }
 
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> AddressRecord:
+        if cls.cache is None:
+            return cls._read_record(reader)
+        return cls._read_cached(reader)
+
+    @classmethod
+    def _read_record(cls, reader: PDUReader) -> AddressRecord:
+        length = reader.read_octet()
+        toa = TypeOfAddress.decode_record(reader.read_octet())
+        return AddressRecord(length, toa, intern(_decode_number(toa.ton, reader.read((length + 1) // 2))))
+
+    @classmethod
+    def encode(cls, address: str) -> str:
+        """
+        Encodes an address: a telephone number (international if it starts with +), or an alphanumeric identifier.
+
+        >>> Address.encode('+15551234567')
+        '0B915155214365F7'
+        >>> Address.encode('MMoney')
+        '0BD0CDE6DB5DCE03'
+        """
+        return cls.encode_bytes(address).hex().upper()
+
+    @classmethod
+    def encode_bytes(cls, address: str) -> bytes:
+        """
+        Same as `encode`, but returns octets.
+        """
+        digits = address[1:] if address.startswith('+') else address
+        if digits.isdigit() and digits.isascii():
+            toa, number = _encode_number(address)
+            return bytes((len(digits), toa)) + number
+        septets = GSM.encode_septets(address)
+        # the length is expressed in useful semi-octets
+        return bytes(((len(septets) * 7 + 3) // 4, 0xD0)) + GSM.pack_septets(septets)
+
 
 class SMSC:
     """
     SMS-C datagram.
     """
     @classmethod
-    def decode(cls, pdu_data: StringIO):
+    def decode(cls, pdu_data: PDUData) -> Dict[str, Any]:
         """
         Decodes the SMS-C information PDU.
 
@@ -73,7 +284,47 @@ class SMSC:
         >>> SMSC.decode(StringIO('07912299976758F2'))
         {'length': 7, 'toa': {'ton': 'international', 'npi': 'isdn'}, 'number': '22997976852'}
         """
-        length = int(pdu_data.read(2), 16)
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader)
+
+    @classmethod
+    def decode_record(cls, pdu_data: PDUData) -> AddressRecord:
+        """
+        Same as `decode`, but returns a record. Numbers are interned.
+
+        >>> SMSC.decode_record('00')
+        AddressRecord(length=0, toa=None, number=None)
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read_record(reader)
+
+    EMPTY_RECORD = AddressRecord(0, None, None)
+
+    # optional LRUCache of decoded SMS-C information, by encoded information (see `cache.enable_field_caches`)
+    cache: Optional[Any] = None
+
+    @classmethod
+    def read(cls, reader: PDUReader) -> Dict[str, Any]:
+        if cls.cache is None:
+            return cls._read(reader)
+        # cached records are shared, and converted to new dictionaries
+        return cls._read_cached(reader).to_dict()
+
+    @classmethod
+    def _read_cached(cls, reader: PDUReader) -> AddressRecord:
+        start = reader.position
+        # the length is expressed in octets, including the Type Of Address
+        reader.seek(start + 1 + reader.read_octet())
+        return cls.cache.get(bytes(reader.data[start:reader.position]), cls._decode_cached)
+
+    @classmethod
+    def _decode_cached(cls, encoded: bytes) -> AddressRecord:
+        return cls._read_record(PDUReader(encoded))
+
+    @classmethod
+    def _read(cls, reader: PDUReader) -> Dict[str, Any]:
+        # the length is expressed in octets, including the Type Of Address
+        length = reader.read_octet()
         if not length:
             return {
                 'length': 0,
@@ -81,18 +332,49 @@ class SMSC:
                 'number': None,
             }
 
-        toa = TypeOfAddress.decode(pdu_data.read(2))
-        encoded_number = pdu_data.read(2*(length-1))
-        if toa['ton'] == 'alphanumeric':
-            number = GSM.decode(encoded_number)
-        else:
-            number = Number.decode(encoded_number)
+        toa = TypeOfAddress.decode(reader.read_octet())
         return {
             'length': length,
             'toa': toa,
-            'number': number,
+            'number': _decode_number(toa['ton'], reader.read(length - 1)),
         }
 
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> AddressRecord:
+        if cls.cache is None:
+            return cls._read_record(reader)
+        return cls._read_cached(reader)
+
+    @classmethod
+    def _read_record(cls, reader: PDUReader) -> AddressRecord:
+        length = reader.read_octet()
+        if not length:
+            return cls.EMPTY_RECORD
+        toa = TypeOfAddress.decode_record(reader.read_octet())
+        return AddressRecord(length, toa, intern(_decode_number(toa.ton, reader.read(length - 1))))
+
+    @classmethod
+    def encode(cls, number: Optional[str]) -> str:
+        """
+        Encodes the SMS-C number (international if it starts with +), or the absence of SMS-C information.
+
+        >>> SMSC.encode('+22997976852')
+        '07912299976758F2'
+        >>> SMSC.encode(None)
+        '00'
+        """
+        return cls.encode_bytes(number).hex().upper()
+
+    @classmethod
+    def encode_bytes(cls, number: Optional[str]) -> bytes:
+        """
+        Same as `encode`, but returns octets.
+        """
+        if not number:
+            return b'\x00'
+        toa, encoded_number = _encode_number(number)
+        return bytes((len(encoded_number) + 1, toa)) + encoded_number
+
 
 class PDUHeader:
     """
@@ -106,31 +388,88 @@ class PDUHeader:
     MTI_INV = dict([(v[1], v[0]) for v in MTI.items()])
 
     @classmethod
-    def decode(cls, pdu_data: StringIO) -> Dict[str, Any]:
+    def decode(cls, pdu_data: PDUData) -> Dict[str, Any]:
         """
         Decodes an incomming PDU header.
 
         >>> PDUHeader.decode(StringIO('44'))
         {'rp': False, 'udhi': True, 'sri': False, 'lp': False, 'mms': True, 'mti': 'deliver'}
         """
-        result = dict()
-        io_data = BitStream(hex=pdu_data.read(2))
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader)
+
+    @classmethod
+    def decode_record(cls, pdu_data: PDUData) -> PDUHeaderRecord:
+        """
+        Same as `decode`, but returns a shared record.
+
+        >>> PDUHeader.decode_record('44')
+        PDUHeaderRecord(rp=False, udhi=True, sri=False, lp=False, mms=True, mti='deliver')
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read_record(reader)
+
+    # decoded octets and shared records, by octet value (None when the octet is invalid)
+    _DICTS: Tuple[Optional[Dict[str, Any]], ...]
+    _RECORDS: Tuple[Optional[PDUHeaderRecord], ...]
+
+    @classmethod
+    def read(cls, reader: PDUReader) -> Dict[str, Any]:
+        return cls.decode_octet(reader.read_octet())
+
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> PDUHeaderRecord:
+        octet = reader.read_octet()
+        record = cls._RECORDS[octet]
+        if record is None:
+            return PDUHeaderRecord(**cls._decode_octet(octet)) # raises the appropriate error
+        return record
+
+    @classmethod
+    def decode_octet(cls, octet: int) -> Dict[str, Any]:
+        result = cls._DICTS[octet]
+        if result is None:
+            return cls._decode_octet(octet) # raises the appropriate error
+        return result.copy()
+
+    @classmethod
+    def _decode_octet(cls, octet: int) -> Dict[str, Any]:
+        result: Dict[str, Any] = dict()
         # Reply Path
-        result['rp'] = io_data.read('bool')
+        result['rp'] = bool(octet & 0x80)
         # User Data PDUHeader Indicator
-        result['udhi'] = io_data.read('bool')
+        result['udhi'] = bool(octet & 0x40)
         # Status Report Indication
-        result['sri'] = io_data.read('bool'); io_data.pos += 1 # skips a bit
+        result['sri'] = bool(octet & 0x20) # skips the next bit
         # Loop Prevention
-        result['lp'] = io_data.read('bool')
+        result['lp'] = bool(octet & 0x08)
         # More Messages to Send
-        result['mms'] = io_data.read('bool')
+        result['mms'] = bool(octet & 0x04)
         # Message Type Indicator
-        result['mti'] = cls.MTI.get(io_data.read('bits:2').uint)
+        result['mti'] = cls.MTI.get(octet & 0b11)
         if result['mti'] is None:
             raise ValueError("Invalid Message Type Indicator")
         return result
 
+    @classmethod
+    def encode_octet(cls, header: Dict[str, Any]) -> int:
+        """
+        Encodes a header, as returned by `decode`. Missing flags are not set.
+
+        >>> PDUHeader.encode_octet({'udhi': True, 'mms': True, 'mti': 'deliver'})
+        68
+        """
+        mti = cls.MTI_INV.get(header.get('mti', 'deliver'))
+        if mti is None:
+            raise ValueError("Invalid Message Type Indicator")
+        return ((0x80 if header.get('rp') else 0) | (0x40 if header.get('udhi') else 0)
+                | (0x20 if header.get('sri') else 0) | (0x08 if header.get('lp') else 0)
+                | (0x04 if header.get('mms') else 0) | mti)
+
+
+PDUHeader._DICTS = _octet_table(PDUHeader._decode_octet)
+PDUHeader._RECORDS = tuple(None if header is None else PDUHeaderRecord(**header) for header in PDUHeader._DICTS)
+
 
 class OutgoingPDUHeader:
     """
@@ -144,56 +483,330 @@ class OutgoingPDUHeader:
     MTI_INV = dict([(v[1], v[0]) for v in MTI.items()])
 
     @classmethod
-    def decode(cls, pdu_data: StringIO) -> Dict[str, Any]:
+    def decode(cls, pdu_data: PDUData) -> Dict[str, Any]:
         """
         Decodes an outgoing PDU header.
 
         >>> OutgoingPDUHeader.decode(StringIO('11'))
         {'rp': False, 'udhi': False, 'srr': False, 'vpf': 2, 'rd': False, 'mti': 'submit'}
         """
-        result = dict()
-        io_data = BitStream(hex=pdu_data.read(2))
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader)
+
+    @classmethod
+    def decode_record(cls, pdu_data: PDUData) -> OutgoingPDUHeaderRecord:
+        """
+        Same as `decode`, but returns a shared record.
+
+        >>> OutgoingPDUHeader.decode_record('11')
+        OutgoingPDUHeaderRecord(rp=False, udhi=False, srr=False, vpf=2, rd=False, mti='submit')
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read_record(reader)
+
+    # decoded octets and shared records, by octet value (None when the octet is invalid)
+    _DICTS: Tuple[Optional[Dict[str, Any]], ...]
+    _RECORDS: Tuple[Optional[OutgoingPDUHeaderRecord], ...]
+
+    @classmethod
+    def read(cls, reader: PDUReader) -> Dict[str, Any]:
+        return cls.decode_octet(reader.read_octet())
+
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> OutgoingPDUHeaderRecord:
+        octet = reader.read_octet()
+        record = cls._RECORDS[octet]
+        if record is None:
+            return OutgoingPDUHeaderRecord(**cls._decode_octet(octet)) # raises the appropriate error
+        return record
+
+    @classmethod
+    def decode_octet(cls, octet: int) -> Dict[str, Any]:
+        result = cls._DICTS[octet]
+        if result is None:
+            return cls._decode_octet(octet) # raises the appropriate error
+        return result.copy()
+
+    @classmethod
+    def _decode_octet(cls, octet: int) -> Dict[str, Any]:
+        result: Dict[str, Any] = dict()
         # Reply Path
-        result['rp'] = io_data.read('bool')
+        result['rp'] = bool(octet & 0x80)
         # User Data Header Indicator
-        result['udhi'] = io_data.read('bool')
+        result['udhi'] = bool(octet & 0x40)
         # Status Report Request
-        result['srr'] = io_data.read('bool')
+        result['srr'] = bool(octet & 0x20)
         # Validity Period Format
-        result['vpf'] = io_data.read('bits:2').uint
+        result['vpf'] = (octet >> 3) & 0b11
         # Reject Duplicates
-        result['rd'] = io_data.read('bool')
+        result['rd'] = bool(octet & 0x04)
         # Message Type Indicator
-        result['mti'] = cls.MTI.get(io_data.read('bits:2').uint)
+        result['mti'] = cls.MTI.get(octet & 0b11)
         if result['mti'] is None:
             raise ValueError("Invalid Message Type Indicator")
         return result
 
+    @classmethod
+    def encode_octet(cls, header: Dict[str, Any]) -> int:
+        """
+        Encodes a header, as returned by `decode`. Missing flags are not set.
+
+        >>> OutgoingPDUHeader.encode_octet({'vpf': 2, 'mti': 'submit'})
+        17
+        """
+        mti = cls.MTI_INV.get(header.get('mti', 'submit'))
+        if mti is None:
+            raise ValueError("Invalid Message Type Indicator")
+        vpf = header.get('vpf', 0)
+        if vpf not in (0, 1, 2, 3):
+            raise ValueError("Invalid Validity Period Format")
+        return ((0x80 if header.get('rp') else 0) | (0x40 if header.get('udhi') else 0)
+                | (0x20 if header.get('srr') else 0) | (vpf << 3) | (0x04 if header.get('rd') else 0) | mti)
+
+
+OutgoingPDUHeader._DICTS = _octet_table(OutgoingPDUHeader._decode_octet)
+OutgoingPDUHeader._RECORDS = tuple(None if header is None else OutgoingPDUHeaderRecord(**header)
+                                   for header in OutgoingPDUHeader._DICTS)
+
+
+class StatusReportHeader:
+    """
+    Describes the TPDU header of SMS-STATUS-REPORT
+    """
+    @classmethod
+    def decode(cls, pdu_data: PDUData) -> Dict[str, Any]:
+        """
+        Decodes an SMS-STATUS-REPORT header.
+
+        >>> StatusReportHeader.decode('06')
+        {'udhi': False, 'srq': False, 'lp': False, 'mms': True, 'mti': 'status-report'}
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader)
+
+    @classmethod
+    def decode_record(cls, pdu_data: PDUData) -> StatusReportHeaderRecord:
+        """
+        Same as `decode`, but returns a shared record.
+
+        >>> StatusReportHeader.decode_record('06')
+        StatusReportHeaderRecord(udhi=False, srq=False, lp=False, mms=True, mti='status-report')
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read_record(reader)
+
+    # decoded octets and shared records, by octet value (None when the octet is invalid)
+    _DICTS: Tuple[Optional[Dict[str, Any]], ...]
+    _RECORDS: Tuple[Optional[StatusReportHeaderRecord], ...]
+
+    @classmethod
+    def read(cls, reader: PDUReader) -> Dict[str, Any]:
+        return cls.decode_octet(reader.read_octet())
+
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> StatusReportHeaderRecord:
+        octet = reader.read_octet()
+        record = cls._RECORDS[octet]
+        if record is None:
+            return StatusReportHeaderRecord(**cls._decode_octet(octet)) # raises the appropriate error
+        return record
+
+    @classmethod
+    def decode_octet(cls, octet: int) -> Dict[str, Any]:
+        result = cls._DICTS[octet]
+        if result is None:
+            return cls._decode_octet(octet) # raises the appropriate error
+        return result.copy()
+
+    @classmethod
+    def _decode_octet(cls, octet: int) -> Dict[str, Any]:
+        result: Dict[str, Any] = dict()
+        # User Data Header Indicator
+        result['udhi'] = bool(octet & 0x40)
+        # Status Report Qualifier: the status report is the result of an SMS-COMMAND, rather than an SMS-SUBMIT
+        result['srq'] = bool(octet & 0x20)
+        # Loop Prevention
+        result['lp'] = bool(octet & 0x08)
+        # More Messages to Send
+        result['mms'] = bool(octet & 0x04)
+        # Message Type Indicator, of incoming TP-DUs
+        result['mti'] = PDUHeader.MTI.get(octet & 0b11)
+        if result['mti'] is None:
+            raise ValueError("Invalid Message Type Indicator")
+        return result
+
+
+StatusReportHeader._DICTS = _octet_table(StatusReportHeader._decode_octet)
+StatusReportHeader._RECORDS = tuple(None if header is None else StatusReportHeaderRecord(**header)
+                                    for header in StatusReportHeader._DICTS)
+
 
 class DCS:
     """
     Data Coding Scheme (simplified, only the encoding is read)
     """
     @classmethod
-    def decode(cls, pdu_data: StringIO) -> Dict[str, str]:
-        dcs = int(pdu_data.read(2), 16)
+    def decode(cls, pdu_data: PDUData) -> Dict[str, str]:
+        """
+        Decodes the Data Coding Scheme.
+
+        >>> DCS.decode('08')
+        {'encoding': 'ucs2'}
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader)
+
+    @classmethod
+    def decode_record(cls, pdu_data: PDUData) -> DCSRecord:
+        """
+        Same as `decode`, but returns a shared record.
+
+        >>> DCS.decode_record('08')
+        DCSRecord(encoding='ucs2')
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read_record(reader)
+
+    RECORDS = {
+        'binary': DCSRecord('binary'),
+        'ucs2': DCSRecord('ucs2'),
+        'gsm': DCSRecord('gsm'),
+    }
+
+    # encodings, by octet value
+    ENCODINGS: Tuple[str, ...]
+
+    @classmethod
+    def read(cls, reader: PDUReader) -> Dict[str, str]:
+        return {'encoding': cls.ENCODINGS[reader.read_octet()]}
+
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> DCSRecord:
+        return cls.RECORDS[cls.ENCODINGS[reader.read_octet()]]
+
+    # octets of the encodings, in the general data coding group, without class
+    OCTETS = {
+        'gsm': 0x00,
+        'binary': 0x04,
+        'ucs2': 0x08,
+    }
+
+    @classmethod
+    def encode_octet(cls, encoding: str) -> int:
+        """
+        Encodes the Data Coding Scheme of the encoding.
+
+        >>> DCS.encode_octet('ucs2')
+        8
+        """
+        octet = cls.OCTETS.get(encoding)
+        if octet is None:
+            raise ValueError(f"Unknown encoding \"{encoding}\"")
+        return octet
+
+    @classmethod
+    def decode_octet(cls, dcs: int) -> str:
         coding = (dcs & 0b1100) >> 2
         if coding == 1:
-            return {'encoding': 'binary'}
+            return 'binary'
         elif coding == 2:
-            return {'encoding': 'ucs2'}
+            return 'ucs2'
         else:
-            return {'encoding': 'gsm'}
+            return 'gsm'
+
+
+DCS.ENCODINGS = tuple(DCS.decode_octet(octet) for octet in range(256))
+
+
+class Status:
+    """
+    Status of a short message, as reported by SMS-STATUS-REPORT TP-DUs.
+
+    The category tells whether the transaction is completed, the SC is still trying to deliver the message
+    ('retrying'), or gave up because of a permanent or temporary error. The reason is None for reserved values, and
+    values specific to SCs.
+    """
+    @classmethod
+    def decode(cls, pdu_data: PDUData) -> Dict[str, Any]:
+        """
+        Decodes a status.
+
+        >>> Status.decode('00')
+        {'value': 0, 'category': 'completed', 'reason': 'received'}
+        >>> Status.decode('46')
+        {'value': 70, 'category': 'permanent-error', 'reason': 'validity-expired'}
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader)
+
+    @classmethod
+    def decode_record(cls, pdu_data: PDUData) -> StatusRecord:
+        """
+        Same as `decode`, but returns a shared record.
+
+        >>> Status.decode_record('21')
+        StatusRecord(value=33, category='retrying', reason='sme-busy')
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read_record(reader)
+
+    # categories, by bits 6 and 5
+    CATEGORIES = ('completed', 'retrying', 'permanent-error', 'temporary-error')
+
+    # reasons of temporary errors, whether the SC is still trying or not
+    _TEMPORARY_REASONS = ('congestion', 'sme-busy', 'no-response', 'service-rejected', 'qos-unavailable', 'sme-error')
+
+    REASONS = {
+        0x00: 'received',
+        0x01: 'forwarded',
+        0x02: 'replaced',
+        **{0x20 + value: reason for value, reason in enumerate(_TEMPORARY_REASONS)},
+        0x40: 'remote-procedure-error',
+        0x41: 'incompatible-destination',
+        0x42: 'connection-rejected',
+        0x43: 'not-obtainable',
+        0x44: 'qos-unavailable',
+        0x45: 'no-interworking',
+        0x46: 'validity-expired',
+        0x47: 'deleted-by-originator',
+        0x48: 'deleted-by-administration',
+        0x49: 'not-exist',
+        **{0x60 + value: reason for value, reason in enumerate(_TEMPORARY_REASONS)},
+    }
+
+    # shared records, by octet value
+    _RECORDS: Tuple[StatusRecord, ...]
+
+    @classmethod
+    def read(cls, reader: PDUReader) -> Dict[str, Any]:
+        return cls._RECORDS[reader.read_octet()].to_dict()
+
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> StatusRecord:
+        return cls._RECORDS[reader.read_octet()]
+
+    @classmethod
+    def _decode_octet(cls, octet: int) -> Dict[str, Any]:
+        return {
+            'value': octet,
+            'category': 'reserved' if octet & 0x80 else cls.CATEGORIES[octet >> 5],
+            'reason': cls.REASONS.get(octet),
+        }
+
+
+Status._RECORDS = tuple(StatusRecord(**Status._decode_octet(octet)) for octet in range(256))
 
 
 class InformationElement:
     @staticmethod
-    def concatenated_sms(data: str, length_bits: int = 8) -> Dict[str, Any]:
-        io_data = BitStream(hex=data)
+    def concatenated_sms(data: Union[str, bytes, bytearray, memoryview], length_bits: int = 8) -> Dict[str, Any]:
+        if isinstance(data, str):
+            data = bytes.fromhex(data)
+        reference_length = length_bits // 8
         return {
-            'reference': io_data.read(f'uintbe:{length_bits}'),
-            'parts_count': io_data.read('uintbe:8'),
-            'part_number': io_data.read('uintbe:8'),
+            'reference': int.from_bytes(data[:reference_length], 'big'),
+            'parts_count': data[reference_length],
+            'part_number': data[reference_length + 1],
         }
 
     IEI = {
@@ -202,62 +815,243 @@ class InformationElement:
     }
 
     @classmethod
-    def decode(cls, pdu_data: StringIO) -> Dict[str, Any]:
-        iei = int(pdu_data.read(2), 16)
-        length = int(pdu_data.read(2), 16)
-        data = pdu_data.read(2*length)
+    def encode_bytes(cls, iei: int, data: bytes) -> bytes:
+        """
+        Encodes an Information Element.
+
+        >>> InformationElement.encode_bytes(0x0A, b'\\x00\\x00\\x00\\x00').hex().upper()
+        '0A0400000000'
+        """
+        if len(data) > 0xFF:
+            raise ValueError("Information Element too long")
+        return bytes((iei, len(data))) + data
+
+    @classmethod
+    def encode_concatenated_sms(cls, reference: int, parts_count: int, part_number: int,
+                                length_bits: int = 8) -> bytes:
+        """
+        Encodes the Information Element of a part of a concatenated SMS, with an 8-bit or a 16-bit reference.
+
+        >>> InformationElement.encode_concatenated_sms(204, 2, 1).hex().upper()
+        '0003CC0201'
+        """
+        if length_bits not in (8, 16):
+            raise ValueError("Invalid length of the reference")
+        reference_length = length_bits // 8
+        data = reference.to_bytes(reference_length, 'big') + bytes((parts_count, part_number))
+        return cls.encode_bytes(0x00 if length_bits == 8 else 0x08, data)
+
+    @classmethod
+    def decode(cls, pdu_data: PDUData) -> Dict[str, Any]:
+        """
+        Decodes an Information Element of the User Data Header.
+
+        >>> InformationElement.decode('0003CC0201')
+        {'iei': 0, 'length': 3, 'data': {'reference': 204, 'parts_count': 2, 'part_number': 1}}
+
+        Unknown elements are returned as hex strings:
+
+        >>> InformationElement.decode('0A0400000000')
+        {'iei': 10, 'length': 4, 'data': '00000000'}
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader)
+
+    @classmethod
+    def read(cls, reader: PDUReader) -> Dict[str, Any]:
+        iei = reader.read_octet()
+        length = reader.read_octet()
+        data = reader.read(length)
         processing_func = cls.IEI.get(iei)
-        processed_data: Any = data
+        processed_data: Any
         if processing_func is not None:
             processed_data = processing_func(data)
+        else:
+            processed_data = data.hex().upper()
         return {
             'iei': iei,
             'length': length,
             'data': processed_data,
         }
 
+    # records of processed data, by IEI
+    IEI_RECORDS = {
+        0x00: ConcatenatedSMSRecord,
+        0x08: ConcatenatedSMSRecord,
+    }
+
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> InformationElementRecord:
+        iei = reader.read_octet()
+        length = reader.read_octet()
+        data = reader.read(length)
+        processing_func = cls.IEI.get(iei)
+        processed_data: Any
+        if processing_func is not None:
+            processed_data = cls.IEI_RECORDS[iei](**processing_func(data))
+        else:
+            processed_data = data.hex().upper()
+        return InformationElementRecord(iei, length, processed_data)
+
 
 class UserDataHeader:
     @classmethod
-    def decode(cls, pdu_data: StringIO) -> Dict[str, Any]:
-        length = int(pdu_data.read(2), 16)
-        final_position = pdu_data.tell() + 2 * length
+    def decode(cls, pdu_data: PDUData) -> Dict[str, Any]:
+        """
+        Decodes a User Data Header.
+
+        >>> header = UserDataHeader.decode('050003CC0201')
+        >>> header['length'], header['elements']
+        (5, [{'iei': 0, 'length': 3, 'data': {'reference': 204, 'parts_count': 2, 'part_number': 1}}])
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader)
+
+    @classmethod
+    def read(cls, reader: PDUReader) -> Dict[str, Any]:
+        length = reader.read_octet()
+        final_position = reader.position + length
         elements = list()
-        while pdu_data.tell() < final_position:
-            elements.append(InformationElement.decode(pdu_data))
+        while reader.position < final_position:
+            elements.append(InformationElement.read(reader))
         return {
             'length': length,
             'elements': elements,
         }
 
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> UserDataHeaderRecord:
+        length = reader.read_octet()
+        final_position = reader.position + length
+        elements = list()
+        while reader.position < final_position:
+            elements.append(InformationElement.read_record(reader))
+        return UserDataHeaderRecord(length, tuple(elements))
+
+    @classmethod
+    def national_languages(cls, header: Union[bytes, bytearray, memoryview]) -> Tuple[int, int]:
+        """
+        Returns the (locking shift, single shift) national language identifiers of an encoded User Data Header,
+        given by its Information Elements 0x25 and 0x24 (0 for the default alphabet and extended alphabet).
+
+        >>> UserDataHeader.national_languages(bytes.fromhex('0B0003CC0201250101240103'))
+        (1, 3)
+        """
+        languages = [0, 0]
+        position = 1
+        end = min(len(header), header[0] + 1)
+        while position + 2 < end:
+            iei, length = header[position], header[position + 1]
+            if iei in (0x24, 0x25) and length == 1:
+                languages[0x25 - iei] = header[position + 2]
+            position += 2 + length
+        return languages[0], languages[1]
+
+    @classmethod
+    def encode_bytes(cls, elements: Iterable[bytes]) -> bytes:
+        """
+        Encodes a User Data Header from encoded Information Elements.
+
+        >>> UserDataHeader.encode_bytes([InformationElement.encode_concatenated_sms(204, 2, 1)]).hex().upper()
+        '050003CC0201'
+        """
+        data = b''.join(elements)
+        return bytes((len(data),)) + data
+
 
 class UserData:
     @classmethod
-    def decode(cls, pdu_data: StringIO, ctx: dict = None):
-        length = int(pdu_data.read(2), 16)
-        pdu_start = pdu_data.tell()
-        header, header_length = None, 0
-        if ctx['header']['udhi']:
-            header = UserDataHeader.decode(pdu_data)
-            header_length = header['length'] + 1
+    def decode(cls, pdu_data: PDUData, ctx: dict = None) -> Dict[str, Any]:
+        """
+        Decodes the User Data, according to the header and the data coding scheme of the context.
+
+        >>> UserData.decode('04D4E2940A', {'header': {'udhi': False}, 'dcs': {'encoding': 'gsm'}})
+        {'header': None, 'data': 'TEST'}
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader, ctx)
+
+    @classmethod
+    def read(cls, reader: PDUReader, ctx: dict = None) -> Dict[str, Any]:
+        header, data = cls._read(reader, ctx['header']['udhi'], ctx['dcs']['encoding'], False)
+        return {
+            'header': header,
+            'data': data,
+        }
+
+    @classmethod
+    def read_record(cls, reader: PDUReader, udhi: bool, encoding: str) -> UserDataRecord:
+        return UserDataRecord(*cls._read(reader, udhi, encoding, True))
+
+    @classmethod
+    def _read(cls, reader: PDUReader, udhi: bool, encoding: str, record: bool) -> Tuple[Any, Any]:
+        length = reader.read_octet()
+        pdu_start = reader.position
+        header: Any = None
+        header_length = 0
+        if udhi:
+            header = UserDataHeader.read_record(reader) if record else UserDataHeader.read(reader)
+            header_length = reader.data[pdu_start] + 1
         data: Any = None
-        if ctx['dcs']['encoding'] == 'binary':
-            data = unhexlify(pdu_data.read(2*(length-header_length)))
-        elif ctx['dcs']['encoding'] == 'gsm':
-            pdu_data.seek(pdu_start)
+        if encoding == 'binary':
+            data = bytes(reader.read(length - header_length))
+        elif encoding == 'gsm':
+            reader.seek(pdu_start)
             header_length_bits = header_length * 8
             header_length_septets = int(header_length_bits / 7) + (1 if header_length_bits % 7 else 0)
             data_length_bits = length * 7
             data_length_bytes = int(data_length_bits / 8) + (1 if data_length_bits % 8 else 0)
-            data = GSM.decode(pdu_data.read(2*data_length_bytes))[header_length_septets:length]
-        elif ctx['dcs']['encoding'] == 'ucs2':
-            data = UCS2.decode(pdu_data.read(2*(length-header_length)))
+            # only the septets of the text are decoded: the header may contain escape septets, and escaped
+            # characters take two septets
+            septets = GSM.unpack_septets(reader.read(data_length_bytes))
+            codec = GSM
+            if header_length:
+                # national language shift tables
+                codec = GSM.for_language(*UserDataHeader.national_languages(
+                    reader.data[pdu_start:pdu_start + header_length]))
+            data = codec.decode_septets(septets[header_length_septets:length])
+        elif encoding == 'ucs2':
+            data = UCS2.decode(reader.read(length - header_length))
         else:
             raise AssertionError("Non-recognized encoding")
-        return {
-            'header': header,
-            'data': data,
-        }
+        return header, data
+
+    # maximum length of the user data, in octets
+    MAX_LENGTH = USER_DATA_LENGTH
+
+    @classmethod
+    def encode_bytes(cls, data: Union[str, bytes], encoding: str, header: bytes = b'') -> bytes:
+        """
+        Encodes the user data with its length, after a User Data Header if any (see `UserDataHeader.encode_bytes`).
+
+        GSM 7-bit text starts on the first septet boundary after the header.
+
+        >>> UserData.encode_bytes('hellohello', 'gsm').hex().upper()
+        '0AE8329BFD4697D9EC37'
+        >>> UserData.encode_bytes('hello', 'gsm', bytes.fromhex('050003CC0201')).hex().upper()
+        '0C050003CC0201D06536FB0D'
+
+        Texts are encoded with the national language shift tables given by the header, if any.
+        """
+        codec = GSM.for_language(*UserDataHeader.national_languages(header)) if header else GSM
+        return cls._encode_units(_units(data, encoding, codec), encoding, header)
+
+    @classmethod
+    def _encode_units(cls, units: bytes, encoding: str, header: bytes) -> bytes:
+        if encoding == 'gsm':
+            header_septets = (len(header) * 8 + 6) // 7
+            if header:
+                # the header takes the place of the first septets, and of the fill bits
+                packed = header + GSM.pack_septets(bytes(header_septets) + units)[len(header):]
+            else:
+                packed = GSM.pack_septets(units)
+            length = header_septets + len(units)
+        else:
+            packed = header + units
+            length = len(packed)
+        if len(packed) > cls.MAX_LENGTH:
+            raise ValueError("User data too long")
+        return bytes((length,)) + packed
 
 
 class SMSDeliver:
@@ -265,53 +1059,476 @@ class SMSDeliver:
     SMS-DELIVER TP-DU.
     """
     @classmethod
-    def decode(cls, pdu_data: StringIO):
+    def decode(cls, pdu_data: PDUData, dates: str = 'datetime') -> Dict[str, Any]:
         """
         Decodes an SMS-DELIVER TP-DU.
+
+        >>> SMSDeliver.decode('07916407058099F9040B916407950303F100008921222140140004D4E2940A')['user_data']
+        {'header': None, 'data': 'TEST'}
+
+        The timestamp is a UTC datetime by default. It can also be decoded as a POSIX timestamp, or as local
+        components (see `Date.decode_components`):
+
+        >>> SMSDeliver.decode('07916407058099F9040B916407950303F100008921222140140004D4E2940A', 'timestamp')['scts']
+        4070088281
         """
-        result = dict()
-        result['smsc'] = SMSC.decode(pdu_data)
-        result['header'] = PDUHeader.decode(pdu_data)
-        result['sender'] = Address.decode(pdu_data)
-        result['pid'] = int(pdu_data.read(2), 16)
-        result['dcs'] = DCS.decode(pdu_data)
-        result['scts'] = Date.decode(pdu_data.read(2*7))
-        result['user_data'] = UserData.decode(pdu_data, result)
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader, dates)
+
+    @classmethod
+    def decode_record(cls, pdu_data: PDUData) -> DeliverRecord:
+        """
+        Same as `decode`, but returns a record. Use its `to_dict` method to get the result of `decode`.
+
+        >>> SMSDeliver.decode_record('07916407058099F9040B916407950303F100008921222140140004D4E2940A').sender.number
+        '46705930301'
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read_record(reader)
+
+    @classmethod
+    def decode_many(cls, pdus: Iterable[PDUData], **options) -> BatchResults:
+        """
+        Decodes many SMS-DELIVER TP-DUs, by default spread over a pool of processes.
+
+        See `smspdudecoder.batch.decode_many` for the available options.
+        """
+        return decode_many(cls.decode, pdus, **options)
+
+    @classmethod
+    def read(cls, reader: PDUReader, dates: str = 'datetime') -> Dict[str, Any]:
+        decode_date = _date_decoder(dates)
+        result: Dict[str, Any] = dict()
+        result['smsc'] = SMSC.read(reader)
+        result['header'] = PDUHeader.read(reader)
+        result['sender'] = Address.read(reader)
+        result['pid'] = reader.read_octet()
+        result['dcs'] = DCS.read(reader)
+        result['scts'] = decode_date(reader.read(7))
+        result['user_data'] = UserData.read(reader, result)
         return result
 
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> DeliverRecord:
+        smsc = SMSC.read_record(reader)
+        header = PDUHeader.read_record(reader)
+        sender = Address.read_record(reader)
+        pid = reader.read_octet()
+        dcs = DCS.read_record(reader)
+        scts = Date.decode(reader.read(7))
+        user_data = UserData.read_record(reader, header.udhi, dcs.encoding)
+        return DeliverRecord(smsc, header, sender, pid, dcs, scts, user_data)
+
+    @classmethod
+    def encode(cls, sender: str, data: Union[str, bytes], scts: Optional[datetime] = None,
+               encoding: Optional[str] = None, smsc: Optional[str] = None, pid: int = 0,
+               elements: Sequence[Tuple[int, bytes]] = (), mms: bool = True, rp: bool = False, sri: bool = False,
+               lp: bool = False, language: Union[None, int, str] = None) -> str:
+        """
+        Encodes an SMS-DELIVER TP-DU, with a single part.
+
+        - sender: telephone number (international if it starts with +) or alphanumeric identifier.
+        - data: text, or bytes for binary data.
+        - scts: Service Centre Time Stamp, the current time by default.
+        - encoding: 'gsm', 'ucs2' or 'binary'. By default, GSM 7-bit if the text can be encoded with it, UCS2
+          otherwise, and binary for bytes.
+        - smsc: number of the SMS-C, if any.
+        - elements: (iei, data) of Information Elements of a User Data Header.
+        - mms, rp, sri, lp: flags of the header (as returned by `PDUHeader.decode`).
+        - language: name (see `GSM.LANGUAGES`) or identifier of a national language. Texts that the default
+          alphabet can not encode are encoded in GSM 7-bit with the shift tables of this language, when they can,
+          instead of UCS2.
+
+        Raises ValueError if the message does not fit in a single part: see `encode_parts`.
+
+        >>> SMSDeliver.encode('+46705930301', 'TEST', datetime(2098, 12, 22, 12, 4, 41, tzinfo=timezone.utc),
+        ...                   smsc='+46705008999')
+        '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+        >>> sms = SMSDeliver.decode(SMSDeliver.encode('+46705930301', 'Günaydın', language='turkish'))
+        >>> sms['dcs']['encoding'], sms['user_data']
+        ('gsm', {'header': {'length': 3, 'elements': [{'iei': 37, 'length': 1, 'data': '01'}]}, 'data': 'Günaydın'})
+        """
+        elements = _language_elements(data, encoding, language, elements)
+        encoding = _encoding(data, encoding, elements)
+        encoded_elements = [InformationElement.encode_bytes(iei, value) for iei, value in elements]
+        header = UserDataHeader.encode_bytes(encoded_elements) if encoded_elements else b''
+        user_data = UserData.encode_bytes(data, encoding, header)
+        return cls._encode(sender, scts, encoding, smsc, pid, mms, rp, sri, lp, bool(header), user_data)
+
+    @classmethod
+    def encode_parts(cls, sender: str, data: Union[str, bytes], scts: Optional[datetime] = None,
+                     encoding: Optional[str] = None, smsc: Optional[str] = None, pid: int = 0,
+                     elements: Sequence[Tuple[int, bytes]] = (), mms: bool = True, rp: bool = False,
+                     sri: bool = False, lp: bool = False, reference: Optional[int] = None,
+                     reference_bits: int = 8, language: Union[None, int, str] = None) -> Iterator[str]:
+        """
+        Same as `encode`, but splits long messages into the parts of a concatenated SMS, with an 8-bit or 16-bit
+        reference (by default, the next value of a counter). Messages which fit in one part are not split.
+
+        >>> date = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        >>> parts = list(SMSDeliver.encode_parts('+46705930301', 'Hello! ' * 30, date, reference=1))
+        >>> [SMSDeliver.decode(part)['user_data']['header']['elements'][0]['data'] for part in parts]
+        [{'reference': 1, 'parts_count': 2, 'part_number': 1}, {'reference': 1, 'parts_count': 2, 'part_number': 2}]
+        """
+        elements = _language_elements(data, encoding, language, elements)
+        encoding = _encoding(data, encoding, elements)
+        for udhi, user_data in _user_data_parts(data, encoding, elements, reference, reference_bits):
+            yield cls._encode(sender, scts, encoding, smsc, pid, mms, rp, sri, lp, udhi, user_data)
+
+    @classmethod
+    def _encode(cls, sender: str, scts: Optional[datetime], encoding: str, smsc: Optional[str], pid: int,
+                mms: bool, rp: bool, sri: bool, lp: bool, udhi: bool, user_data: bytes) -> str:
+        if scts is None:
+            scts = datetime.now(timezone.utc)
+        header = PDUHeader.encode_octet({'rp': rp, 'udhi': udhi, 'sri': sri, 'lp': lp, 'mms': mms, 'mti': 'deliver'})
+        return (
+            SMSC.encode_bytes(smsc)
+            + bytes((header,))
+            + Address.encode_bytes(sender)
+            + bytes((pid, DCS.encode_octet(encoding)))
+            + bytes.fromhex(Date.encode(scts))
+            + user_data
+        ).hex().upper()
+
 
 class SMSSubmit:
     """
     SMS-SUBMIT TP-DU.
     """
     @classmethod
-    def decode(cls, pdu_data: StringIO):
+    def decode(cls, pdu_data: PDUData, dates: str = 'datetime') -> Dict[str, Any]:
         """
         Decodes an SMS-SUBMIT TP-DU.
+
+        >>> SMSSubmit.decode('0011000B916407281553F80000AA0AE8329BFD4697D9EC37')['user_data']
+        {'header': None, 'data': 'hellohello'}
+
+        Absolute validity periods are decoded as with `SMSDeliver.decode`.
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader, dates)
+
+    @classmethod
+    def decode_record(cls, pdu_data: PDUData) -> SubmitRecord:
         """
-        result = dict()
-        result['smsc'] = SMSC.decode(pdu_data)
-        result['header'] = OutgoingPDUHeader.decode(pdu_data)
-        result['message-ref'] = int(pdu_data.read(2), 16)
-        result['recipient'] = Address.decode(pdu_data)
-        result['pid'] = int(pdu_data.read(2), 16)
-        result['dcs'] = DCS.decode(pdu_data)
+        Same as `decode`, but returns a record. Use its `to_dict` method to get the result of `decode`.
+
+        >>> SMSSubmit.decode_record('0011000B916407281553F80000AA0AE8329BFD4697D9EC37').validity
+        ('days', 4)
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read_record(reader)
+
+    @classmethod
+    def decode_many(cls, pdus: Iterable[PDUData], **options) -> BatchResults:
+        """
+        Decodes many SMS-SUBMIT TP-DUs, by default spread over a pool of processes.
+
+        See `smspdudecoder.batch.decode_many` for the available options.
+        """
+        return decode_many(cls.decode, pdus, **options)
+
+    @classmethod
+    def read(cls, reader: PDUReader, dates: str = 'datetime') -> Dict[str, Any]:
+        decode_date = _date_decoder(dates)
+        result: Dict[str, Any] = dict()
+        result['smsc'] = SMSC.read(reader)
+        result['header'] = OutgoingPDUHeader.read(reader)
+        result['message-ref'] = reader.read_octet()
+        result['recipient'] = Address.read(reader)
+        result['pid'] = reader.read_octet()
+        result['dcs'] = DCS.read(reader)
         if result['header']['vpf'] == 0:
             pass
         elif result['header']['vpf'] == 2:
-            result['vp'] = int(pdu_data.read(2), 16)
-            if result['vp'] <= 143:
-                result['validity-minutes'] = result['vp'] * 5
-            elif result['vp'] <= 167:
-                result['validity-hours'] = 12 + (result['vp'] - 143) // 2
-            elif result['vp'] <= 196:
-                result['validity-days'] = result['vp'] - 166
-            else:
-                result['validity-weeks'] = result['vp'] - 192
+            result['vp'] = reader.read_octet()
+            unit, value = cls.relative_validity(result['vp'])
+            result[f'validity-{unit}'] = value
         elif result['header']['vpf'] == 3:
-            result['vp'] = Date.decode(pdu_data.read(2*7))
+            result['vp'] = decode_date(reader.read(7))
         else:
-            pdu_data.read(2*7) # skips the enhanced format
+            reader.read(7) # skips the enhanced format
 
-        result['user_data'] = UserData.decode(pdu_data, result)
+        result['user_data'] = UserData.read(reader, result)
         return result
+
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> SubmitRecord:
+        smsc = SMSC.read_record(reader)
+        header = OutgoingPDUHeader.read_record(reader)
+        message_ref = reader.read_octet()
+        recipient = Address.read_record(reader)
+        pid = reader.read_octet()
+        dcs = DCS.read_record(reader)
+        vp: Any = None
+        validity: Optional[Tuple[str, int]] = None
+        if header.vpf == 2:
+            vp = reader.read_octet()
+            validity = cls.relative_validity(vp)
+        elif header.vpf == 3:
+            vp = Date.decode(reader.read(7))
+        elif header.vpf == 1:
+            reader.read(7) # skips the enhanced format
+        user_data = UserData.read_record(reader, header.udhi, dcs.encoding)
+        return SubmitRecord(smsc, header, message_ref, recipient, pid, dcs, vp, validity, user_data)
+
+    @classmethod
+    def encode(cls, recipient: str, data: Union[str, bytes], encoding: Optional[str] = None,
+               smsc: Optional[str] = None, message_ref: int = 0, pid: int = 0,
+               validity: Union[None, int, timedelta, datetime] = None, elements: Sequence[Tuple[int, bytes]] = (),
+               srr: bool = False, rp: bool = False, rd: bool = False, language: Union[None, int, str] = None) -> str:
+        """
+        Encodes an SMS-SUBMIT TP-DU, with a single part.
+
+        - recipient: telephone number, international if it starts with +.
+        - data, encoding, smsc, elements and language: as in `SMSDeliver.encode`.
+        - validity: None for no validity period, a relative validity period as an octet or a timedelta (rounded
+          up to the next available period), or an absolute validity period as a datetime.
+        - srr, rp, rd: flags of the header (as returned by `OutgoingPDUHeader.decode`).
+
+        Raises ValueError if the message does not fit in a single part: see `encode_parts`.
+
+        >>> SMSSubmit.encode('+46708251358', 'hellohello', validity=timedelta(days=4))
+        '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+        """
+        elements = _language_elements(data, encoding, language, elements)
+        encoding = _encoding(data, encoding, elements)
+        encoded_elements = [InformationElement.encode_bytes(iei, value) for iei, value in elements]
+        header = UserDataHeader.encode_bytes(encoded_elements) if encoded_elements else b''
+        user_data = UserData.encode_bytes(data, encoding, header)
+        return cls._encode(recipient, encoding, smsc, message_ref, pid, validity, srr, rp, rd, bool(header),
+                           user_data)
+
+    @classmethod
+    def encode_parts(cls, recipient: str, data: Union[str, bytes], encoding: Optional[str] = None,
+                     smsc: Optional[str] = None, message_ref: int = 0, pid: int = 0,
+                     validity: Union[None, int, timedelta, datetime] = None,
+                     elements: Sequence[Tuple[int, bytes]] = (), srr: bool = False, rp: bool = False,
+                     rd: bool = False, reference: Optional[int] = None, reference_bits: int = 8,
+                     language: Union[None, int, str] = None) -> Iterator[str]:
+        """
+        Same as `encode`, but splits long messages into the parts of a concatenated SMS, as
+        `SMSDeliver.encode_parts` does. Message references of the parts start at message_ref.
+
+        >>> text = 'Привет! ' * 20
+        >>> parts = list(SMSSubmit.encode_parts('+46708251358', text, reference=0x1234, reference_bits=16))
+        >>> [len(SMSSubmit.decode(part)['user_data']['data']) for part in parts]
+        [66, 66, 28]
+        """
+        elements = _language_elements(data, encoding, language, elements)
+        encoding = _encoding(data, encoding, elements)
+        parts = _user_data_parts(data, encoding, elements, reference, reference_bits)
+        for index, (udhi, user_data) in enumerate(parts):
+            yield cls._encode(recipient, encoding, smsc, (message_ref + index) % 0x100, pid, validity, srr, rp, rd,
+                              udhi, user_data)
+
+    @classmethod
+    def _encode(cls, recipient: str, encoding: str, smsc: Optional[str], message_ref: int, pid: int,
+                validity: Union[None, int, timedelta, datetime], srr: bool, rp: bool, rd: bool, udhi: bool,
+                user_data: bytes) -> str:
+        if validity is None:
+            vpf, vp = 0, b''
+        elif isinstance(validity, datetime):
+            vpf, vp = 3, bytes.fromhex(Date.encode(validity))
+        else:
+            if isinstance(validity, timedelta):
+                validity = cls.relative_validity_period(validity)
+            if not 0 <= validity <= 0xFF:
+                raise ValueError("Invalid relative validity period")
+            vpf, vp = 2, bytes((validity,))
+        header = OutgoingPDUHeader.encode_octet({'rp': rp, 'udhi': udhi, 'srr': srr, 'vpf': vpf, 'rd': rd,
+                                                 'mti': 'submit'})
+        return (
+            SMSC.encode_bytes(smsc)
+            + bytes((header, message_ref))
+            + Address.encode_bytes(recipient)
+            + bytes((pid, DCS.encode_octet(encoding)))
+            + vp
+            + user_data
+        ).hex().upper()
+
+    @staticmethod
+    def relative_validity(vp: int) -> Tuple[str, int]:
+        """
+        Returns the (unit, value) of a relative validity period.
+
+        >>> SMSSubmit.relative_validity(170)
+        ('days', 4)
+        """
+        if vp <= 143:
+            return 'minutes', vp * 5
+        elif vp <= 167:
+            return 'hours', 12 + (vp - 143) // 2
+        elif vp <= 196:
+            return 'days', vp - 166
+        else:
+            return 'weeks', vp - 192
+
+    # durations of the relative validity periods, by octet
+    _RELATIVE_VALIDITY_DURATIONS: List[timedelta]
+
+    @classmethod
+    def relative_validity_period(cls, duration: timedelta) -> int:
+        """
+        Returns the octet of the shortest relative validity period lasting at least the given duration.
+
+        >>> SMSSubmit.relative_validity_period(timedelta(days=4))
+        170
+        >>> SMSSubmit.relative_validity_period(timedelta(minutes=7))
+        2
+        """
+        vp = bisect_left(cls._RELATIVE_VALIDITY_DURATIONS, duration)
+        if vp > 0xFF:
+            raise ValueError("Validity period too long")
+        return vp
+
+
+SMSSubmit._RELATIVE_VALIDITY_DURATIONS = [
+    timedelta(**{unit: value}) for unit, value in map(SMSSubmit.relative_validity, range(0x100))
+]
+
+
+class SMSStatusReport:
+    """
+    SMS-STATUS-REPORT TP-DU, reporting the delivery of an SMS-SUBMIT to its recipient.
+    """
+    @classmethod
+    def decode(cls, pdu_data: PDUData, dates: str = 'datetime') -> Dict[str, Any]:
+        """
+        Decodes an SMS-STATUS-REPORT TP-DU: the message reference of the reported SMS-SUBMIT, its recipient, the
+        Service Centre Time Stamp, the Discharge Time (dt) and the status. The protocol identifier, data coding scheme
+        and user data are only present when the parameter indicator says so.
+
+        >>> report = SMSStatusReport.decode('07916407058099F9062A0B916407950303F1892122214014008921222150140000')
+        >>> report['message-ref'], report['status']
+        (42, {'value': 0, 'category': 'completed', 'reason': 'received'})
+        >>> report['dt']
+        datetime.datetime(2098, 12, 22, 12, 5, 41, tzinfo=datetime.timezone.utc)
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read(reader, dates)
+
+    @classmethod
+    def decode_record(cls, pdu_data: PDUData) -> StatusReportRecord:
+        """
+        Same as `decode`, but returns a record. Use its `to_dict` method to get the result of `decode`.
+
+        >>> SMSStatusReport.decode_record('07916407058099F9062A0B916407950303F18921222140140089212221501400'
+        ...                               '46').status
+        StatusRecord(value=70, category='permanent-error', reason='validity-expired')
+        """
+        with PDUReader.wrap(pdu_data) as reader:
+            return cls.read_record(reader)
+
+    @classmethod
+    def decode_many(cls, pdus: Iterable[PDUData], **options) -> BatchResults:
+        """
+        Decodes many SMS-STATUS-REPORT TP-DUs, by default spread over a pool of processes.
+
+        See `smspdudecoder.batch.decode_many` for the available options.
+        """
+        return decode_many(cls.decode, pdus, **options)
+
+    @classmethod
+    def read(cls, reader: PDUReader, dates: str = 'datetime') -> Dict[str, Any]:
+        decode_date = _date_decoder(dates)
+        result: Dict[str, Any] = dict()
+        result['smsc'] = SMSC.read(reader)
+        result['header'] = StatusReportHeader.read(reader)
+        result['message-ref'] = reader.read_octet()
+        result['recipient'] = Address.read(reader)
+        result['scts'] = decode_date(reader.read(7))
+        result['dt'] = decode_date(reader.read(7))
+        result['status'] = Status.read(reader)
+        pi = cls._read_parameter_indicator(reader)
+        if pi & 0x01:
+            result['pid'] = reader.read_octet()
+        if pi & 0x02:
+            result['dcs'] = DCS.read(reader)
+        if pi & 0x04:
+            # the default alphabet is used when there is no data coding scheme
+            ctx = {'header': result['header'], 'dcs': result.get('dcs', {'encoding': 'gsm'})}
+            result['user_data'] = UserData.read(reader, ctx)
+        return result
+
+    @classmethod
+    def read_record(cls, reader: PDUReader) -> StatusReportRecord:
+        smsc = SMSC.read_record(reader)
+        header = StatusReportHeader.read_record(reader)
+        message_ref = reader.read_octet()
+        recipient = Address.read_record(reader)
+        scts = Date.decode(reader.read(7))
+        dt = Date.decode(reader.read(7))
+        status = Status.read_record(reader)
+        pi = cls._read_parameter_indicator(reader)
+        pid = reader.read_octet() if pi & 0x01 else None
+        dcs = DCS.read_record(reader) if pi & 0x02 else None
+        user_data = None
+        if pi & 0x04:
+            user_data = UserData.read_record(reader, header.udhi, 'gsm' if dcs is None else dcs.encoding)
+        return StatusReportRecord(smsc, header, message_ref, recipient, scts, dt, status, pid, dcs, user_data)
+
+    @staticmethod
+    def _read_parameter_indicator(reader: PDUReader) -> int:
+        # the parameter indicator is optional, and followed by extension octets while its highest bit is set
+        if reader.at_end():
+            return 0
+        pi = octet = reader.read_octet()
+        while octet & 0x80 and not reader.at_end():
+            octet = reader.read_octet()
+        return pi
+
+
+# decoders of TP-DUs, by direction and Message Type Indicator
+_TPDU_DECODERS: Dict[Optional[str], Dict[int, Any]] = {
+    None: {0b00: SMSDeliver, 0b01: SMSSubmit, 0b10: SMSStatusReport},
+    'incoming': {0b00: SMSDeliver, 0b10: SMSStatusReport},
+    'outgoing': {0b01: SMSSubmit},
+}
+
+
+def decoder_for_tpdu(pdu_data: PDUData, direction: Optional[str] = None) -> Any:
+    """
+    Returns the class decoding the TP-DU (`SMSDeliver`, `SMSSubmit` or `SMSStatusReport`), according to its Message
+    Type Indicator, read right after the SMS-C information without decoding anything.
+
+    The direction is 'incoming' for TP-DUs received by a mobile station (SMS-DELIVER and SMS-STATUS-REPORT),
+    'outgoing' for TP-DUs sent by it (SMS-SUBMIT), or None for both, as stored by modems. Raises ValueError for other
+    TP-DUs, such as SMS-SUBMIT-REPORT.
+
+    >>> decoder_for_tpdu('0011000B916407281553F80000AA0AE8329BFD4697D9EC37').__name__
+    'SMSSubmit'
+    """
+    with PDUReader.wrap(pdu_data) as reader:
+        return _tpdu_decoder(reader, direction)
+
+
+def _tpdu_decoder(reader: PDUReader, direction: Optional[str]) -> Any:
+    # reads the Message Type Indicator, and leaves the reader where it was
+    if direction not in _TPDU_DECODERS:
+        raise ValueError(f"Unknown direction \"{direction}\"")
+    position = reader.position
+    try:
+        # the first octet follows the SMS-C information
+        reader.seek(position + 1 + reader.read_octet())
+        mti = reader.read_octet() & 0b11
+    finally:
+        reader.seek(position)
+    decoder = _TPDU_DECODERS[direction].get(mti)
+    if decoder is None:
+        raise ValueError(f"Unsupported Message Type Indicator {mti}")
+    return decoder
+
+
+def decode_any(pdu_data: PDUData, direction: Optional[str] = None, dates: str = 'datetime') -> Dict[str, Any]:
+    """
+    Decodes an SMS-DELIVER, SMS-SUBMIT or SMS-STATUS-REPORT TP-DU, according to its Message Type Indicator (see
+    `decoder_for_tpdu`). The type of TP-DU is the 'mti' of its header.
+
+    >>> decode_any('07916407058099F9040B916407950303F100008921222140140004D4E2940A')['header']['mti']
+    'deliver'
+    >>> decode_any('07916407058099F9062A0B916407950303F1892122214014008921222150140000')['header']['mti']
+    'status-report'
+    """
+    with PDUReader.wrap(pdu_data) as reader:
+        return _tpdu_decoder(reader, direction).read(reader, dates)
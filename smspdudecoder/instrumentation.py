@@ -0,0 +1,266 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Opt-in instrumentation of decoders: timings of fields, and counters of encodings, Information Element Identifiers,
+Types Of Number and errors.
+
+Decoding methods are replaced by timed ones while hooks are registered, and restored when the last hook is removed,
+so that decoding costs nothing more when instrumentation is not used.
+
+Timings are by method (for instance 'Address.read'), in nanoseconds, and include the methods called by the method:
+'SMSDeliver.read' includes 'Address.read', and 'Date.decode' includes 'Date.decode_components'. Counters are:
+
+- 'encoding': encodings of decoded Data Coding Schemes;
+- 'iei': identifiers of decoded Information Elements;
+- 'ton': Types Of Number of decoded addresses (senders and recipients);
+- 'error': names of the exceptions raised when decoding SMS-DELIVER, SMS-SUBMIT and SMS-STATUS-REPORT TP-DUs.
+"""
+
+import threading
+
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import fields
+from .elements import Date
+from .fields import Address, DCS, InformationElement, SMSC, SMSDeliver, SMSStatusReport, SMSSubmit, UserData
+from .fields import UserDataHeader
+
+__all__ = [
+    'Histogram',
+    'Hook',
+    'Profile',
+    'add_hook',
+    'instrumented',
+    'remove_hook',
+]
+
+
+class Hook:
+    """
+    Receiver of the timings and counters of decoders. Methods are called in the decoding thread, and do nothing by
+    default.
+    """
+    def timing(self, name: str, nanoseconds: int) -> None:
+        """
+        Called when the method name returns or raises, with its duration.
+        """
+
+    def count(self, counter: str, value: Any) -> None:
+        """
+        Called when the value of the counter is decoded (or raised, for errors).
+        """
+
+
+# registered hooks, replaced rather than changed so that they can be iterated over without lock
+_hooks: Tuple[Hook, ...] = ()
+# original methods, by owner and name, while instrumented
+_originals: Dict[Tuple[type, str], Any] = {}
+_lock = threading.Lock()
+
+
+# instrumented methods, by owner, with the counter of their result, if any
+_METHODS: List[Tuple[type, str, Optional[Tuple[str, Callable[[Any], Any]]]]] = [
+    (SMSDeliver, 'read', None),
+    (SMSDeliver, 'read_record', None),
+    (SMSSubmit, 'read', None),
+    (SMSSubmit, 'read_record', None),
+    (SMSStatusReport, 'read', None),
+    (SMSStatusReport, 'read_record', None),
+    (SMSC, 'read', None),
+    (SMSC, 'read_record', None),
+    (Address, 'read', ('ton', lambda address: address['toa']['ton'])),
+    (Address, 'read_record', ('ton', lambda address: address.toa.ton)),
+    (DCS, 'read', ('encoding', lambda dcs: dcs['encoding'])),
+    (DCS, 'read_record', ('encoding', lambda dcs: dcs.encoding)),
+    (UserData, 'read', None),
+    (UserData, 'read_record', None),
+    (UserDataHeader, 'read', None),
+    (UserDataHeader, 'read_record', None),
+    (InformationElement, 'read', ('iei', lambda element: element['iei'])),
+    (InformationElement, 'read_record', ('iei', lambda element: element.iei)),
+    (Date, 'decode', None),
+    (Date, 'decode_timestamp', None),
+    (Date, 'decode_components', None),
+]
+
+# methods whose errors are counted: the decoding of whole TP-DUs, so that an error is counted once
+_ERRORS_COUNTED = (SMSDeliver, SMSSubmit, SMSStatusReport)
+
+
+def _instrument(owner: type, name: str, counted: Optional[Tuple[str, Callable[[Any], Any]]]) -> Any:
+    function = owner.__dict__[name].__func__
+    timing_name = f'{owner.__name__}.{name}'
+    count_errors = owner in _ERRORS_COUNTED
+    counter, key = counted if counted is not None else (None, None)
+
+    @wraps(function)
+    def instrumented_method(cls: type, *args: Any, **kwargs: Any) -> Any:
+        start = perf_counter_ns()
+        try:
+            result = function(cls, *args, **kwargs)
+        except Exception as error:
+            if count_errors:
+                for hook in _hooks:
+                    hook.count('error', type(error).__name__)
+            raise
+        finally:
+            nanoseconds = perf_counter_ns() - start
+            for hook in _hooks:
+                hook.timing(timing_name, nanoseconds)
+        if key is not None:
+            value = key(result)
+            for hook in _hooks:
+                hook.count(counter, value)
+        return result
+
+    return classmethod(instrumented_method)
+
+
+def _set_date_decoders() -> None:
+    # dates of SMSDeliver.read and SMSSubmit.read are decoded through a table of methods
+    for dates, decoder in fields._DATE_DECODERS.items():
+        fields._DATE_DECODERS[dates] = getattr(Date, decoder.__name__)
+
+
+def add_hook(hook: Hook) -> None:
+    """
+    Registers a hook, instrumenting the decoders if it is the first one.
+    """
+    global _hooks
+    with _lock:
+        if not _hooks:
+            for owner, name, counted in _METHODS:
+                _originals[owner, name] = owner.__dict__[name]
+                setattr(owner, name, _instrument(owner, name, counted))
+            _set_date_decoders()
+        _hooks += (hook,)
+
+
+def remove_hook(hook: Hook) -> None:
+    """
+    Unregisters a hook, restoring the original decoders if it is the last one. Raises ValueError if the hook is not
+    registered.
+    """
+    global _hooks
+    with _lock:
+        if hook not in _hooks:
+            raise ValueError("Hook not registered")
+        hooks = list(_hooks)
+        hooks.remove(hook)
+        _hooks = tuple(hooks)
+        if not _hooks:
+            for (owner, name), method in _originals.items():
+                setattr(owner, name, method)
+            _originals.clear()
+            _set_date_decoders()
+
+
+@contextmanager
+def instrumented(hook: Hook) -> Iterator[Hook]:
+    """
+    Registers the hook within a with block.
+
+    >>> with instrumented(Profile()) as profile:
+    ...     sms = SMSDeliver.decode('07916407058099F9040B916407950303F100008921222140140004D4E2940A')
+    >>> profile.counters['encoding'], profile.histograms['SMSDeliver.read'].count
+    (Counter({'gsm': 1}), 1)
+    """
+    add_hook(hook)
+    try:
+        yield hook
+    finally:
+        remove_hook(hook)
+
+
+class Histogram:
+    """
+    Histogram of durations in nanoseconds, in buckets of powers of two: the bucket i counts the durations of i bits,
+    from 2 ** (i - 1) to 2 ** i - 1 nanoseconds.
+
+    >>> histogram = Histogram()
+    >>> for nanoseconds in (900, 1100, 1200, 5000):
+    ...     histogram.add(nanoseconds)
+    >>> histogram.count, histogram.mean, histogram.quantile(0.5), histogram.quantile(1)
+    (4, 2050.0, 2047, 5000)
+    """
+    def __init__(self) -> None:
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def add(self, nanoseconds: int) -> None:
+        self.buckets[min(nanoseconds.bit_length(), 63)] += 1
+        self.count += 1
+        self.total += nanoseconds
+        if self.min is None or nanoseconds < self.min:
+            self.min = nanoseconds
+        if self.max is None or nanoseconds > self.max:
+            self.max = nanoseconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, fraction: float) -> int:
+        """
+        Returns an upper bound of the given quantile (from 0 to 1): the largest duration of its bucket, or the
+        maximum duration if it is lower. Returns 0 if the histogram is empty.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for bits, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                break
+        return min((1 << bits) - 1, self.max or 0)
+
+
+class Profile(Hook):
+    """
+    Hook aggregating timings into a `Histogram` by method, and counters into a `Counter` by counter name.
+    It can be registered while decoding in several threads.
+    """
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def timing(self, name: str, nanoseconds: int) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(nanoseconds)
+
+    def count(self, counter: str, value: Any) -> None:
+        with self._lock:
+            values = self.counters.get(counter)
+            if values is None:
+                values = self.counters[counter] = Counter()
+            values[value] += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the count, and the mean, median, 99th percentile and maximum durations (in nanoseconds) of each
+        method, to send to a metrics system.
+        """
+        with self._lock:
+            return {
+                name: {
+                    'count': histogram.count,
+                    'mean': histogram.mean,
+                    'p50': histogram.quantile(0.5),
+                    'p99': histogram.quantile(0.99),
+                    'max': histogram.max or 0,
+                }
+                for name, histogram in self.histograms.items()
+            }
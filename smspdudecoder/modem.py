@@ -0,0 +1,323 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Parsing of the output of GSM modems in PDU mode (AT+CMGF=0), according to GSM 07.05.
+
+Supported responses are message listings (+CMGL), message reads (+CMGR), new message indications (+CMT) and status
+report indications (+CDS).
+Output is parsed line by line, so that long listings are never held in memory, or pushed in chunks of any size to a
+`ModemStreamParser`, straight from the read loop of serial ports or sockets.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .fields import decode_any
+from .validation import validate
+
+__all__ = [
+    'ModemError',
+    'ModemOutputParser',
+    'ModemStreamParser',
+    'read_modem_output',
+]
+
+
+class ModemError(Exception):
+    """
+    Raised when the modem reports an error (ERROR, +CMS ERROR or +CME ERROR).
+    """
+
+
+class ModemOutputParser:
+    """
+    Line-based parser of modem output.
+
+    Each line is given to `feed_line`, which returns an event tuple when the line completes something:
+
+    - ('pdu', index, status, pdu) when a PDU line follows a message header,
+    - ('ok',) when the final result code OK is read,
+    - ('error', line) when an error result code is read,
+    - ('invalid', None, None, line, error) when a message header can not be parsed, such as a header of text mode
+      (AT+CMGF=1). The line following it is not taken for a PDU.
+
+    >>> parser = ModemOutputParser()
+    >>> parser.feed_line('+CMGL: 3,1,,24')
+    >>> parser.feed_line('07916407058099F9040B916407950303F100008921222140140004D4E2940A')
+    ('pdu', 3, 'rec-read', '07916407058099F9040B916407950303F100008921222140140004D4E2940A')
+    >>> parser.feed_line('OK')
+    ('ok',)
+    """
+    STATUS = {
+        0: 'rec-unread',
+        1: 'rec-read',
+        2: 'sto-unsent',
+        3: 'sto-sent',
+        4: 'all',
+    }
+    STATUS_INV = dict([(v[1], v[0]) for v in STATUS.items()])
+
+    ERRORS = ('ERROR', '+CMS ERROR:', '+CME ERROR:')
+
+    def __init__(self) -> None:
+        # (index, status) of the message whose PDU is expected on the next line
+        self.pending: Optional[Tuple[Optional[int], Optional[str]]] = None
+        # length of this PDU given by the modem, in octets without the SMS-C information, if any
+        self.pending_length: Optional[int] = None
+
+    def feed_line(self, line: str) -> Optional[Tuple[Any, ...]]:
+        line = line.strip()
+        if not line:
+            return None
+        if line == 'OK':
+            self.pending = None
+            return ('ok',)
+        if line.startswith(self.ERRORS):
+            self.pending = None
+            return ('error', line)
+        if line.startswith('+'):
+            self.pending = self.pending_length = None
+            try:
+                self.pending = self._parse_header(line)
+            except ValueError as error:
+                return ('invalid', None, None, line, error)
+            self.pending_length = self._parse_length(line) if self.pending is not None else None
+            return None
+        if self.pending is not None:
+            index, status = self.pending
+            self.pending = None
+            return ('pdu', index, status, line)
+        # command echoes and other responses
+        return None
+
+    def _parse_header(self, line: str) -> Optional[Tuple[Optional[int], Optional[str]]]:
+        command, _, arguments = line.partition(':')
+        fields = [field.strip() for field in arguments.split(',')]
+        if command == '+CMGL':
+            if len(fields) < 2 or not fields[0].isdecimal() or not fields[1].isdecimal():
+                raise ValueError(f"Invalid message header: {line}")
+            return int(fields[0]), self.STATUS.get(int(fields[1]))
+        if command == '+CMGR':
+            if not fields[0].isdecimal():
+                raise ValueError(f"Invalid message header: {line}")
+            return None, self.STATUS.get(int(fields[0]))
+        if command in ('+CMT', '+CDS'):
+            return None, None
+        return None
+
+    @staticmethod
+    def _parse_length(line: str) -> Optional[int]:
+        length = line.rpartition(',')[2].rpartition(':')[2].strip()
+        return int(length) if length.isdecimal() else None
+
+
+class ModemStreamParser:
+    """
+    Sans-IO parser of modem output, pushed in chunks of any size, such as the reads of a serial port or a socket.
+
+    Each chunk is given to `feed`, which returns the list of events completed by the chunk:
+
+    - ('message', index, status, message) when a PDU is read and decoded,
+    - ('invalid', index, status, pdu, error) when a PDU can not be decoded, or a line is longer than max_line_length,
+    - ('invalid', None, None, line, error) when a line can not be parsed, such as a message header of text mode,
+    - ('ok',) and ('error', line), as `ModemOutputParser.feed_line` returns them.
+
+    PDUs are decoded by decode, `fields.decode_any` by default. If decode is None, PDUs are not decoded, and
+    ('pdu', index, status, pdu) events are returned instead of 'message' ones.
+
+    A PDU is complete as soon as the length given by its header (and the length of its SMS-C information) is read,
+    and `validation.validate` finds a whole TP-DU, without waiting for the end of its line. Otherwise, such as when the
+    modem gives a wrong length, the PDU is read up to the end of its line. `needed` is the number of bytes to read
+    before the PDU is complete, or 1 when no PDU is expected: reading up to that many bytes completes the next event as
+    soon as possible.
+
+    Only the line being read is buffered, and every byte is looked at once: the cost of parsing does not depend on the
+    size of the chunks.
+
+    >>> parser = ModemStreamParser()
+    >>> parser.feed(b'+CMT: ,23\\r\\n07916407058099F9')
+    []
+    >>> parser.needed
+    46
+    >>> [event] = parser.feed(b'040B916407950303F100008921222140140004D4E2940A')
+    >>> event[0], event[3]['user_data']['data']
+    ('message', 'TEST')
+    >>> parser.feed(b'\\r\\nOK\\r\\n')
+    [('ok',)]
+    """
+    # characters skipped at the start of lines
+    _BLANK = b' \t\r\n'
+
+    def __init__(self, decode: Optional[Callable[[str], Any]] = decode_any, max_line_length: int = 4096) -> None:
+        self.decode = decode
+        self.max_line_length = max_line_length
+        self._lines = ModemOutputParser()
+        self._buffer = bytearray()
+        # offset in the buffer from which newlines are searched for: bytes before it were already looked at
+        self._scanned = 0
+        # whether the rest of the current line is dropped, after a PDU read in full or a line too long
+        self._skipping = False
+
+    @property
+    def needed(self) -> int:
+        """
+        Number of bytes to read before the expected PDU is complete, or 1 when no PDU is expected.
+        """
+        length = self._lines.pending_length
+        if self._skipping or self._lines.pending is None or length is None:
+            return 1
+        start = self._pdu_start()
+        total = self._pdu_size(start, length) or 2 * (1 + length)
+        return max(1, total - (len(self._buffer) - start))
+
+    def feed(self, data: bytes) -> List[Tuple[Any, ...]]:
+        """
+        Parses a chunk of modem output, and returns the events it completes.
+        """
+        events: List[Tuple[Any, ...]] = []
+        buffer = self._buffer
+        buffer += data
+        # start of the current line
+        start = 0
+        try:
+            while True:
+                if self._skipping:
+                    newline = buffer.find(b'\n', self._scanned)
+                    if newline < 0:
+                        start = self._scanned = len(buffer)
+                        break
+                    start = self._scanned = newline + 1
+                    self._skipping = False
+                newline = buffer.find(b'\n', self._scanned)
+                if newline >= 0:
+                    line = buffer[start:newline].decode('latin-1')
+                    start = self._scanned = newline + 1
+                    self._line(line, events)
+                    continue
+                self._scanned = len(buffer)
+                length = self._lines.pending_length
+                if self._lines.pending is not None and length is not None:
+                    # the PDU is complete as soon as all its octets are read
+                    start = self._pdu_start(start)
+                    size = self._pdu_size(start, length)
+                    if size is not None and start + size <= len(buffer) and not buffer[start + size:].strip():
+                        pdu = buffer[start:start + size].decode('latin-1')
+                        if validate(pdu, 'any'):
+                            start += size
+                            self._skipping = True
+                            self._line(pdu, events)
+                            continue
+                if len(buffer) - start > self.max_line_length:
+                    self._overflow(events)
+                    start = len(buffer)
+                    self._skipping = True
+                break
+        finally:
+            # lines are dropped once they are parsed, even if parsing them failed
+            del buffer[:start]
+            self._scanned -= start
+        return events
+
+    def feed_eof(self) -> List[Tuple[Any, ...]]:
+        """
+        Parses the last line of modem output, when it does not end with a newline, and returns the events it completes.
+        """
+        events: List[Tuple[Any, ...]] = []
+        try:
+            if not self._skipping and self._buffer:
+                self._line(self._buffer.decode('latin-1'), events)
+        finally:
+            self._buffer.clear()
+            self._scanned = 0
+            self._skipping = False
+        return events
+
+    def _pdu_start(self, start: int = 0) -> int:
+        buffer = self._buffer
+        while start < len(buffer) and buffer[start] in self._BLANK:
+            start += 1
+        return start
+
+    def _pdu_size(self, start: int, length: int) -> Optional[int]:
+        # number of hex digits of the PDU, once the length of its SMS-C information is read
+        smsc_length = self._buffer[start:start + 2]
+        if len(smsc_length) < 2:
+            return None
+        try:
+            return 2 * (1 + int(smsc_length, 16) + length)
+        except ValueError:
+            # not a PDU: the line is read up to its end
+            return None
+
+    def _line(self, line: str, events: List[Tuple[Any, ...]]) -> None:
+        try:
+            event = self._lines.feed_line(line)
+        except Exception as error:
+            self._lines.pending = self._lines.pending_length = None
+            events.append(('invalid', None, None, line.strip(), error))
+            return
+        if event is None:
+            return
+        if event[0] != 'pdu' or self.decode is None:
+            events.append(event)
+            return
+        _, index, status, pdu = event
+        try:
+            events.append(('message', index, status, self.decode(pdu)))
+        except Exception as error:
+            events.append(('invalid', index, status, pdu, error))
+
+    def _overflow(self, events: List[Tuple[Any, ...]]) -> None:
+        pending = self._lines.pending or (None, None)
+        self._lines.pending = self._lines.pending_length = None
+        events.append(('invalid',) + pending + (None, ValueError("Line too long")))
+
+
+def _lines(data: Union[str, bytes, Iterable[Union[str, bytes]]]) -> Iterator[str]:
+    if isinstance(data, (str, bytes)):
+        data = data.splitlines()
+    for line in data:
+        yield line.decode('latin-1') if isinstance(line, bytes) else line
+
+
+def read_modem_output(data: Union[str, bytes, Iterable[Union[str, bytes]]],
+                      strict: bool = True) -> Iterator[Tuple[Optional[int], Optional[str], Dict[str, Any]]]:
+    """
+    Reads modem output, from a file (text or binary), a pipe, an iterable of lines, or a whole string.
+
+    Yields (index, status, message) tuples, where message is decoded with `fields.decode_any`: SMS-DELIVER,
+    SMS-SUBMIT and SMS-STATUS-REPORT TP-DUs are told apart by their Message Type Indicator. Index (and status, for
+    +CMT and +CDS) are None when the modem does not give them.
+
+    Raises ModemError when the modem reports an error. If strict is False, PDUs that can not be decoded, and message
+    headers that can not be parsed, are skipped instead of raising an exception.
+
+    >>> output = '''AT+CMGL=4
+    ... +CMGL: 1,0,,24
+    ... 07916407058099F9040B916407950303F100008921222140140004D4E2940A
+    ... +CMGL: 2,3,,23
+    ... 0011000B916407281553F80000AA0AE8329BFD4697D9EC37
+    ...
+    ... OK'''
+    >>> [(index, status, sms['user_data']['data']) for index, status, sms in read_modem_output(output)]
+    [(1, 'rec-unread', 'TEST'), (2, 'sto-sent', 'hellohello')]
+    """
+    parser = ModemOutputParser()
+    for line in _lines(data):
+        event = parser.feed_line(line)
+        if event is None or event[0] == 'ok':
+            continue
+        if event[0] == 'error':
+            raise ModemError(event[1])
+        if event[0] == 'invalid':
+            if strict:
+                raise event[4]
+            continue
+        _, index, status, pdu = event
+        try:
+            message = decode_any(pdu)
+        except Exception:
+            if strict:
+                raise
+            continue
+        yield index, status, message
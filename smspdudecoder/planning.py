@@ -0,0 +1,253 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Planning of the parts (segments) of outgoing messages, without encoding them.
+
+Texts are classified with translation tables: GSM 7-bit septets (two for characters of the extended alphabet) with
+the default alphabet or national language shift tables, and UTF-16 code units (two for surrogate pairs) with UCS2.
+The encoding giving the fewest parts is chosen, with the boundaries of the parts, which never split an escape sequence
+or a surrogate pair. `fields.SMSDeliver.encode_parts` and `fields.SMSSubmit.encode_parts` split messages the same way.
+"""
+
+from typing import Any, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .codecs import GSM
+
+__all__ = [
+    'SegmentPlan',
+    'TRANSLITERATION',
+    'capacity',
+    'concatenated_header_length',
+    'plan_segments',
+    'split_units',
+]
+
+# maximum length of the user data, in octets
+USER_DATA_LENGTH = 140
+
+# translation table of characters which are close to characters of the GSM 7-bit default alphabet
+TRANSLITERATION = str.maketrans({
+    '\u00a0': ' ', '\u2009': ' ', '\u202f': ' ', '\u200b': '',
+    '‘': "'", '’': "'", '‚': "'", '‛': "'", '′': "'", '`': "'", '´': "'",
+    '“': '"', '”': '"', '„': '"', '″': '"', '«': '"', '»': '"',
+    '‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '-', '―': '-', '−': '-',
+    '…': '...', '•': '-',
+    'á': 'a', 'â': 'a', 'ã': 'a', 'ç': 'Ç', 'ê': 'e', 'ë': 'e', 'í': 'i', 'î': 'i', 'ï': 'i',
+    'ó': 'o', 'ô': 'o', 'õ': 'o', 'ú': 'u', 'û': 'u', 'ÿ': 'y', 'œ': 'oe',
+    'Á': 'A', 'Â': 'A', 'Ã': 'A', 'È': 'E', 'Ê': 'E', 'Ë': 'E', 'Ì': 'I', 'Í': 'I', 'Î': 'I',
+    'Ï': 'I', 'Ò': 'O', 'Ó': 'O', 'Ô': 'O', 'Õ': 'O', 'Ù': 'U', 'Ú': 'U', 'Û': 'U', 'Œ': 'OE',
+})
+
+
+class SegmentPlan(NamedTuple):
+    """
+    Encoding of a text, and its parts.
+
+    - encoding: 'gsm' or 'ucs2'.
+    - languages: (locking shift, single shift) national language identifiers of GSM 7-bit texts, (0, 0) for the
+      default alphabet.
+    - text: the planned text, transliterated if it gives fewer parts.
+    - units: length of the text in septets (GSM 7-bit) or UTF-16 code units (UCS2).
+    - segments: (start, end) offsets of the characters of each part in the text.
+    """
+    encoding: str
+    languages: Tuple[int, int]
+    text: str
+    units: int
+    segments: Tuple[Tuple[int, int], ...]
+
+    @property
+    def parts_count(self) -> int:
+        return len(self.segments)
+
+    @property
+    def elements(self) -> List[Tuple[int, bytes]]:
+        """
+        Information Elements of the national language shift tables, as the elements of `SMSSubmit.encode`.
+        """
+        locking_shift, single_shift = self.languages
+        return [(iei, bytes((value,))) for iei, value in ((0x25, locking_shift), (0x24, single_shift)) if value]
+
+
+def capacity(encoding: str, header_length: int) -> int:
+    """
+    Returns the number of units (septets for GSM 7-bit, octets otherwise) fitting in the user data after a User Data
+    Header of header_length octets.
+
+    >>> capacity('gsm', 0), capacity('gsm', 6), capacity('ucs2', 6)
+    (160, 153, 134)
+    """
+    if encoding == 'gsm':
+        return USER_DATA_LENGTH * 8 // 7 - (header_length * 8 + 6) // 7
+    if encoding == 'ucs2':
+        return (USER_DATA_LENGTH - header_length) // 2 * 2
+    return USER_DATA_LENGTH - header_length
+
+
+def concatenated_header_length(header_length: int, reference_bits: int = 8) -> int:
+    """
+    Returns the length of the User Data Header of the parts of a concatenated message, given the length of the header
+    without concatenation: the concatenation element takes 5 or 6 octets, and adds a length octet if needed.
+
+    >>> concatenated_header_length(0), concatenated_header_length(4, 16)
+    (6, 10)
+    """
+    if reference_bits not in (8, 16):
+        raise ValueError("Invalid length of the reference")
+    return (header_length or 1) + 3 + reference_bits // 8 + 1
+
+
+def split_units(units: bytes, encoding: str, capacity: int) -> List[Tuple[int, int]]:
+    """
+    Returns the (start, end) offsets of the parts of encoded units, as returned by `GSM.encode_septets` for GSM 7-bit
+    or by `str.encode('utf-16be')` for UCS2, so that escape sequences and surrogate pairs are not split.
+
+    >>> split_units(b'ab\\x1bec', 'gsm', 3)
+    [(0, 2), (2, 5)]
+    """
+    spans = []
+    start = 0
+    length = len(units)
+    while start < length:
+        end = start + capacity
+        if end < length:
+            if encoding == 'gsm' and units[end - 1] == 0x1B and end - 1 > start:
+                end -= 1
+            elif encoding == 'ucs2' and 0xD8 <= units[end - 2] <= 0xDB and end - 2 > start:
+                end -= 2
+        else:
+            end = length
+        spans.append((start, end))
+        start = end
+    return spans
+
+
+def _header_length(elements: Sequence[Tuple[int, bytes]]) -> int:
+    return sum(2 + len(value) for _, value in elements) + 1 if elements else 0
+
+
+def _gsm_languages(elements: Sequence[Tuple[int, bytes]],
+                   language: Union[None, int, str]) -> Tuple[bool, List[Tuple[int, int]]]:
+    # whether the elements give the shift tables, and the (locking shift, single shift) tables to try
+    given = [0, 0]
+    for iei, value in elements:
+        if iei in (0x24, 0x25) and len(value) == 1:
+            given[0x25 - iei] = value[0]
+    if given != [0, 0] or language is None:
+        return given != [0, 0], [(given[0], given[1])]
+    identifier = GSM.LANGUAGES[language] if isinstance(language, str) else language
+    if identifier not in GSM.LOCKING_SHIFTS and identifier not in GSM.SINGLE_SHIFTS:
+        raise ValueError(f"No national language shift tables for language {language!r}")
+    candidates = [(0, 0)]
+    for locking_shift, single_shift in ((0, identifier), (identifier, 0), (identifier, identifier)):
+        if (locking_shift and locking_shift not in GSM.LOCKING_SHIFTS
+                or single_shift and single_shift not in GSM.SINGLE_SHIFTS):
+            continue
+        candidates.append((locking_shift, single_shift))
+    return False, candidates
+
+
+def _chars(text: str, units: bytes, encoding: str,
+           spans: List[Tuple[int, int]]) -> Tuple[Tuple[int, int], ...]:
+    # offsets of characters from offsets of units
+    if encoding == 'gsm':
+        offsets = [0]
+        chars = 0
+        for start, end in spans:
+            chars += end - start - units.count(b'\x1b', start, end)
+            offsets.append(chars)
+    elif len(units) == 2 * len(text):
+        offsets = [0] + [end // 2 for _, end in spans]
+    else:
+        offsets = [0] + [len(units[:end].decode('utf-16be')) for _, end in spans]
+    return tuple(zip(offsets, offsets[1:]))
+
+
+def _plans(text: str, encoding: Optional[str], elements: Sequence[Tuple[int, bytes]],
+           language: Union[None, int, str], reference_bits: int,
+           default_septets: Optional[str] = None) -> List[Tuple[Any, ...]]:
+    # (parts count, whether UCS2, length in bits, plan arguments) of the possible encodings
+    plans: List[Tuple[Any, ...]] = []
+    header_length = _header_length(elements)
+    if encoding in (None, 'gsm'):
+        given, candidates = _gsm_languages(elements, language)
+        for languages in candidates:
+            if languages == (0, 0) and default_septets is not None:
+                septets = default_septets
+            else:
+                septets = text.translate(GSM.for_language(*languages).ENCODING_TABLE)
+            if not septets.isascii():
+                continue
+            if languages == (0, 0) and encoding is None:
+                # the default alphabet takes at most two septets per character: UCS2 can not take fewer parts
+                encoding = 'gsm'
+            added = 0 if given else 3 * len([value for value in languages if value])
+            length = header_length + added + (1 if added and not header_length else 0)
+            plans.append(_plan(text, septets.encode('ascii'), 'gsm', languages, length, reference_bits))
+        if encoding == 'gsm' and not plans:
+            # raises the error of the first character that can not be encoded
+            GSM.for_language(*candidates[0]).encode_septets(text)
+    if encoding in (None, 'ucs2'):
+        plans.append(_plan(text, text.encode('utf-16be'), 'ucs2', (0, 0), header_length, reference_bits))
+    return plans
+
+
+def _plan(text: str, units: bytes, encoding: str, languages: Tuple[int, int], header_length: int,
+          reference_bits: int) -> Tuple[Any, ...]:
+    if len(units) <= capacity(encoding, header_length):
+        spans = [(0, len(units))]
+    else:
+        header_length = concatenated_header_length(header_length, reference_bits)
+        spans = split_units(units, encoding, capacity(encoding, header_length))
+    unit_bits = 7 if encoding == 'gsm' else 8
+    return len(spans), encoding == 'ucs2', len(units) * unit_bits + header_length * 8, text, units, encoding, \
+        languages, spans
+
+
+def plan_segments(text: str, encoding: Optional[str] = None, language: Union[None, int, str] = None,
+                  elements: Sequence[Tuple[int, bytes]] = (), reference_bits: int = 8,
+                  transliteration: Optional[Mapping[int, Any]] = None) -> SegmentPlan:
+    """
+    Plans the encoding and the parts of a text, as `SMSSubmit.encode_parts` (and `SMSDeliver.encode_parts`) would
+    encode it with the same arguments, without encoding it.
+
+    - encoding: 'gsm' or 'ucs2' to force an encoding, or None (the default) to choose the one giving the fewest parts,
+      GSM 7-bit if it gives as many parts as UCS2.
+    - language: name (see `GSM.LANGUAGES`) or identifier of a national language, whose shift tables are tried along
+      with the default alphabet.
+    - elements: (iei, data) of the Information Elements added to every part.
+    - reference_bits: length of the reference of concatenated messages, 8 or 16.
+    - transliteration: translation table (see `str.translate`), such as `TRANSLITERATION`, replacing characters
+      with close characters. The transliterated text is planned too, and kept if it gives fewer parts, or GSM 7-bit
+      parts instead of UCS2 ones.
+
+    >>> plan = plan_segments('Hello! ' * 30)
+    >>> plan.encoding, plan.parts_count, plan.segments
+    ('gsm', 2, ((0, 153), (153, 210)))
+    >>> plan = plan_segments('Günaydın', language='turkish')
+    >>> plan.encoding, plan.languages, plan.elements
+    ('gsm', (1, 0), [(37, b'\\x01')])
+    >>> plan = plan_segments('It’s “great”…', transliteration=TRANSLITERATION)
+    >>> plan.encoding, plan.text
+    ('gsm', 'It\\'s "great"...')
+    """
+    if encoding not in (None, 'gsm', 'ucs2'):
+        raise ValueError(f"Can not plan segments of encoding \"{encoding}\"")
+    septets = None
+    if encoding is None and language is None and not elements:
+        # fast path of texts of the default alphabet fitting in a single part
+        septets = text.translate(GSM.ENCODING_TABLE)
+        if septets.isascii() and len(septets) <= USER_DATA_LENGTH * 8 // 7:
+            return SegmentPlan('gsm', (0, 0), text, len(septets), ((0, len(text)),))
+    plans = _plans(text, encoding, elements, language, reference_bits, septets)
+    originals = len(plans)
+    if transliteration is not None:
+        transliterated = text.translate(transliteration)
+        if transliterated != text:
+            plans.extend(_plans(transliterated, encoding, elements, language, reference_bits))
+    # fewest parts, then GSM 7-bit, then the original text, then shortest user data
+    best = plans[min(range(len(plans)), key=lambda index: (plans[index][:2], index >= originals, plans[index][2]))]
+    text, units, encoding, languages, spans = best[3:]
+    return SegmentPlan(encoding, languages, text, len(units) // (2 if encoding == 'ucs2' else 1),
+                       _chars(text, units, encoding, spans))
@@ -0,0 +1,156 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Cursor-based reader over the octets of a PDU.
+
+PDUs may be given as hex strings, file-like objects containing hex strings, or raw octets
+(bytes, bytearray or memoryview). They are converted to octets once, and then read without copies
+when possible. File-like objects are read as their octets are needed.
+"""
+
+from typing import Optional, TextIO, Union
+
+__all__ = [
+    'PDUData',
+    'PDUReader',
+]
+
+
+class PDUReader:
+    """
+    Reads octets from a PDU, keeping track of the current position.
+
+    >>> reader = PDUReader.wrap('07912299976758F2')
+    >>> reader.read_octet()
+    7
+    >>> reader.read(2).hex()
+    '9122'
+    >>> reader.position
+    3
+    """
+    __slots__ = ('data', 'position', '_stream', '_buffer')
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview], position: int = 0) -> None:
+        self.data = data
+        self.position = position
+        # file-like object the octets are read from, and the octets read so far (data), if any
+        self._stream: Optional[TextIO] = None
+        self._buffer: Optional[bytearray] = None
+
+    @classmethod
+    def wrap(cls, pdu_data: 'PDUData') -> 'PDUReader':
+        """
+        Returns a reader for the given PDU data.
+
+        Strings are considered to be hex-encoded, while bytes-like objects contain raw octets. Readers are returned
+        as is, and file-like objects are read as octets are needed (see `release`).
+
+        >>> PDUReader.wrap(b'\\x07\\x91').read_octet()
+        7
+        """
+        if isinstance(pdu_data, PDUReader):
+            return pdu_data
+        if isinstance(pdu_data, str):
+            return cls(bytes.fromhex(pdu_data))
+        if isinstance(pdu_data, (bytes, bytearray, memoryview)):
+            return cls(pdu_data)
+        buffer = bytearray()
+        reader = cls(buffer)
+        reader._stream = pdu_data
+        reader._buffer = buffer
+        return reader
+
+    def _load(self, end: int) -> None:
+        # reads the octets of the file-like object (if any) up to the given position
+        buffer, stream = self._buffer, self._stream
+        if buffer is not None and stream is not None and end > len(buffer):
+            buffer += bytes.fromhex(stream.read(2 * (end - len(buffer))))
+
+    def load(self) -> Union[bytes, bytearray, memoryview]:
+        """
+        Returns all the octets of the PDU, reading the rest of the file-like object this reader was created from, if
+        any.
+        """
+        buffer, stream = self._buffer, self._stream
+        if buffer is not None and stream is not None:
+            buffer += bytes.fromhex(stream.read())
+        return self.data
+
+    def release(self) -> None:
+        """
+        Moves the file-like object this reader was created from (if any) right after the octets actually read. The
+        object only needs to be seekable when octets were read past the current position.
+        """
+        buffer, stream = self._buffer, self._stream
+        if buffer is not None and stream is not None and self.position < len(buffer):
+            stream.seek(stream.tell() - 2 * (len(buffer) - self.position))
+            del buffer[self.position:]
+
+    def __enter__(self) -> 'PDUReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def read_octet(self) -> int:
+        """
+        Reads a single octet, and returns its value.
+        """
+        try:
+            octet = self.data[self.position]
+        except IndexError:
+            self._load(self.position + 1)
+            if self.position >= len(self.data):
+                raise ValueError("Unexpected end of PDU") from None
+            octet = self.data[self.position]
+        self.position += 1
+        return octet
+
+    def read(self, length: int) -> Union[bytes, bytearray, memoryview]:
+        """
+        Reads the given number of octets. Less octets are returned if the end of the PDU is reached.
+        """
+        start = self.position
+        self.position += length
+        if self._stream is not None:
+            self._load(self.position)
+        return self.data[start:self.position]
+
+    def seek(self, position: int) -> None:
+        """
+        Moves the cursor to the given absolute position.
+        """
+        self.position = position
+        if self._stream is not None:
+            self._load(position)
+
+    def tell(self) -> int:
+        """
+        Returns the current position.
+        """
+        return self.position
+
+    def remaining(self) -> int:
+        """
+        Returns the number of octets left to read. The rest of the file-like object this reader was created from is
+        read: use `at_end` to know whether there are octets left.
+        """
+        return max(len(self.load()) - self.position, 0)
+
+    def at_end(self) -> bool:
+        """
+        Returns whether all the octets of the PDU have been read. At most one octet of the file-like object this
+        reader was created from is read ahead.
+
+        >>> from io import StringIO
+        >>> reader = PDUReader.wrap(StringIO('0791'))
+        >>> reader.read_octet(), reader.at_end(), reader.read_octet(), reader.at_end()
+        (7, False, 145, True)
+        """
+        if self._stream is not None:
+            self._load(self.position + 1)
+        return self.position >= len(self.data)
+
+
+PDUData = Union[str, bytes, bytearray, memoryview, TextIO, PDUReader]
@@ -0,0 +1,142 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Reassembly of concatenated SMS, as returned by `easy.read_incoming_sms`.
+
+Incomplete messages are kept in memory with bounds: groups of parts which did not receive any new part for a while
+expire, and the least recently updated groups are evicted when there are too many groups or parts.
+"""
+
+import time
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+__all__ = [
+    'Reassembler',
+]
+
+
+class _Group:
+    __slots__ = ('parts', 'received', 'updated')
+
+    def __init__(self, parts_count: int, updated: float) -> None:
+        self.parts: List[Optional[Dict[str, Any]]] = [None] * parts_count
+        self.received = 0
+        self.updated = updated
+
+
+class Reassembler:
+    """
+    Puts concatenated SMS back together.
+
+    Parts are grouped by sender, reference and number of parts. Groups which did not receive any part for `ttl`
+    seconds are dropped, and the least recently updated groups are dropped when more than `max_groups` groups,
+    or more than `max_parts` parts, are waiting.
+
+    >>> reassembler = Reassembler()
+    >>> part = {'sender': '+33600000000', 'date': None, 'content': 'world', 'partial': None}
+    >>> reassembler.add(dict(part, partial={'reference': '1-2', 'parts_count': 2, 'part_number': 2}))
+    >>> reassembler.add(dict(part, content='Hello ', partial={'reference': '1-2', 'parts_count': 2, 'part_number': 1}))
+    {'sender': '+33600000000', 'date': None, 'content': 'Hello world', 'partial': False}
+
+    Messages which are not concatenated are returned as is:
+
+    >>> reassembler.add(dict(part, partial=False))
+    {'sender': '+33600000000', 'date': None, 'content': 'world', 'partial': False}
+    """
+    def __init__(self, ttl: float = 3600.0, max_groups: int = 10000, max_parts: int = 100000,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.max_groups = max_groups
+        self.max_parts = max_parts
+        self.clock = clock
+        # groups, from the least to the most recently updated
+        self.groups: 'OrderedDict[Tuple[str, str, int], _Group]' = OrderedDict()
+        self.parts_count = 0
+        # counters
+        self.completed = 0
+        self.duplicates = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of incomplete groups dropped, because they expired or because of the memory bounds.
+        """
+        return self.expired + self.evicted
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def add(self, sms: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Adds a message, as returned by `easy.read_incoming_sms`.
+
+        Returns the whole message as soon as its last part is added, or None if parts are still missing.
+        """
+        partial = sms['partial']
+        if not partial:
+            return sms
+        parts_count = partial['parts_count']
+        part_number = partial['part_number']
+        if not 1 <= part_number <= parts_count:
+            raise ValueError(f"Invalid part number {part_number} of {parts_count}")
+        now = self.clock()
+        self.expire(now)
+        key = (sms['sender'], partial['reference'], parts_count)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = _Group(parts_count, now)
+        else:
+            group.updated = now
+            self.groups.move_to_end(key)
+        if group.parts[part_number - 1] is not None:
+            self.duplicates += 1
+            return None
+        group.parts[part_number - 1] = sms
+        group.received += 1
+        if group.received == parts_count:
+            del self.groups[key]
+            self.parts_count -= parts_count - 1
+            self.completed += 1
+            return self._merge(group.parts)
+        self.parts_count += 1
+        self._evict()
+        return None
+
+    def expire(self, now: Optional[float] = None) -> None:
+        """
+        Drops the groups which did not receive any part for `ttl` seconds.
+        """
+        if now is None:
+            now = self.clock()
+        groups = self.groups
+        while groups:
+            group = next(iter(groups.values()))
+            if now - group.updated < self.ttl:
+                break
+            self._drop_oldest()
+            self.expired += 1
+
+    def _evict(self) -> None:
+        while len(self.groups) > self.max_groups or self.parts_count > self.max_parts:
+            self._drop_oldest()
+            self.evicted += 1
+
+    def _drop_oldest(self) -> None:
+        _, group = self.groups.popitem(last=False)
+        self.parts_count -= group.received
+
+    @staticmethod
+    def _merge(parts: List[Any]) -> Dict[str, Any]:
+        first = parts[0]
+        contents = [part['content'] for part in parts]
+        return {
+            'sender': first['sender'],
+            'date': first['date'],
+            'content': (b'' if isinstance(contents[0], bytes) else '').join(contents),
+            'partial': False,
+        }
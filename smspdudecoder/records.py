@@ -0,0 +1,215 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Compact, immutable representations of decoded TP-DUs, returned by the `decode_record` class methods of fields.
+
+Records are named tuples: they use less memory than dictionaries, and the records of immutable values (types of
+address, headers, data coding schemes) are shared singletons. The usual dictionary representation is available with
+the `to_dict` method.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+__all__ = [
+    'AddressRecord',
+    'ConcatenatedSMSRecord',
+    'DCSRecord',
+    'DeliverRecord',
+    'InformationElementRecord',
+    'OutgoingPDUHeaderRecord',
+    'PDUHeaderRecord',
+    'StatusRecord',
+    'StatusReportHeaderRecord',
+    'StatusReportRecord',
+    'SubmitRecord',
+    'TypeOfAddressRecord',
+    'UserDataHeaderRecord',
+    'UserDataRecord',
+]
+
+
+def _to_dict(value: Any) -> Any:
+    return value.to_dict() if hasattr(value, 'to_dict') else value
+
+
+class TypeOfAddressRecord(NamedTuple):
+    ton: str
+    npi: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'ton': self.ton, 'npi': self.npi}
+
+
+class AddressRecord(NamedTuple):
+    length: int
+    toa: Optional[TypeOfAddressRecord]
+    number: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'length': self.length, 'toa': _to_dict(self.toa), 'number': self.number}
+
+
+class PDUHeaderRecord(NamedTuple):
+    rp: bool
+    udhi: bool
+    sri: bool
+    lp: bool
+    mms: bool
+    mti: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self))
+
+
+class OutgoingPDUHeaderRecord(NamedTuple):
+    rp: bool
+    udhi: bool
+    srr: bool
+    vpf: int
+    rd: bool
+    mti: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self))
+
+
+class StatusReportHeaderRecord(NamedTuple):
+    udhi: bool
+    srq: bool
+    lp: bool
+    mms: bool
+    mti: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self))
+
+
+class StatusRecord(NamedTuple):
+    value: int
+    category: str
+    reason: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self))
+
+
+class DCSRecord(NamedTuple):
+    encoding: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'encoding': self.encoding}
+
+
+class ConcatenatedSMSRecord(NamedTuple):
+    reference: int
+    parts_count: int
+    part_number: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self))
+
+
+class InformationElementRecord(NamedTuple):
+    iei: int
+    length: int
+    data: Union[ConcatenatedSMSRecord, str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'iei': self.iei, 'length': self.length, 'data': _to_dict(self.data)}
+
+
+class UserDataHeaderRecord(NamedTuple):
+    length: int
+    elements: Tuple[InformationElementRecord, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'length': self.length, 'elements': [element.to_dict() for element in self.elements]}
+
+
+class UserDataRecord(NamedTuple):
+    header: Optional[UserDataHeaderRecord]
+    data: Union[str, bytes]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'header': _to_dict(self.header), 'data': self.data}
+
+
+class DeliverRecord(NamedTuple):
+    smsc: AddressRecord
+    header: PDUHeaderRecord
+    sender: AddressRecord
+    pid: int
+    dcs: DCSRecord
+    scts: datetime
+    user_data: UserDataRecord
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, map(_to_dict, self)))
+
+
+class SubmitRecord(NamedTuple):
+    """
+    The validity is a (unit, value) tuple, such as ('days', 4), when the validity period is relative.
+    """
+    smsc: AddressRecord
+    header: OutgoingPDUHeaderRecord
+    message_ref: int
+    recipient: AddressRecord
+    pid: int
+    dcs: DCSRecord
+    vp: Union[None, int, datetime]
+    validity: Optional[Tuple[str, int]]
+    user_data: UserDataRecord
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'smsc': self.smsc.to_dict(),
+            'header': self.header.to_dict(),
+            'message-ref': self.message_ref,
+            'recipient': self.recipient.to_dict(),
+            'pid': self.pid,
+            'dcs': self.dcs.to_dict(),
+        }
+        if self.header.vpf in (2, 3):
+            result['vp'] = self.vp
+        if self.validity is not None:
+            unit, value = self.validity
+            result[f'validity-{unit}'] = value
+        result['user_data'] = self.user_data.to_dict()
+        return result
+
+
+class StatusReportRecord(NamedTuple):
+    """
+    The protocol identifier, data coding scheme and user data are None when the status report does not have them.
+    """
+    smsc: AddressRecord
+    header: StatusReportHeaderRecord
+    message_ref: int
+    recipient: AddressRecord
+    scts: datetime
+    dt: datetime
+    status: StatusRecord
+    pid: Optional[int]
+    dcs: Optional[DCSRecord]
+    user_data: Optional[UserDataRecord]
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'smsc': self.smsc.to_dict(),
+            'header': self.header.to_dict(),
+            'message-ref': self.message_ref,
+            'recipient': self.recipient.to_dict(),
+            'scts': self.scts,
+            'dt': self.dt,
+            'status': self.status.to_dict(),
+        }
+        if self.pid is not None:
+            result['pid'] = self.pid
+        if self.dcs is not None:
+            result['dcs'] = self.dcs.to_dict()
+        if self.user_data is not None:
+            result['user_data'] = self.user_data.to_dict()
+        return result
@@ -0,0 +1,196 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Structural validation of TP-DUs, much cheaper than decoding them.
+
+Only the lengths and the octets that decoding depends on are checked: the lengths of the SMS-C information and of
+the addresses, the types of address, the message type, the size of the validity period, the parameter indicator of
+status reports, the User Data Length against the remaining octets, and the User Data Header against the User Data.
+Texts and dates are not decoded.
+"""
+
+import re
+
+from typing import NamedTuple, Optional, Union
+
+from .elements import TypeOfAddress
+from .fields import DCS
+
+__all__ = [
+    'Verdict',
+    'validate',
+]
+
+_NON_HEX = re.compile('[^0-9A-Fa-f]')
+
+# Message Type Indicators, by kind of TP-DU
+_MTIS = {'deliver': 0b00, 'submit': 0b01, 'status-report': 0b10}
+_KINDS_BY_MTI = {mti: kind for kind, mti in _MTIS.items()}
+
+# size of the validity period of SMS-SUBMIT, by validity period format
+_VP_SIZES = (0, 7, 1, 7)
+
+# lengths of the concatenation information elements, which are decoded
+_IE_LENGTHS = {0x00: 3, 0x08: 4}
+
+
+class Verdict(NamedTuple):
+    """
+    Result of a validation: the offset (in octets) and the reason of the first error found, if any.
+
+    A verdict is true when the TP-DU is valid.
+    """
+    valid: bool
+    offset: Optional[int] = None
+    reason: Optional[str] = None
+
+    def __bool__(self) -> bool:
+        return self.valid
+
+
+_VALID = Verdict(True)
+
+
+def validate(pdu_data: Union[str, bytes, bytearray, memoryview], kind: str = 'deliver') -> Verdict:
+    """
+    Checks the structure of a TP-DU, given as a hex string or as raw octets, and returns a `Verdict`.
+
+    The kind of TP-DU is 'deliver', 'submit', 'status-report', or 'any' to check any of them according to its Message
+    Type Indicator, as `fields.decode_any` does.
+
+    >>> validate('07916407058099F9040B916407950303F100008921222140140004D4E2940A')
+    Verdict(valid=True, offset=None, reason=None)
+    >>> validate('07916407058099F9040B916407950303F100008921222140140004D4E294')
+    Verdict(valid=False, offset=26, reason='User Data Length exceeds the remaining octets')
+    >>> bool(validate('0011000B916407281553F80000AA0AE8329BFD4697D9EC37', 'submit'))
+    True
+    >>> bool(validate('07916407058099F9062A0B916407950303F1892122214014008921222150140000', 'any'))
+    True
+    """
+    if kind != 'any' and kind not in _MTIS:
+        raise ValueError(f"Unknown kind of TP-DU {kind!r}")
+    if isinstance(pdu_data, str):
+        try:
+            data: Union[bytes, bytearray, memoryview] = bytes.fromhex(pdu_data)
+        except ValueError:
+            data = b''
+        # fromhex skips whitespace
+        if len(data) * 2 != len(pdu_data):
+            non_hex = _NON_HEX.search(pdu_data)
+            if non_hex is not None:
+                return Verdict(False, non_hex.start() // 2, "Invalid hex digit")
+            return Verdict(False, len(pdu_data) // 2, "Odd number of hex digits")
+    else:
+        data = pdu_data
+    size = len(data)
+
+    # SMS-C information, whose length includes its type of address
+    if not size:
+        return Verdict(False, 0, "Missing SMS-C information")
+    position = 1 + data[0]
+    if data[0]:
+        if data[0] > 11:
+            return Verdict(False, 0, "SMS-C information too long")
+        if position > size:
+            return Verdict(False, 0, "SMS-C information exceeds the PDU")
+        if not _valid_toa(data[1]):
+            return Verdict(False, 1, "Invalid SMS-C type of address")
+
+    # first octet
+    if position >= size:
+        return Verdict(False, position, "Missing first octet")
+    first_octet = data[position]
+    mti = first_octet & 0b11
+    if kind == 'any':
+        if mti not in _KINDS_BY_MTI:
+            return Verdict(False, position, "Unsupported Message Type Indicator")
+        kind = _KINDS_BY_MTI[mti]
+    elif mti != _MTIS[kind]:
+        return Verdict(False, position, "Unexpected Message Type Indicator")
+    udhi = first_octet & 0x40
+    # message reference of SMS-SUBMIT and SMS-STATUS-REPORT
+    position += 1 if kind == 'deliver' else 2
+
+    # originating, destination or recipient address, whose length is in semi-octets
+    if position + 2 > size:
+        return Verdict(False, min(position, size), "Missing address")
+    if data[position] > 20:
+        return Verdict(False, position, "Address too long")
+    if not _valid_toa(data[position + 1]):
+        return Verdict(False, position + 1, "Invalid type of address")
+    position += 2 + (data[position] + 1) // 2
+
+    if kind == 'status-report':
+        # service centre time stamp, discharge time and status, followed by an optional parameter indicator
+        if position + 15 > size:
+            return Verdict(False, min(position, size), "Missing time stamps or status")
+        position += 15
+        if position == size:
+            return _VALID
+        pi = data[position]
+        position += 1
+        # extension octets of the parameter indicator
+        while data[position - 1] & 0x80 and position < size:
+            position += 1
+        dcs = 0
+        if position + (pi & 0x01) + (pi & 0x02) // 2 > size:
+            return Verdict(False, size, "Missing protocol identifier or data coding scheme")
+        position += pi & 0x01
+        if pi & 0x02:
+            dcs = data[position]
+            position += 1
+        if not pi & 0x04:
+            return _VALID
+    else:
+        # protocol identifier, data coding scheme, and service centre time stamp or validity period
+        if position + 2 > size:
+            return Verdict(False, min(position, size), "Missing protocol identifier or data coding scheme")
+        dcs = data[position + 1]
+        position += 2
+        if kind == 'deliver':
+            position += 7
+        else:
+            position += _VP_SIZES[(first_octet >> 3) & 0b11]
+
+    # user data
+    if position >= size:
+        return Verdict(False, min(position, size), "Missing User Data Length")
+    length = data[position]
+    septets = DCS.ENCODINGS[dcs] == 'gsm'
+    if length > (160 if septets else 140):
+        return Verdict(False, position, "User Data Length too long")
+    octets = (length * 7 + 7) // 8 if septets else length
+    if position + 1 + octets > size:
+        return Verdict(False, position, "User Data Length exceeds the remaining octets")
+    if udhi:
+        return _validate_header(data, position + 1, octets)
+    return _VALID
+
+
+def _valid_toa(octet: int) -> bool:
+    try:
+        TypeOfAddress.decode_record(octet)
+    except (ValueError, AssertionError):
+        return False
+    return True
+
+
+def _validate_header(data: Union[bytes, bytearray, memoryview], position: int, octets: int) -> Verdict:
+    if not octets:
+        return Verdict(False, position, "Missing User Data Header")
+    end = position + 1 + data[position]
+    if end > position + octets:
+        return Verdict(False, position, "User Data Header Length exceeds the User Data")
+    position += 1
+    while position < end:
+        if position + 2 > end:
+            return Verdict(False, position, "Truncated information element")
+        iei = data[position]
+        length = data[position + 1]
+        if position + 2 + length > end:
+            return Verdict(False, position, "Information element exceeds the User Data Header")
+        if iei in _IE_LENGTHS and length != _IE_LENGTHS[iei]:
+            return Verdict(False, position, "Invalid length of concatenation information element")
+        position += 2 + length
+    return _VALID
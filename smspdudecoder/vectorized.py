@@ -0,0 +1,192 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Decoding of GSM 7-bit user data of many messages at once.
+
+When NumPy is installed, the septets of all messages are unpacked together with vectorized shifts and masks, and
+mapped to characters in bulk. Otherwise, messages are decoded one by one with `GSM`, with the same results.
+"""
+
+import sys
+
+from array import array
+from itertools import accumulate
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .codecs import GSM
+
+__all__ = [
+    'GSMColumns',
+    'decode_gsm_many',
+    'gsm_user_data',
+    'has_numpy',
+]
+
+# native byte order of the code points
+_UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+PackedData = Union[bytes, bytearray, memoryview]
+
+_numpy: Any = None
+
+
+def _import_numpy() -> Any:
+    # imported on first use, as NumPy is an optional dependency and is slow to import
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            _numpy = False
+        else:
+            _numpy = numpy
+    return _numpy
+
+
+def has_numpy() -> bool:
+    """
+    Tells whether NumPy is available, and used by default by `decode_gsm_many`.
+    """
+    return bool(_import_numpy())
+
+
+class GSMColumns(NamedTuple):
+    """
+    Decoded texts, as code points of all texts one after another: the i-th text is made of the code points between
+    offsets[i] and offsets[i + 1].
+
+    Both are NumPy arrays when NumPy is used, arrays of the `array` module otherwise.
+    """
+    offsets: Any
+    codepoints: Any
+
+    def texts(self) -> List[str]:
+        """
+        Returns the texts as a list of strings.
+        """
+        text = bytes(memoryview(self.codepoints)).decode(_UTF32)
+        offsets = self.offsets.tolist()
+        return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def gsm_user_data(view: Any) -> Tuple[PackedData, int, int]:
+    """
+    Returns the arguments of `decode_gsm_many` for a message, from its `DeliverView` (or `SubmitView`): the packed
+    user data, its length in septets, and the number of septets taken by the User Data Header.
+
+    >>> from smspdudecoder.views import DeliverView
+    >>> gsm_user_data(DeliverView('07916407058099F9040B916407950303F100008921222140140004D4E2940A'))
+    (b'\\xd4\\xe2\\x94\\n', 4, 0)
+    """
+    header_septets = 0
+    if view.user_data_header_span is not None:
+        start, end = view.user_data_header_span
+        header_septets = ((end - start) * 8 + 6) // 7
+    return view.user_data_octets, view.data[view.user_data_offset], header_septets
+
+
+def decode_gsm_many(buffers: Sequence[PackedData], septets_counts: Sequence[int],
+                    header_septets: Optional[Sequence[int]] = None, columnar: bool = False,
+                    backend: Optional[str] = None) -> Union[List[str], GSMColumns]:
+    """
+    Decodes the GSM 7-bit user data of many messages.
+
+    Each buffer holds the packed user data of a message (after its length octet), and septets_counts gives their
+    lengths in septets, as in the User Data Length. The first header_septets septets of each message, taken by its
+    User Data Header, are skipped. The texts are the same as the ones returned by `UserData.decode`, except for
+    messages using national language shift tables (see `UserDataHeader.national_languages`), which are decoded with
+    the default alphabet: decode them with `UserData` instead.
+
+    Returns a list of strings, or `GSMColumns` if columnar is True. The backend is 'numpy' or 'python', and defaults
+    to 'numpy' when NumPy is available.
+
+    >>> decode_gsm_many([bytes.fromhex('D4E2940A'), bytes.fromhex('32D0A60C8287E5A0F63B3D07')], [4, 13])
+    ['TEST', '2 € par mois']
+    >>> decode_gsm_many([bytes.fromhex('050003CC0201D06536FB0D')], [12], [7], columnar=True).texts()
+    ['hello']
+    """
+    if header_septets is None:
+        header_septets = [0] * len(buffers)
+    if not len(buffers) == len(septets_counts) == len(header_septets):
+        raise ValueError("Buffers, septets counts and header septets must have the same length")
+    if backend is None:
+        backend = 'numpy' if has_numpy() else 'python'
+    if backend == 'numpy':
+        numpy = _import_numpy()
+        if not numpy:
+            raise ImportError("NumPy is not installed")
+        return _decode_numpy(numpy, buffers, septets_counts, header_septets, columnar)
+    if backend == 'python':
+        return _decode_python(buffers, septets_counts, header_septets, columnar)
+    raise ValueError(f"Unknown backend {backend!r}")
+
+
+def _check_lengths(buffers: Sequence[PackedData], septets_counts: Sequence[int]) -> None:
+    for buffer, count in zip(buffers, septets_counts):
+        if len(buffer) * 8 < count * 7:
+            raise ValueError("Unexpected end of user data")
+
+
+def _decode_python(buffers: Sequence[PackedData], septets_counts: Sequence[int], header_septets: Sequence[int],
+                   columnar: bool) -> Union[List[str], GSMColumns]:
+    _check_lengths(buffers, septets_counts)
+    texts = [
+        GSM.decode_septets(GSM.unpack_septets(buffer)[skip:count])
+        for buffer, count, skip in zip(buffers, septets_counts, header_septets)
+    ]
+    if not columnar:
+        return texts
+    codepoints = array('I')
+    codepoints.frombytes(''.join(texts).encode(_UTF32))
+    offsets = array('q', accumulate([0] + [len(text) for text in texts]))
+    return GSMColumns(offsets, codepoints)
+
+
+# code points of the septets, in the default alphabet then in the extended alphabet
+_CODEPOINTS = [ord(char) for char in GSM.ALPHABET + GSM.ALPHABET_EXT_TABLE]
+
+
+def _decode_numpy(np: Any, buffers: Sequence[PackedData], septets_counts: Sequence[int],
+                  header_septets: Sequence[int], columnar: bool) -> Union[List[str], GSMColumns]:
+    count = len(buffers)
+    counts = np.asarray(septets_counts, dtype=np.int64)
+    skips = np.asarray(header_septets, dtype=np.int64)
+    lengths = np.fromiter(map(len, buffers), dtype=np.int64, count=count)
+    if (lengths * 8 < counts * 7).any():
+        raise ValueError("Unexpected end of user data")
+
+    # Every 7 octets hold 8 septets. Each message is spread over whole groups of 7 octets, and each group is stored
+    # in 8 octets, read as a little-endian 64-bit integer from which septets are extracted with shifts and masks.
+    groups = (lengths + 6) // 7
+    group_starts = np.cumsum(groups) - groups
+    padded = b''.join([bytes(buffer) + bytes(-len(buffer) % 7) for buffer in buffers])
+    octets = np.zeros((int(groups.sum()), 8), dtype=np.uint8)
+    octets[:, :7] = np.frombuffer(padded, dtype=np.uint8).reshape(-1, 7)
+    values = octets.view('<u8')
+    septets = ((values >> np.arange(0, 56, 7, dtype=np.uint64)) & 0x7F).astype(np.uint8).ravel()
+
+    # septets of the texts, without the headers
+    sizes = np.maximum(counts - skips, 0)
+    starts = np.cumsum(sizes) - sizes
+    indexes = np.arange(int(sizes.sum()), dtype=np.int64)
+    indexes += np.repeat(8 * group_starts + skips - starts, sizes)
+    septets = septets[indexes]
+
+    # An escape septet is dropped, and the septet following it (in the same message) is read from the extended
+    # alphabet, which takes the upper half of the code points table. After two escapes, the second one is the
+    # actual escape.
+    escapes = septets == GSM.CHAR_EXT
+    extended = np.zeros(len(septets), dtype=np.uint8)
+    extended[1:] = escapes[:-1]
+    extended[starts[sizes > 0]] = 0
+    codepoints = np.asarray(_CODEPOINTS, dtype=np.uint32)[(extended << 7) | septets]
+    escape_positions = np.flatnonzero(escapes)
+    if len(escape_positions):
+        codepoints = np.delete(codepoints, escape_positions)
+        messages = np.searchsorted(starts, escape_positions, side='right') - 1
+        sizes = sizes - np.bincount(messages, minlength=count)
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    columns = GSMColumns(offsets, codepoints)
+    return columns if columnar else columns.texts()
@@ -0,0 +1,256 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+"""
+Lazy views over TP-DUs.
+
+A view scans the PDU once to find where each field starts, and decodes fields only when they are accessed.
+Decoded fields are cached, and have the same representation as in `SMSDeliver.decode` and `SMSSubmit.decode`.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .elements import Date
+from .fields import Address, DCS, InformationElement, OutgoingPDUHeader, PDUHeader, SMSC, SMSSubmit
+from .fields import UserData, UserDataHeader
+from .reader import PDUData, PDUReader
+
+__all__ = [
+    'DeliverView',
+    'SubmitView',
+]
+
+
+class _cached:
+    """
+    Decodes an attribute on first access, and stores it in the instance, hiding the descriptor afterwards.
+    """
+    def __init__(self, func: Callable[[Any], Any]) -> None:
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance: Any, owner: Any) -> Any:
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+
+class _View(ABC):
+    """
+    Fields common to all TP-DUs.
+    """
+    # offsets of the fields, found by _scan
+    header_offset: int
+    pid_offset: int
+    user_data_offset: int
+    user_data_header_span: Optional[Tuple[int, int]]
+
+    def __init__(self, pdu_data: PDUData) -> None:
+        reader = PDUReader.wrap(pdu_data)
+        self.data = reader.load()
+        self.smsc_offset = reader.position
+        try:
+            self._scan()
+        except IndexError:
+            raise ValueError("Unexpected end of PDU") from None
+        if self.user_data_offset >= len(self.data):
+            raise ValueError("Unexpected end of PDU")
+
+    @abstractmethod
+    def _scan(self) -> None:
+        # finds the offsets of the fields of the TP-DU
+        pass
+
+    def _reader(self, offset: int) -> PDUReader:
+        return PDUReader(self.data, offset)
+
+    def _scan_user_data(self, offset: int) -> None:
+        self.user_data_offset = offset
+        # span of the User Data Header, including its length octet
+        if self.udhi:
+            self.user_data_header_span = (offset + 1, offset + 2 + self.data[offset + 1])
+        else:
+            self.user_data_header_span = None
+
+    @property
+    def udhi(self) -> bool:
+        """
+        User Data Header Indicator, read from the first octet.
+        """
+        return bool(self.data[self.header_offset] & 0x40)
+
+    @_cached
+    def smsc(self) -> Dict[str, Any]:
+        return SMSC.read(self._reader(self.smsc_offset))
+
+    @_cached
+    def pid(self) -> int:
+        return self.data[self.pid_offset]
+
+    @_cached
+    def dcs(self) -> Dict[str, str]:
+        return DCS.read(self._reader(self.pid_offset + 1))
+
+    @_cached
+    def user_data_header(self) -> Optional[Dict[str, Any]]:
+        """
+        Decoded User Data Header, or None if there is none.
+        """
+        if self.user_data_header_span is None:
+            return None
+        return UserDataHeader.read(self._reader(self.user_data_header_span[0]))
+
+    @_cached
+    def concatenation(self) -> Optional[Dict[str, Any]]:
+        """
+        Reference, number of parts and part number of a concatenated SMS, or None.
+        """
+        if self.user_data_header_span is None:
+            return None
+        reader = self._reader(self.user_data_header_span[0] + 1)
+        while reader.position < self.user_data_header_span[1]:
+            element = InformationElement.read(reader)
+            if element['iei'] in (0x00, 0x08):
+                return element['data']
+        return None
+
+    @property
+    def user_data_octets(self) -> Union[bytes, bytearray, memoryview]:
+        """
+        Raw User Data (including its header), without its length octet.
+        """
+        return self.data[self.user_data_offset + 1:]
+
+    @_cached
+    def user_data(self) -> Dict[str, Any]:
+        ctx = {
+            'header': {'udhi': self.udhi},
+            'dcs': self.dcs,
+        }
+        return UserData.read(self._reader(self.user_data_offset), ctx)
+
+    @property
+    def text(self) -> Union[str, bytes]:
+        """
+        Decoded content of the message (bytes for binary messages).
+        """
+        return self.user_data['data']
+
+
+class DeliverView(_View):
+    """
+    Lazy view over an SMS-DELIVER TP-DU.
+
+    >>> view = DeliverView('07916407058099F9040B916407950303F100008921222140140004D4E2940A')
+    >>> view.sender
+    {'length': 11, 'toa': {'ton': 'international', 'npi': 'isdn'}, 'number': '46705930301'}
+    >>> view.text
+    'TEST'
+    """
+    def _scan(self) -> None:
+        data = self.data
+        self.header_offset = self.smsc_offset + 1 + data[self.smsc_offset]
+        self.sender_offset = self.header_offset + 1
+        self.pid_offset = self.sender_offset + 2 + (data[self.sender_offset] + 1) // 2
+        self.scts_offset = self.pid_offset + 2
+        self._scan_user_data(self.scts_offset + 7)
+
+    @_cached
+    def header(self) -> Dict[str, Any]:
+        return PDUHeader.read(self._reader(self.header_offset))
+
+    @_cached
+    def sender(self) -> Dict[str, Any]:
+        return Address.read(self._reader(self.sender_offset))
+
+    @_cached
+    def scts(self) -> datetime:
+        return Date.decode(self.data[self.scts_offset:self.scts_offset + 7])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the same result as `SMSDeliver.decode`.
+        """
+        return {
+            'smsc': self.smsc,
+            'header': self.header,
+            'sender': self.sender,
+            'pid': self.pid,
+            'dcs': self.dcs,
+            'scts': self.scts,
+            'user_data': self.user_data,
+        }
+
+
+class SubmitView(_View):
+    """
+    Lazy view over an SMS-SUBMIT TP-DU.
+
+    >>> view = SubmitView('0011000B916407281553F80000AA0AE8329BFD4697D9EC37')
+    >>> view.recipient['number'], view.vp
+    ('46708251358', 170)
+    """
+    # size of the validity period, by format
+    VP_SIZES = {0: 0, 1: 7, 2: 1, 3: 7}
+
+    def _scan(self) -> None:
+        data = self.data
+        self.header_offset = self.smsc_offset + 1 + data[self.smsc_offset]
+        self.recipient_offset = self.header_offset + 2
+        self.pid_offset = self.recipient_offset + 2 + (data[self.recipient_offset] + 1) // 2
+        self.vp_offset = self.pid_offset + 2
+        self._scan_user_data(self.vp_offset + self.VP_SIZES[self.vpf])
+
+    @property
+    def vpf(self) -> int:
+        """
+        Validity Period Format, read from the first octet.
+        """
+        return (self.data[self.header_offset] >> 3) & 0b11
+
+    @_cached
+    def header(self) -> Dict[str, Any]:
+        return OutgoingPDUHeader.read(self._reader(self.header_offset))
+
+    @_cached
+    def message_ref(self) -> int:
+        return self.data[self.header_offset + 1]
+
+    @_cached
+    def recipient(self) -> Dict[str, Any]:
+        return Address.read(self._reader(self.recipient_offset))
+
+    @_cached
+    def vp(self) -> Union[None, int, datetime]:
+        """
+        Validity period: an integer if relative, a datetime if absolute, None otherwise.
+        """
+        if self.vpf == 2:
+            return self.data[self.vp_offset]
+        if self.vpf == 3:
+            return Date.decode(self.data[self.vp_offset:self.vp_offset + 7])
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the same result as `SMSSubmit.decode`.
+        """
+        result = {
+            'smsc': self.smsc,
+            'header': self.header,
+            'message-ref': self.message_ref,
+            'recipient': self.recipient,
+            'pid': self.pid,
+            'dcs': self.dcs,
+        }
+        if self.vpf in (2, 3):
+            result['vp'] = self.vp
+        if self.vpf == 2:
+            unit, value = SMSSubmit.relative_validity(self.vp)
+            result[f'validity-{unit}'] = value
+        result['user_data'] = self.user_data
+        return result
@@ -0,0 +1,131 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import asyncio
+import unittest
+
+from smspdudecoder.aio import Decoder, merge_modem_streams, read_modem_stream
+from smspdudecoder.modem import ModemError
+
+
+DELIVER_PDU = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+SUBMIT_PDU = '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+
+
+def _stream(output):
+    reader = asyncio.StreamReader()
+    reader.feed_data(output.encode())
+    reader.feed_eof()
+    return reader
+
+
+async def _collect(messages):
+    return [message async for message in messages]
+
+
+class ReadModemStreamTestCase(unittest.TestCase):
+    def test_listing(self):
+        async def main():
+            output = f'AT+CMGL=4\r\n+CMGL: 1,0,,24\r\n{DELIVER_PDU}\r\n+CMGL: 7,2,,23\r\n{SUBMIT_PDU}\r\n\r\nOK\r\n'
+            return await _collect(read_modem_stream(_stream(output)))
+        messages = asyncio.run(main())
+        self.assertEqual([(index, status) for index, status, _ in messages], [(1, 'rec-unread'), (7, 'sto-unsent')])
+        self.assertEqual(messages[0][2]['sender']['number'], '46705930301')
+        self.assertEqual(messages[1][2]['recipient']['number'], '46708251358')
+
+    def test_offload(self):
+        decoder = Decoder(offload_octets=30)
+
+        async def main():
+            output = f'+CMT: ,24\r\n{DELIVER_PDU}\r\n+CMGR: 2,,23\r\n{SUBMIT_PDU}\r\n'
+            return await _collect(read_modem_stream(_stream(output), decoder=decoder))
+        messages = asyncio.run(main())
+        self.assertEqual([message['user_data']['data'] for _, _, message in messages], ['TEST', 'hellohello'])
+        self.assertEqual((decoder.inline, decoder.offloaded), (1, 1))
+
+    def test_errors(self):
+        async def main(output, strict=True):
+            return await _collect(read_modem_stream(_stream(output), strict))
+        with self.assertRaisesRegex(ModemError, '321'):
+            asyncio.run(main('+CMGR: 1,,24\r\n+CMS ERROR: 321\r\n'))
+        with self.assertRaises(ValueError):
+            asyncio.run(main(f'+CMT: ,3\r\n0011\r\n+CMT: ,24\r\n{DELIVER_PDU}\r\n'))
+        self.assertEqual(len(asyncio.run(main(f'+CMT: ,3\r\n0011\r\n+CMT: ,24\r\n{DELIVER_PDU}\r\n', False))), 1)
+        # headers of text mode
+        output = f'+CMGL: 1,"REC READ","+336",,"23"\r\nHello\r\n+CMT: ,24\r\n{DELIVER_PDU}\r\n'
+        with self.assertRaisesRegex(ValueError, 'Invalid message header'):
+            asyncio.run(main(output))
+        self.assertEqual(len(asyncio.run(main(output, False))), 1)
+
+    def test_chunks(self):
+        async def main():
+            reader = asyncio.StreamReader()
+            messages = read_modem_stream(reader)
+            reader.feed_data(f'+CMT: ,23\r\n{DELIVER_PDU[:9]}'.encode())
+            reader.feed_data(DELIVER_PDU[9:].encode())
+            # the message is read before the end of its line
+            first = await messages.__anext__()
+            reader.feed_data(f'\r\n+CMGR: 2,,23\r\n{SUBMIT_PDU}'.encode())
+            reader.feed_eof()
+            return [first] + await _collect(messages)
+        messages = asyncio.run(main())
+        self.assertEqual([message['user_data']['data'] for _, _, message in messages], ['TEST', 'hellohello'])
+
+    def test_fake_modem(self):
+        async def main():
+            async def modem(reader, writer):
+                writer.write(f'+CMT: ,24\r\n{DELIVER_PDU}\r\n'.encode() * 3)
+                await writer.drain()
+                writer.close()
+            server = await asyncio.start_server(modem, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            messages = await _collect(read_modem_stream(reader))
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return messages
+        self.assertEqual([sms['user_data']['data'] for _, _, sms in asyncio.run(main())], ['TEST'] * 3)
+
+
+class MergeModemStreamsTestCase(unittest.TestCase):
+    def test_fairness(self):
+        async def main():
+            streams = {
+                'busy': _stream(f'+CMT: ,24\r\n{DELIVER_PDU}\r\n' * 6),
+                'quiet': _stream(f'+CMGL: 1,3,,23\r\n{SUBMIT_PDU}\r\n+CMGL: 2,3,,23\r\n{SUBMIT_PDU}\r\nOK\r\n'),
+            }
+            return await _collect(merge_modem_streams(streams, maxsize=2))
+        messages = asyncio.run(main())
+        names = [name for name, _, _, _ in messages]
+        self.assertEqual(names.count('busy'), 6)
+        self.assertEqual(names.count('quiet'), 2)
+        # the messages of the quiet modem are not queued behind all the messages of the busy one
+        self.assertLess(names.index('quiet', names.index('quiet') + 1), 5)
+        self.assertEqual([index for name, index, _, _ in messages if name == 'quiet'], [1, 2])
+
+    def test_backpressure(self):
+        async def main():
+            decoder = Decoder()
+            messages = merge_modem_streams({'modem': _stream(f'+CMT: ,24\r\n{DELIVER_PDU}\r\n' * 10)}, maxsize=1,
+                                           decoder=decoder)
+            first = await messages.__anext__()
+            for _ in range(10):
+                await asyncio.sleep(0)
+            decoded = decoder.inline
+            await messages.aclose()
+            return first, decoded
+        first, decoded = asyncio.run(main())
+        self.assertEqual(first[0], 'modem')
+        # besides the message yielded, one message is queued, and another one is waiting to be queued
+        self.assertEqual(decoded, 3)
+
+    def test_error(self):
+        async def main():
+            streams = {
+                'ok': _stream(f'+CMT: ,24\r\n{DELIVER_PDU}\r\n'),
+                'failing': _stream('+CMS ERROR: 500\r\n'),
+            }
+            return await _collect(merge_modem_streams(streams))
+        with self.assertRaisesRegex(ModemError, '500'):
+            asyncio.run(main())
@@ -0,0 +1,121 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from smspdudecoder.archive import PDUArchive
+from smspdudecoder.fields import SMSSubmit
+
+
+DELIVER_PDU = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+SUBMIT_PDU = '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+
+
+class PDUArchiveTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'sms.log')
+        self.write(f'{DELIVER_PDU}\n\n  {SUBMIT_PDU} \r\n{DELIVER_PDU}\r\n\r\n0011\n{DELIVER_PDU}')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content):
+        with open(self.path, 'w', newline='') as archive_file:
+            archive_file.write(content)
+
+    def test_items(self):
+        with PDUArchive(self.path) as archive:
+            self.assertEqual(len(archive), 5)
+            pdus = [bytes(pdu).decode() for pdu in archive]
+            self.assertEqual(pdus, [DELIVER_PDU, SUBMIT_PDU, DELIVER_PDU, '0011', DELIVER_PDU])
+            self.assertEqual(bytes(archive[-2]), b'0011')
+            self.assertEqual([bytes(pdu) for pdu in archive[1:4:2]], [SUBMIT_PDU.encode(), b'0011'])
+            with self.assertRaises(IndexError):
+                archive[5]
+
+    def test_chunks(self):
+        with PDUArchive(self.path, save_index=False) as archive:
+            expected = [bytes(pdu) for pdu in archive]
+        for chunk_size in (1, 7, 64):
+            with mock.patch('smspdudecoder.archive._SCAN_CHUNK_SIZE', chunk_size):
+                with PDUArchive(self.path, save_index=False) as archive:
+                    self.assertEqual([bytes(pdu) for pdu in archive], expected)
+
+    def test_decode(self):
+        with PDUArchive(self.path) as archive:
+            self.assertEqual(archive.decode(0)['user_data']['data'], 'TEST')
+            self.assertEqual(archive.decode(1, SMSSubmit.decode)['recipient']['number'], '46708251358')
+            with self.assertRaises(ValueError):
+                list(archive.decode_range())
+            self.assertEqual([index for index, _ in archive.decode_range(2, strict=False)], [2, 4])
+
+    def test_index(self):
+        PDUArchive(self.path).close()
+        self.assertTrue(os.path.exists(self.path + '.idx'))
+        with mock.patch.object(PDUArchive, '_scan', side_effect=AssertionError("Should not be scanned")):
+            with PDUArchive(self.path) as archive:
+                self.assertEqual(archive.decode(4)['user_data']['data'], 'TEST')
+        # the index of a modified archive is rebuilt
+        self.write(f'{SUBMIT_PDU}\n')
+        with PDUArchive(self.path) as archive:
+            self.assertEqual([bytes(pdu) for pdu in archive], [SUBMIT_PDU.encode()])
+
+    def test_partial_index(self):
+        PDUArchive(self.path).close()
+        with open(self.path + '.idx', 'rb') as index_file:
+            content = index_file.read()
+        # an index whose offsets are truncated, such as an index being written, is not used
+        with open(self.path + '.idx', 'wb') as index_file:
+            index_file.write(content[:-16])
+        with PDUArchive(self.path) as archive:
+            self.assertEqual(len(archive), 5)
+        # and is replaced
+        with mock.patch.object(PDUArchive, '_scan', side_effect=AssertionError("Should not be scanned")):
+            with PDUArchive(self.path) as archive:
+                self.assertEqual(len(archive), 5)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ['sms.log', 'sms.log.idx'])
+
+    def test_index_not_saved(self):
+        # the archive is opened when the index can not be written
+        index_path = os.path.join(self.directory.name, 'missing', 'sms.idx')
+        with PDUArchive(self.path, index_path) as archive:
+            self.assertEqual(len(archive), 5)
+        with mock.patch('os.replace', side_effect=PermissionError("Read-only")):
+            with PDUArchive(self.path, os.path.join(self.directory.name, 'other.idx')) as archive:
+                self.assertEqual(len(archive), 5)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ['sms.log'])
+
+    def test_no_index(self):
+        index_path = os.path.join(self.directory.name, 'other.idx')
+        PDUArchive(self.path, index_path).close()
+        self.assertTrue(os.path.exists(index_path))
+        PDUArchive(self.path, save_index=False).close()
+        self.assertFalse(os.path.exists(self.path + '.idx'))
+
+    def test_partitions(self):
+        with PDUArchive(self.path, save_index=False) as archive:
+            for count in range(1, 8):
+                partitions = archive.partitions(count)
+                self.assertLessEqual(len(partitions), count)
+                self.assertEqual([index for partition in partitions for index in partition], list(range(5)))
+            with self.assertRaises(ValueError):
+                archive.partitions(0)
+
+    def test_empty(self):
+        self.write('')
+        with PDUArchive(self.path) as archive:
+            self.assertEqual(len(archive), 0)
+            self.assertEqual(archive.partitions(4), [])
+
+    def test_close(self):
+        archive = PDUArchive(self.path)
+        pdu = archive[0]
+        with self.assertRaises(BufferError):
+            archive.close()
+        pdu.release()
+        archive.close()
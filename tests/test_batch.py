@@ -0,0 +1,75 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from smspdudecoder.batch import decode_many
+from smspdudecoder.easy import read_incoming_sms, read_incoming_sms_many
+from smspdudecoder.fields import SMSDeliver, SMSSubmit
+
+
+PDUS = [
+    '07916407058099F9040B916407950303F100008921222140140004D4E2940A',
+    'not a PDU',
+    (
+        '0791448720003023440C91449703529096000050015132532240A00500037A020190E9339A9D3EA3E920FA1B1466B341E472193E'
+        '079DD3EE73D85DA7EB41E7B41C1407C1CBF43228CC26E3416137390F3AABCFEAB3FAAC3EABCFEAB3FAAC3EABCFEAB3FAAC3EABCF'
+        'EAB3FADC3EB7CFED73FBDC3EBF5D4416D9457411596457137D87B7E16438194E86BBCF6D16D9055D429548A28BE822BA882E6370'
+        '196C2A8950E291E822BA88'
+    ),
+] * 20
+
+
+def _decode_with_tuples(pdu):
+    # results may contain tuples of their own
+    return {'pdu': pdu, 'pair': (pdu, len(pdu)), 'nested': [{'empty': ()}, ('a', 'b')]}
+
+
+class BatchTestCase(unittest.TestCase):
+    def check(self, results, decoder=SMSDeliver.decode):
+        items = list(results)
+        self.assertEqual(sorted(item.position for item in items), list(range(len(PDUS))))
+        for item in items:
+            if item.position % 3 == 1:
+                self.assertIsNone(item.result)
+                self.assertIsInstance(item.error, ValueError)
+            else:
+                self.assertIsNone(item.error)
+                self.assertEqual(item.result, decoder(PDUS[item.position]))
+        self.assertEqual(results.stats.count, len(PDUS))
+        self.assertEqual(results.stats.errors, len(PDUS) // 3)
+        return items
+
+    def test_serial(self):
+        self.check(SMSDeliver.decode_many(PDUS, workers=0))
+
+    def test_processes(self):
+        items = self.check(SMSDeliver.decode_many(PDUS, workers=2, chunksize=7))
+        self.assertEqual([item.position for item in items], list(range(len(PDUS))))
+
+    def test_threads_unordered(self):
+        self.check(SMSDeliver.decode_many(PDUS, workers=3, executor='thread', chunksize=4, ordered=False))
+
+    def test_existing_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            self.check(SMSDeliver.decode_many(PDUS, workers=2, executor=executor, chunksize=5))
+
+    def test_easy(self):
+        self.check(read_incoming_sms_many(PDUS, workers=2, chunksize=10), read_incoming_sms)
+
+    def test_submit(self):
+        results = list(SMSSubmit.decode_many(['0011000B916407281553F80000AA0AE8329BFD4697D9EC37'], workers=1))
+        self.assertEqual(results[0].result['user_data']['data'], 'hellohello')
+
+    def test_tuples(self):
+        pdus = ['first', 'second', '']
+        results = list(decode_many(_decode_with_tuples, pdus, workers=2, chunksize=2))
+        self.assertEqual([item.result for item in results], [_decode_with_tuples(pdu) for pdu in pdus])
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            SMSDeliver.decode_many(PDUS, chunksize=0)
+        with self.assertRaises(ValueError):
+            SMSDeliver.decode_many(PDUS, executor='fiber')
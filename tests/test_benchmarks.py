@@ -0,0 +1,61 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from benchmarks.corpus import generate
+from benchmarks.suite import BENCHMARKS, compare, measure_import_time, run
+from smspdudecoder.fields import SMSDeliver, SMSSubmit
+
+
+class CorpusTestCase(unittest.TestCase):
+    def test_reproducible(self):
+        self.assertEqual(generate(20, seed=1).deliver, generate(20, seed=1).deliver)
+        self.assertNotEqual(generate(20, seed=1).deliver, generate(20, seed=2).deliver)
+
+    def test_coverage(self):
+        corpus = generate(300)
+        delivered = [SMSDeliver.decode(pdu) for pdu in corpus.deliver]
+        submitted = [SMSSubmit.decode(pdu) for pdu in corpus.submit]
+        encodings = {sms['dcs']['encoding'] for sms in delivered + submitted}
+        self.assertEqual(encodings, {'gsm', 'ucs2', 'binary'})
+        self.assertIn('alphanumeric', {sms['sender']['toa']['ton'] for sms in delivered})
+        ieis = {
+            element['iei']
+            for sms in delivered + submitted if sms['user_data']['header']
+            for element in sms['user_data']['header']['elements']
+        }
+        self.assertEqual(ieis, {0x00, 0x08})
+        self.assertEqual({sms['header']['vpf'] for sms in submitted}, {0, 1, 2, 3})
+
+
+class SuiteTestCase(unittest.TestCase):
+    def test_run(self):
+        results = run(generate(10), repeat=1)
+        self.assertEqual(list(results), [benchmark.name for benchmark in BENCHMARKS])
+        for measures in results.values():
+            self.assertGreater(measures['ops_per_sec'], 0)
+            self.assertLessEqual(measures['p50_us'], measures['p99_us'])
+
+    def test_import_time(self):
+        import_ms, reference_ms = measure_import_time('smspdudecoder.codecs', repeat=1)
+        self.assertGreater(import_ms, 0)
+        self.assertGreater(reference_ms, 0)
+
+    def test_compare(self):
+        baseline = {
+            'import_ms': 40,
+            'import_reference_ms': 20,
+            'benchmarks': {'decode': {'reference': 100, 'ops_per_sec': 1000, 'peak_bytes': 500}},
+        }
+        # twice slower, on a twice slower machine
+        current = {
+            'import_ms': 80,
+            'import_reference_ms': 40,
+            'benchmarks': {'decode': {'reference': 50, 'ops_per_sec': 500, 'peak_bytes': 500}},
+        }
+        self.assertEqual(compare(current, baseline), [])
+        current['benchmarks']['decode'].update(ops_per_sec=300, peak_bytes=1000)
+        current['import_ms'] = 120
+        self.assertEqual(len(compare(current, baseline)), 3)
+        self.assertEqual(compare(dict(baseline, benchmarks={}), baseline), ['decode: missing'])
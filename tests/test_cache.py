@@ -0,0 +1,102 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from io import StringIO
+
+from smspdudecoder.cache import CachedDecoder, LRUCache, disable_field_caches, enable_field_caches
+from smspdudecoder.fields import Address, SMSC, SMSDeliver, SMSSubmit
+
+
+DELIVER_PDU = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+ALPHANUMERIC_PDU = SMSDeliver.encode('MMoney', 'Hello', smsc='+33609001390')
+SUBMIT_PDU = '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.get('a', str.upper)
+        cache.get('b', str.upper)
+        cache.get('a', str.upper)
+        cache.get('c', str.upper)
+        # b was the least recently used
+        self.assertEqual(list(cache.values), ['a', 'c'])
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual(cache.stats.hit_rate, 0.25)
+
+    def test_errors(self):
+        cache = LRUCache()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                cache.get('z', int)
+        self.assertEqual((len(cache), cache.stats.misses), (0, 2))
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+    def test_clear(self):
+        cache = LRUCache()
+        cache.get('a', str.upper)
+        cache.clear()
+        self.assertEqual(cache.stats, (0, 1, 0, 0, 4096))
+
+
+class CachedDecoderTestCase(unittest.TestCase):
+    def test_results(self):
+        decode = CachedDecoder()
+        for pdu in (DELIVER_PDU, bytes.fromhex(DELIVER_PDU), bytearray.fromhex(DELIVER_PDU)):
+            self.assertEqual(decode(pdu), SMSDeliver.decode(DELIVER_PDU))
+        self.assertEqual(decode.cache.stats[:2], (1, 2))
+        self.assertEqual(CachedDecoder(SMSSubmit.decode)(SUBMIT_PDU), SMSSubmit.decode(SUBMIT_PDU))
+
+    def test_records(self):
+        expected = SMSDeliver.decode_record(ALPHANUMERIC_PDU)
+        caches = enable_field_caches()
+        self.assertEqual([SMSDeliver.decode_record(ALPHANUMERIC_PDU) for _ in range(2)], [expected] * 2)
+        self.assertEqual(caches['address'].stats[:2], (1, 1))
+        self.assertIs(SMSC.decode_record('00'), SMSC.decode_record('00'))
+        self.assertEqual(Address.decode('0BD0CDE6DB5DCE03'), expected.sender.to_dict())
+
+    def test_copy(self):
+        decode = CachedDecoder()
+        decode(DELIVER_PDU)['sender']['toa']['ton'] = 'changed'
+        decode(DELIVER_PDU)['user_data']['data'] = 'changed'
+        self.assertEqual(decode(DELIVER_PDU), SMSDeliver.decode(DELIVER_PDU))
+
+    def test_records(self):
+        decode = CachedDecoder(SMSDeliver.decode_record, copy=False)
+        self.assertIs(decode(DELIVER_PDU), decode(DELIVER_PDU))
+
+    def test_stream(self):
+        decode = CachedDecoder()
+        self.assertEqual(decode(StringIO(DELIVER_PDU))['user_data']['data'], 'TEST')
+        self.assertEqual(len(decode.cache), 0)
+
+
+class FieldCachesTestCase(unittest.TestCase):
+    def tearDown(self):
+        disable_field_caches()
+
+    def test_results(self):
+        expected = [SMSDeliver.decode(pdu) for pdu in (DELIVER_PDU, ALPHANUMERIC_PDU)]
+        caches = enable_field_caches()
+        for _ in range(2):
+            self.assertEqual([SMSDeliver.decode(pdu) for pdu in (DELIVER_PDU, ALPHANUMERIC_PDU)], expected)
+        self.assertEqual(caches['address'].stats[:2], (2, 2))
+        self.assertEqual(caches['smsc'].stats[:2], (2, 2))
+        self.assertEqual(SMSC.decode('00'), {'length': 0, 'toa': None, 'number': None})
+
+    def test_copy(self):
+        enable_field_caches()
+        Address.decode('0BD0CDE6DB5DCE03')['toa']['ton'] = 'changed'
+        self.assertEqual(Address.decode('0BD0CDE6DB5DCE03')['toa']['ton'], 'alphanumeric')
+
+    def test_position(self):
+        enable_field_caches()
+        sms = SMSDeliver.decode(DELIVER_PDU)
+        self.assertEqual(SMSDeliver.decode(DELIVER_PDU), sms)
+        with self.assertRaises(ValueError):
+            SMSDeliver.decode(DELIVER_PDU[:20])
+        with self.assertRaises(ValueError):
+            SMSC.decode('')
@@ -0,0 +1,149 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from contextlib import redirect_stderr
+from io import StringIO
+
+from smspdudecoder.cli import CSV_COLUMNS, main
+from smspdudecoder.fields import SMSDeliver
+
+
+DELIVER_PDU = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+SUBMIT_PDU = '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+STATUS_REPORT_PDU = '07916407058099F9062A0B916407950303F1892122214014008921222150140000'
+CONCATENATED_PDU = SMSDeliver.encode('+33612345678', 'Hi', elements=[(0x00, b'\x01\x02\x01')])
+
+MODEM_OUTPUT = f'''AT+CMGL=4
++CMGL: 1,0,,24
+{DELIVER_PDU}
++CMGL: 2,3,,23
+{SUBMIT_PDU}
++CDS: 24
+{STATUS_REPORT_PDU}
++CMS ERROR: 321
+'''
+
+
+class CLITestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write(self, name, content):
+        with open(self.path(name), 'w') as input_file:
+            input_file.write(content)
+        return self.path(name)
+
+    def run_main(self, *args, status=0):
+        stderr = StringIO()
+        with redirect_stderr(stderr):
+            self.assertEqual(main(list(args) + ['-o', self.path('output')]), status)
+        with open(self.path('output'), encoding='utf-8') as output_file:
+            return output_file.read(), stderr.getvalue()
+
+    def test_jsonl(self):
+        source = self.write('pdus.log', f'{DELIVER_PDU}\n\n  {SUBMIT_PDU}  \n')
+        output, summary = self.run_main(source)
+        messages = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual([message['type'] for message in messages], ['deliver', 'submit'])
+        self.assertEqual(messages[0]['scts'], '2098-12-22T12:04:41+00:00')
+        self.assertEqual(messages[0]['user_data']['data'], 'TEST')
+        self.assertEqual(messages[1]['recipient']['number'], '46708251358')
+        self.assertTrue(summary.startswith('2 PDUs decoded, 0 errors'))
+
+    def test_easy(self):
+        source = self.write('pdus.log', f'{DELIVER_PDU}\n{CONCATENATED_PDU}\n')
+        output, _ = self.run_main(source, '--easy', '-q')
+        messages = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(messages[0], {
+            'type': 'deliver', 'sender': '+46705930301', 'date': '2098-12-22T12:04:41+00:00', 'content': 'TEST',
+            'partial': False,
+        })
+        self.assertEqual(messages[1]['partial'], {'reference': '1-2', 'parts_count': 2, 'part_number': 1})
+
+    def test_csv(self):
+        sources = [self.write('first.log', f'{DELIVER_PDU}\n'), self.write('second.log', f'{CONCATENATED_PDU}\n')]
+        output, _ = self.run_main(*sources, '--format', 'csv', '-q')
+        rows = list(csv.reader(StringIO(output)))
+        self.assertEqual(rows[0], list(CSV_COLUMNS))
+        self.assertEqual(rows[1], ['deliver', '+46705930301', '2098-12-22T12:04:41+00:00', 'TEST', '', '', '', '', ''])
+        self.assertEqual(rows[2][4:7], ['1-2', '2', '1'])
+
+    def test_status_report(self):
+        source = self.write('pdus.log', f'{STATUS_REPORT_PDU}\n')
+        output, _ = self.run_main(source, '--format', 'csv', '-q')
+        self.assertEqual(list(csv.reader(StringIO(output)))[1], [
+            'status-report', '+46705930301', '2098-12-22T12:05:41+00:00', '', '', '', '', '42', 'received',
+        ])
+        output, _ = self.run_main(source, '--easy', '-q')
+        self.assertEqual(json.loads(output)['delivered'], True)
+
+    def test_errors(self):
+        source = self.write('pdus.log', f'{DELIVER_PDU}\nZZ\n{DELIVER_PDU[:20]}11{DELIVER_PDU[22:]}\n')
+        output, summary = self.run_main(source, '--errors', self.path('errors'), status=1)
+        self.assertEqual(len(output.splitlines()), 1)
+        with open(self.path('errors')) as errors_file:
+            errors = [json.loads(line) for line in errors_file]
+        self.assertEqual([(error['source'], error['line']) for error in errors], [(source, 2), (source, 3)])
+        self.assertTrue(errors[1]['error'].startswith('ValueError: Invalid first bit'))
+        self.assertTrue(summary.startswith('1 PDUs decoded, 2 errors'))
+
+    def test_modem(self):
+        source = self.write('modem.log', MODEM_OUTPUT)
+        output, summary = self.run_main(source, '--input', 'modem', '--errors', self.path('errors'), status=1)
+        messages = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual([(message['modem']['index'], message['modem']['status'], message['type'])
+                          for message in messages],
+                         [(1, 'rec-unread', 'deliver'), (2, 'sto-sent', 'submit'), (None, None, 'status-report')])
+        with open(self.path('errors')) as errors_file:
+            self.assertEqual(json.loads(errors_file.read())['pdu'], '+CMS ERROR: 321')
+        self.assertIn('1 modem errors', summary)
+
+    def test_modem_text_mode(self):
+        # headers of text mode are written to the errors, and do not stop decoding
+        source = self.write('modem.log', f'+CMGL: 1,"REC READ","+336",,"23"\nHello\n+CMGL: 2,1,,24\n{DELIVER_PDU}\n')
+        output, summary = self.run_main(source, '--input', 'modem', '--errors', self.path('errors'), status=1)
+        self.assertEqual([json.loads(line)['modem']['index'] for line in output.splitlines()], [2])
+        with open(self.path('errors')) as errors_file:
+            error = json.loads(errors_file.read())
+        self.assertEqual((error['line'], error['pdu']), (1, '+CMGL: 1,"REC READ","+336",,"23"'))
+        self.assertTrue(error['error'].startswith('ValueError: Invalid message header'))
+        self.assertTrue(summary.startswith('1 PDUs decoded, 0 errors, 1 modem errors'))
+
+    def test_errors_order(self):
+        # modem errors and decoding errors are written in the order of the input
+        source = self.write('modem.log', f'+CMGL: 1,0,,3\nZZ\n+CMS ERROR: 321\n+CMGL: 2,0,,24\n{DELIVER_PDU}\n'
+                                         f'+CME ERROR: 10\n+CMGL: 3,0,,3\nZZ\n' * 2)
+        for workers in ('0', '2'):
+            self.run_main(source, '--input', 'modem', '--errors', self.path('errors'), '--workers', workers,
+                          '--chunksize', '1', status=1)
+            with open(self.path('errors')) as errors_file:
+                lines = [json.loads(line)['line'] for line in errors_file]
+            self.assertEqual(lines, [2, 3, 6, 8, 10, 11, 14, 16])
+
+    def test_workers(self):
+        source = self.write('pdus.log', f'{DELIVER_PDU}\nZZ\n{SUBMIT_PDU}\n' * 5)
+        expected, _ = self.run_main(source, '--format', 'csv', status=1)
+        output, summary = self.run_main(source, '--format', 'csv', '--workers', '2', '--chunksize', '2', status=1)
+        self.assertEqual(output, expected)
+        self.assertTrue(summary.startswith('10 PDUs decoded, 5 errors'))
+
+    def test_stdin(self):
+        process = subprocess.run(
+            [sys.executable, '-m', 'smspdudecoder', '--format', 'csv'], input=f'{DELIVER_PDU}\n'.encode(),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        self.assertEqual(process.stdout.decode().splitlines()[1].split(',')[3], 'TEST')
+        self.assertIn(b'1 PDUs decoded', process.stderr)
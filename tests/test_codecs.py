@@ -36,6 +36,42 @@ class GSMEncodingTestCase(unittest.TestCase):
         self.assertEqual(GSM.encode(DATA_DECODED), DATA_ENCODED)
         self.assertEqual(GSM.decode(DATA_ENCODED), DATA_DECODED)
 
+    def test_long_extended(self):
+        data = '{[0123456789€]}' * 76
+        encoded = GSM.encode(data)
+        self.assertEqual(len(encoded), 2 * 1520 * 7 // 8)
+        self.assertEqual(GSM.decode(encoded), data)
+
+    def test_unpack_septets(self):
+        for length in range(0, 80):
+            data = 'a' * length
+            unused_septet = b'\x00' if length % 8 == 7 else b''
+            self.assertEqual(GSM.unpack_septets(bytes.fromhex(GSM.encode(data))), data.encode() + unused_septet)
+
+    def test_decode_escapes(self):
+        self.assertEqual(GSM.decode_septets(bytes([0x1B, 0x1B, 0x65, 0x41])), '€A')
+        self.assertEqual(GSM.decode_septets(bytes([0x41, 0x1B])), 'A')
+        self.assertEqual(GSM.decode_septets(bytes([0x1B, 0x41])), ' ')
+
+    def test_pack_septets(self):
+        for length in range(0, 200):
+            septets = bytes(k % 128 for k in range(length))
+            self.assertEqual(GSM.unpack_septets(GSM.pack_septets(septets))[:length], septets)
+
+    def test_encode_invalid(self):
+        with self.assertRaisesRegex(ValueError, 'Char "`"'):
+            GSM.encode('hello `world`')
+        with self.assertRaisesRegex(ValueError, 'Char "\x1b"'):
+            GSM.encode('\x1b')
+
+    def test_encode_many(self):
+        messages = ['hello', '', '1234567', 'Lorem ipsum dolor sit amet' * 10]
+        self.assertEqual(list(GSM.encode_many(messages)), [GSM.encode(message) for message in messages])
+        self.assertEqual(
+            list(GSM.encode_many(messages, with_padding=True, raw=True)),
+            [GSM.encode_bytes(message, with_padding=True) for message in messages],
+        )
+
     def test_ext_alphabet(self):
         self.assertEqual(GSM.encode('123456€\r', with_padding=True), '31D98C56B36DCA0D')
         self.assertEqual(GSM.encode('12345678\r',  with_padding=True), '31D98C56B3DD700D')
@@ -66,3 +102,77 @@ class GSMEncodingTestCase(unittest.TestCase):
         self.assertEqual(GSM.decode(GSM.encode('12345^', with_padding=True), strip_padding=False), '12345^\r')
         self.assertEqual(GSM.decode(GSM.encode('123456^', with_padding=True), strip_padding=True), '123456^')
         self.assertEqual(GSM.decode(GSM.encode('123456^', with_padding=True), strip_padding=False), '123456^')
+
+
+class NationalLanguageTestCase(unittest.TestCase):
+    def test_tables(self):
+        for language, alphabet in GSM.LOCKING_SHIFTS.items():
+            self.assertEqual(len(alphabet), 128)
+            # unassigned septets are spaces
+            self.assertEqual(len(set(alphabet)), 128 - alphabet.count(' ') + 1, language)
+            self.assertEqual((alphabet[GSM.CHAR_EXT], alphabet[0x20], alphabet[0x0A], alphabet[0x0D]),
+                             ('\x1b', ' ', '\n', '\r'))
+        self.assertEqual(sorted(GSM.LOCKING_SHIFTS), [1] + list(range(3, 14)))
+        self.assertEqual(sorted(GSM.SINGLE_SHIFTS), list(range(1, 14)))
+        for language in range(4, 14):
+            self.assertEqual(GSM.SINGLE_SHIFTS[language][0x65], '€')
+            self.assertNotIn(GSM.CHAR_EXT, GSM.SINGLE_SHIFTS[language])
+
+    def test_round_trip(self):
+        for locking, single, text in (
+            (1, 1, 'Şişli Ğ İ ı ç €'),
+            (1, 0, 'Şişli ğ İ ı ç'),
+            (0, 2, 'Canción Águila ç {€}'),
+            (3, 3, 'Ação ô Ê ª º ∞ Ó Í â'),
+            (0, 3, 'Ação Ôô'),
+            (6, 6, 'नमस्ते, आप कैसे हैं? १२३ {€} ॐ'),
+            (4, 4, 'আমি ভালো আছি. ৎ ৳ ০১'),
+            (11, 11, 'வணக்கம் ௐ ௰'),
+            (13, 13, 'آپ کیسے ہیں؟ ۱۲۳'),
+        ):
+            codec = GSM.for_language(locking, single)
+            self.assertFalse(GSM.is_encodable(text))
+            self.assertTrue(codec.is_encodable(text))
+            self.assertEqual(codec.decode(codec.encode(text, with_padding=True), strip_padding=True), text)
+            self.assertEqual(codec.decode_septets(codec.encode_septets(text)), text)
+
+    def test_single_septet(self):
+        # characters of both tables are encoded with the locking shift table
+        self.assertEqual(GSM.for_language(3, 3).encode_septets('ê'), b'\x04')
+        self.assertEqual(GSM.for_language(0, 3).encode_septets('ê'), b'\x1b\x05')
+
+    def test_indic(self):
+        hindi = GSM.for_language(6, 6)
+        self.assertEqual(hindi.encode_septets('क ख'), b'\x15 \x16')
+        self.assertEqual(hindi.encode_septets('\u0958 ०'), b'\x1b\x2c \x1b\x1c')
+        # unassigned septets are decoded as spaces, and spaces are encoded as 0x20
+        tamil = GSM.for_language(11, 0)
+        self.assertEqual(tamil.decode_septets(b'\x16\x20\x17'), '   ')
+        self.assertEqual(tamil.encode_septets(' '), b' ')
+        self.assertEqual(GSM.for_language(13, 0).decode_septets(b'\x00\x02'), 'اب')
+
+    def test_default(self):
+        self.assertIs(GSM.for_language(), GSM)
+        # tables which are not known are replaced by the default ones
+        self.assertIs(GSM.for_language(2, 0), GSM)
+        self.assertIs(GSM.for_language(99, 99), GSM)
+        self.assertIs(GSM.for_language(1, 2), GSM.for_language(1, 2))
+        self.assertEqual(GSM.for_language(1, 0).ALPHABET_EXT, GSM.ALPHABET_EXT)
+
+    def test_add_shift_tables(self):
+        alphabet = GSM.ALPHABET.replace('è', 'क')
+        try:
+            GSM.add_shift_tables(14, alphabet, {0x41: 'ख'})
+            codec = GSM.for_language(14, 14)
+            self.assertEqual(codec.decode(codec.encode('कख')), 'कख')
+            self.assertEqual(codec.encode_septets('कख'), b'\x04\x1bA')
+        finally:
+            del GSM.LOCKING_SHIFTS[14], GSM.SINGLE_SHIFTS[14]
+            GSM.add_shift_tables(14)
+        self.assertIs(GSM.for_language(14, 14), GSM)
+        with self.assertRaises(ValueError):
+            GSM.add_shift_tables(14, alphabet[:-1])
+        with self.assertRaises(ValueError):
+            GSM.add_shift_tables(14, single_shift={0x1B: 'x'})
+        with self.assertRaises(ValueError):
+            GSM.add_shift_tables(0)
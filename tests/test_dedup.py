@@ -0,0 +1,108 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from smspdudecoder.dedup import BloomFilter, Deduplicator, fingerprint, fingerprint_pdu
+from smspdudecoder.easy import read_incoming_sms
+from smspdudecoder.fields import SMSDeliver
+
+
+DELIVER_PDU = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FingerprintTestCase(unittest.TestCase):
+    def test_decoded(self):
+        pdus = [DELIVER_PDU] + list(SMSDeliver.encode_parts('+33612345678', 'Été ☀' * 50))
+        for pdu in pdus:
+            self.assertEqual(fingerprint(read_incoming_sms(pdu)), fingerprint(SMSDeliver.decode(pdu)))
+        fingerprints = {fingerprint(read_incoming_sms(pdu)) for pdu in pdus}
+        self.assertEqual(len(fingerprints), len(pdus))
+
+    def test_pdu(self):
+        parts = list(SMSDeliver.encode_parts('+33612345678', 'x' * 200))
+        self.assertNotEqual(fingerprint_pdu(parts[0]), fingerprint_pdu(parts[1]))
+        # same message, through another SMS-C
+        self.assertEqual(fingerprint_pdu(DELIVER_PDU), fingerprint_pdu('0004' + DELIVER_PDU[18:]))
+        self.assertEqual(fingerprint_pdu(bytes.fromhex(DELIVER_PDU)), fingerprint_pdu(DELIVER_PDU))
+        for length in (0, 2, 18, 40):
+            with self.assertRaises(ValueError):
+                fingerprint_pdu(DELIVER_PDU[:length])
+
+
+class BloomFilterTestCase(unittest.TestCase):
+    def test_error_rate(self):
+        bloom = BloomFilter.for_size(4096, 0.01)
+        for index in range(bloom.capacity):
+            bloom.add(b'%d' % index)
+        self.assertTrue(all(b'%d' % index in bloom for index in range(bloom.capacity)))
+        false_positives = sum(b'x%d' % index in bloom for index in range(10000))
+        self.assertLess(false_positives, 200)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            BloomFilter.for_size(1024, 0)
+        with self.assertRaises(ValueError):
+            BloomFilter(0, 1, 1)
+
+
+class DeduplicatorTestCase(unittest.TestCase):
+    def test_window(self):
+        clock = Clock()
+        deduplicator = Deduplicator(window=60, max_bytes=1 << 14, generations=3, clock=clock)
+        self.assertFalse(deduplicator.seen_pdu(DELIVER_PDU))
+        clock.now = 59
+        self.assertTrue(deduplicator.seen_pdu(DELIVER_PDU))
+        self.assertFalse(deduplicator.seen_pdu(DELIVER_PDU[:-2] + '0B'))
+        # remembered for at least the window, and at most the window and a rotation period
+        clock.now = 89
+        self.assertTrue(deduplicator.seen_pdu(DELIVER_PDU))
+        clock.now = 119
+        self.assertFalse(deduplicator.seen_pdu(DELIVER_PDU))
+        self.assertEqual((deduplicator.checked, deduplicator.duplicates, deduplicator.rotations), (5, 2, 3))
+
+    def test_idle(self):
+        # filters are rotated once per elapsed period after an idle gap
+        clock = Clock()
+        deduplicator = Deduplicator(window=60, max_bytes=1 << 14, generations=3, clock=clock)
+        self.assertFalse(deduplicator.seen_pdu(DELIVER_PDU))
+        clock.now = 65
+        self.assertTrue(deduplicator.seen_pdu(DELIVER_PDU))
+        self.assertEqual(deduplicator.rotations, 2)
+        clock.now = 165
+        self.assertFalse(deduplicator.seen_pdu(DELIVER_PDU))
+        self.assertEqual(deduplicator.rotations, 5)
+        # all the filters are cleared after a gap longer than the window
+        clock.now = 10 ** 6
+        self.assertFalse(deduplicator.seen_pdu(DELIVER_PDU))
+        self.assertEqual((deduplicator.rotations, deduplicator.forced_rotations), (8, 0))
+
+    def test_schedule(self):
+        # rotations happen every period from the creation, whenever messages are checked
+        clock = Clock()
+        deduplicator = Deduplicator(window=60, max_bytes=1 << 14, generations=3, clock=clock)
+        for now, rotations in ((45, 1), (61, 2), (89, 2), (155, 5)):
+            clock.now = now
+            deduplicator.seen_pdu(DELIVER_PDU)
+            self.assertEqual(deduplicator.rotations, rotations)
+        self.assertEqual(deduplicator.rotated, 150)
+        deduplicator.rotate()
+        self.assertEqual((deduplicator.rotations, deduplicator.rotated), (6, 150))
+
+    def test_memory(self):
+        deduplicator = Deduplicator(max_bytes=1 << 12, error_rate=0.01, generations=2)
+        capacity = deduplicator.filters[-1].capacity
+        duplicates = sum(deduplicator.check(b'%d' % index) for index in range(capacity * 10))
+        self.assertEqual(sum(len(bloom.bits) for bloom in deduplicator.filters), 1 << 12)
+        self.assertEqual(deduplicator.forced_rotations, 9)
+        self.assertLess(duplicates, capacity * 10 * 0.01)
+        # the last fingerprints are remembered
+        self.assertTrue(deduplicator.check(b'%d' % (capacity * 10 - 1)))
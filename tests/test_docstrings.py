@@ -5,7 +5,21 @@ import doctest
 
 
 def load_tests(loader, tests, pattern):
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.aio'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.archive'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.batch'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.cache'))
     tests.addTests(doctest.DocTestSuite('smspdudecoder.codecs'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.dedup'))
     tests.addTests(doctest.DocTestSuite('smspdudecoder.elements'))
     tests.addTests(doctest.DocTestSuite('smspdudecoder.fields'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.instrumentation'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.export'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.modem'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.planning'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.reassembly'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.views'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.vectorized'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.validation'))
+    tests.addTests(doctest.DocTestSuite('smspdudecoder.reader'))
     return tests
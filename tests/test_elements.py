@@ -3,14 +3,44 @@
 
 import unittest
 
+from datetime import datetime, timezone
+
+from smspdudecoder.elements import Date
 from smspdudecoder.elements import Number
 from smspdudecoder.elements import TypeOfAddress
 
 
+class DateTestCase(unittest.TestCase):
+    def test_invalid_semi_octets(self):
+        for data in ('7A402132522400', '704021325224A0', '704021325224'):
+            with self.assertRaises(ValueError):
+                Date.decode(data)
+            with self.assertRaises(ValueError):
+                Date.decode_timestamp(data)
+
+    def test_invalid_date(self):
+        # 2007-02-29 does not exist, 2008-02-29 does
+        with self.assertRaises(ValueError):
+            Date.decode_timestamp('70209232522400')
+        self.assertEqual(Date.decode_timestamp('80209232522400'),
+                         datetime(2008, 2, 29, 23, 25, 42, tzinfo=timezone.utc).timestamp())
+
+    def test_shared_timezones(self):
+        self.assertIs(Date.decode_components('70402132522423')[6], Date.decode_components('11101131522423')[6])
+
+    def test_memoryview(self):
+        data = memoryview(bytes.fromhex('003130523210658A'))[1:]
+        self.assertEqual(Date.decode(data), Date.decode('3130523210658A'))
+
+
 class NumberTestCase(unittest.TestCase):
     def test_empty(self):
         self.assertEqual(Number.encode(''), Number.decode(''), '')
 
+    def test_octets(self):
+        self.assertEqual(Number.decode(memoryview(b'\x21\x43\xF5')), '12345')
+        self.assertEqual(Number.decode(bytearray(b'\x21\xA3')), '123A')
+
 
 class TypeOfAddressTestCase(unittest.TestCase):
     def test_unknown(self):
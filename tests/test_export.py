@@ -0,0 +1,116 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import csv
+import io
+import unittest
+
+from datetime import datetime, timezone
+
+from smspdudecoder.cache import disable_field_caches, enable_field_caches
+from smspdudecoder.export import COLUMNS, DeliverColumns, iter_deliver_columns, write_arrow, write_csv
+from smspdudecoder.fields import SMSDeliver
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+
+SCTS = datetime(2023, 5, 17, 12, 30, tzinfo=timezone.utc)
+PDUS = (
+    ['07916407058099F9040B916407950303F100008921222140140004D4E2940A']
+    + list(SMSDeliver.encode_parts('+33600000000', 'Привет, мир! ' * 8, SCTS, reference=0x1234,
+                                   reference_bits=16))
+    + [SMSDeliver.encode('MMoney', b'\x01\x02', SCTS, encoding='binary')]
+    + list(SMSDeliver.encode_parts('0600000000', '{€} ' * 60, SCTS, smsc='+33609001390', reference=7))
+)
+
+
+def _expected_rows():
+    for pdu in PDUS:
+        sms = SMSDeliver.decode(pdu, 'timestamp')
+        concatenation = {'reference': 0, 'parts_count': 0, 'part_number': 0}
+        if sms['user_data']['header'] is not None:
+            concatenation = sms['user_data']['header']['elements'][0]['data']
+        data = sms['user_data']['data']
+        yield (
+            sms['sender']['number'],
+            sms['sender']['toa']['ton'],
+            sms['sender']['toa']['npi'],
+            sms['smsc']['number'],
+            sms['scts'],
+            sms['dcs']['encoding'],
+            concatenation['reference'],
+            concatenation['parts_count'],
+            concatenation['part_number'],
+            data.hex().upper() if isinstance(data, bytes) else data,
+        )
+
+
+class DeliverColumnsTestCase(unittest.TestCase):
+    def test_rows(self):
+        columns = DeliverColumns()
+        for pdu in PDUS:
+            columns.append(pdu)
+        self.assertEqual(list(columns.rows()), list(_expected_rows()))
+        self.assertEqual(len(columns), len(PDUS))
+        self.assertEqual(columns.text_offsets[-1], len(columns.text_data))
+
+    def test_field_caches(self):
+        caches = enable_field_caches()
+        try:
+            columns = DeliverColumns()
+            for pdu in PDUS:
+                columns.append(pdu)
+        finally:
+            disable_field_caches()
+        self.assertEqual(list(columns.rows()), list(_expected_rows()))
+        self.assertEqual(caches['address'].stats[:2], (len(PDUS) - 4, 4))
+        self.assertEqual(caches['smsc'].stats[:2], (len(PDUS) - 3, 3))
+
+    def test_invalid(self):
+        columns = DeliverColumns()
+        with self.assertRaises(ValueError):
+            columns.append(PDUS[0][:-10])
+        self.assertEqual(len(columns), 0)
+        self.assertEqual(list(columns.text_offsets), [0])
+
+    def test_batches(self):
+        batches = list(iter_deliver_columns(PDUS, batch_size=3))
+        self.assertEqual([len(columns) for columns in batches], [3] * (len(PDUS) // 3) + [len(PDUS) % 3])
+        with self.assertRaises(ValueError):
+            list(iter_deliver_columns(['00'] + PDUS))
+        self.assertEqual(sum(map(len, iter_deliver_columns(['00'] + PDUS, strict=False))), len(PDUS))
+
+
+class WriteTestCase(unittest.TestCase):
+    def test_csv(self):
+        output = io.StringIO(newline='')
+        self.assertEqual(write_csv(PDUS, output, batch_size=2), len(PDUS))
+        rows = list(csv.reader(io.StringIO(output.getvalue(), newline='')))
+        self.assertEqual(tuple(rows[0]), COLUMNS)
+        expected = [['' if value is None else str(value) for value in row] for row in _expected_rows()]
+        self.assertEqual(rows[1:], expected)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow(self):
+        sink = io.BytesIO()
+        self.assertEqual(write_arrow(PDUS, sink, batch_size=4), len(PDUS))
+        table = pyarrow.ipc.open_stream(sink.getvalue()).read_all()
+        self.assertEqual(table.column_names, list(COLUMNS))
+        for row, expected in zip(table.to_pylist(), _expected_rows()):
+            expected = dict(zip(COLUMNS, expected))
+            expected['scts'] = datetime.fromtimestamp(expected['scts'], timezone.utc)
+            if not expected['parts_count']:
+                expected.update(reference=None, parts_count=None, part_number=None)
+            row['scts'] = row['scts'].astimezone(timezone.utc)
+            self.assertEqual(row, expected)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_empty(self):
+        sink = io.BytesIO()
+        self.assertEqual(write_arrow([], sink), 0)
+        table = pyarrow.ipc.open_stream(sink.getvalue()).read_all()
+        self.assertEqual((table.num_rows, table.column_names), (0, list(COLUMNS)))
@@ -0,0 +1,349 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from smspdudecoder.fields import Address, PDUHeader, SMSC, SMSDeliver, SMSStatusReport, SMSSubmit, Status
+from smspdudecoder.fields import UserDataHeader
+from smspdudecoder.fields import decode_any, decoder_for_tpdu
+from smspdudecoder.reader import PDUReader
+
+
+DELIVER_PDU = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+DELIVER_RESULT = {
+    'smsc': {'length': 7, 'toa': {'ton': 'international', 'npi': 'isdn'}, 'number': '46705008999'},
+    'header': {'rp': False, 'udhi': False, 'sri': False, 'lp': False, 'mms': True, 'mti': 'deliver'},
+    'sender': {'length': 11, 'toa': {'ton': 'international', 'npi': 'isdn'}, 'number': '46705930301'},
+    'pid': 0,
+    'dcs': {'encoding': 'gsm'},
+    'scts': datetime(2098, 12, 22, 12, 4, 41, tzinfo=timezone.utc),
+    'user_data': {'header': None, 'data': 'TEST'},
+}
+SUBMIT_PDU = '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+STATUS_REPORT_PDU = '07916407058099F9062A0B916407950303F1892122214014008921222150140000'
+
+
+class PDUDataTestCase(unittest.TestCase):
+    def test_input_types(self):
+        octets = bytes.fromhex(DELIVER_PDU)
+        for pdu_data in (DELIVER_PDU, StringIO(DELIVER_PDU), octets, bytearray(octets), memoryview(octets)):
+            self.assertEqual(SMSDeliver.decode(pdu_data), DELIVER_RESULT)
+
+    def test_stream_position(self):
+        pdu_data = StringIO(DELIVER_PDU + '00')
+        SMSC.decode(pdu_data)
+        self.assertEqual(pdu_data.tell(), 16)
+        self.assertEqual(PDUHeader.decode(pdu_data)['mti'], 'deliver')
+        self.assertEqual(Address.decode(pdu_data)['number'], '46705930301')
+        self.assertEqual(pdu_data.read(), '00008921222140140004D4E2940A00')
+
+    def test_stream_reads(self):
+        # only the octets of the fields are read, and streams do not need to be seekable
+        class Stream:
+            def __init__(self, data):
+                self.data = data
+                self.read_size = 0
+
+            def read(self, size=-1):
+                chunk, self.data = (self.data, '') if size < 0 else (self.data[:size], self.data[size:])
+                self.read_size += len(chunk)
+                return chunk
+
+        pdu_data = Stream(DELIVER_PDU * 100)
+        self.assertEqual(SMSC.decode(pdu_data)['number'], '46705008999')
+        self.assertEqual(PDUHeader.decode(pdu_data)['mti'], 'deliver')
+        self.assertEqual(pdu_data.read_size, 18)
+        pdu_data = Stream(DELIVER_PDU * 100)
+        for count in range(1, 101):
+            self.assertEqual(decode_any(pdu_data), DELIVER_RESULT)
+            self.assertEqual(pdu_data.read_size, count * len(DELIVER_PDU))
+
+    def test_shared_reader(self):
+        reader = PDUReader.wrap(DELIVER_PDU + DELIVER_PDU)
+        self.assertEqual(SMSDeliver.decode(reader), DELIVER_RESULT)
+        self.assertEqual(SMSDeliver.decode(reader), DELIVER_RESULT)
+        self.assertEqual(reader.remaining(), 0)
+
+    def test_truncated(self):
+        with self.assertRaises(ValueError):
+            SMSDeliver.decode(DELIVER_PDU[:20])
+
+
+class SMSSubmitTestCase(unittest.TestCase):
+    def test_relative_validity(self):
+        sms = SMSSubmit.decode('0011000B916407281553F80000AA0AE8329BFD4697D9EC37')
+        self.assertEqual(sms['recipient']['number'], '46708251358')
+        self.assertEqual(sms['vp'], 0xAA)
+        self.assertEqual(sms['validity-days'], 4)
+        self.assertEqual(sms['user_data']['data'], 'hellohello')
+
+
+class RecordTestCase(unittest.TestCase):
+    def test_to_dict(self):
+        record = SMSDeliver.decode_record(DELIVER_PDU)
+        self.assertEqual(record.to_dict(), DELIVER_RESULT)
+        self.assertEqual(record.user_data.data, 'TEST')
+
+    def test_shared_values(self):
+        first = SMSDeliver.decode_record(DELIVER_PDU)
+        second = SMSDeliver.decode_record(bytes.fromhex(DELIVER_PDU))
+        self.assertIs(first.header, second.header)
+        self.assertIs(first.dcs, second.dcs)
+        self.assertIs(first.sender.toa, second.smsc.toa)
+        self.assertIs(first.sender.number, second.sender.number)
+
+    def test_concatenated(self):
+        record = SMSDeliver.decode_record(
+            '0791448720003023440C91449703529096000050015132532240A00500037A020190E9339A9D3EA3E920FA1B1466B341E47219'
+            '3E079DD3EE73D85DA7EB41E7B41C1407C1CBF43228CC26E3416137390F3AABCFEAB3FAAC3EABCFEAB3FAAC3EABCFEAB3FAAC3E'
+            'ABCFEAB3FADC3EB7CFED73FBDC3EBF5D4416D9457411596457137D87B7E16438194E86BBCF6D16D9055D429548A28BE822BA88'
+            '2E6370196C2A8950E291E822BA88'
+        )
+        self.assertEqual(record.user_data.header.elements[0].data.reference, 122)
+        self.assertTrue(record.user_data.data.startswith('Highlight'))
+
+    def test_submit(self):
+        pdu = '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+        self.assertEqual(SMSSubmit.decode_record(pdu).to_dict(), SMSSubmit.decode(pdu))
+        self.assertEqual(list(SMSSubmit.decode_record(pdu).to_dict()), list(SMSSubmit.decode(pdu)))
+
+
+class EncodeTestCase(unittest.TestCase):
+    SCTS = datetime(2023, 4, 12, 10, 30, tzinfo=timezone(timedelta(hours=2)))
+
+    def _join(self, parts, decoder=SMSDeliver):
+        messages = [decoder.decode(part) for part in parts]
+        contents = [message['user_data']['data'] for message in messages]
+        return messages, (b'' if isinstance(contents[0], bytes) else '').join(contents)
+
+    def test_deliver_round_trip(self):
+        for sender in ('+33612345678', '0612345678', 'MyBank'):
+            for text in ('Hello', 'Prix: 2 €', 'Привет', b'\x00\x01\xFF'):
+                pdu = SMSDeliver.encode(sender, text, self.SCTS, smsc='+33609001390')
+                message = SMSDeliver.decode(pdu)
+                self.assertEqual(message['user_data']['data'], text)
+                self.assertEqual(message['scts'], self.SCTS)
+                self.assertEqual(message['smsc']['number'], '33609001390')
+                self.assertEqual(message['sender']['number'], sender.lstrip('+'))
+
+    def test_submit_validity(self):
+        for validity, vpf in ((None, 0), (170, 2), (timedelta(hours=1), 2), (self.SCTS, 3)):
+            message = SMSSubmit.decode(SMSSubmit.encode('+33612345678', 'Hello', validity=validity))
+            self.assertEqual(message['header']['vpf'], vpf)
+            if vpf == 3:
+                self.assertEqual(message['vp'], self.SCTS)
+        message = SMSSubmit.decode(SMSSubmit.encode('+33612345678', 'Hello', validity=timedelta(hours=1)))
+        self.assertEqual(message['validity-minutes'], 60)
+        with self.assertRaises(ValueError):
+            SMSSubmit.encode('+33612345678', 'Hello', validity=timedelta(weeks=100))
+
+    def test_submit_header(self):
+        pdu = SMSSubmit.encode('+33612345678', 'Hello', message_ref=7, srr=True, elements=[(0x0A, b'\x01\x02')])
+        message = SMSSubmit.decode(pdu)
+        self.assertEqual(message['message-ref'], 7)
+        self.assertTrue(message['header']['srr'])
+        self.assertTrue(message['header']['udhi'])
+        self.assertEqual(message['user_data']['header']['elements'], [{'iei': 10, 'length': 2, 'data': '0102'}])
+        self.assertEqual(message['user_data']['data'], 'Hello')
+
+    def test_too_long(self):
+        SMSSubmit.encode('+33612345678', 'a' * 160)
+        with self.assertRaises(ValueError):
+            SMSSubmit.encode('+33612345678', 'a' * 161)
+        with self.assertRaises(ValueError):
+            SMSSubmit.encode('+33612345678', '€' * 81)
+        with self.assertRaises(ValueError):
+            SMSSubmit.encode('+33612345678', 'Привет' * 12)
+
+    def test_single_part(self):
+        parts = list(SMSDeliver.encode_parts('+33612345678', 'a' * 160, self.SCTS))
+        self.assertEqual(parts, [SMSDeliver.encode('+33612345678', 'a' * 160, self.SCTS)])
+
+    def test_parts_sizes(self):
+        for text, bits, sizes in (
+            ('a' * 161, 8, [153, 8]),
+            ('a' * 161, 16, [152, 9]),
+            ('€' * 100, 8, [76, 24]),
+            ('я' * 71, 8, [67, 4]),
+            ('я' * 71, 16, [66, 5]),
+        ):
+            parts = list(SMSDeliver.encode_parts('+33612345678', text, self.SCTS, reference_bits=bits))
+            messages, joined = self._join(parts)
+            self.assertEqual(joined, text)
+            self.assertEqual([len(message['user_data']['data']) for message in messages], sizes)
+
+    def test_parts_boundaries(self):
+        # escape sequences and surrogate pairs are never split
+        for prefix in range(4):
+            for text in ('a' * prefix + '€' * 160, 'a' * prefix + '😀' * 70, bytes(range(256)) * 2):
+                parts = list(SMSSubmit.encode_parts('+33612345678', text, elements=[(0x0A, b'\x01')]))
+                messages, joined = self._join(parts, SMSSubmit)
+                self.assertEqual(joined, text)
+                for message in messages:
+                    self.assertEqual(message['user_data']['header']['elements'][1]['iei'], 0x0A)
+
+    def test_parts_reference(self):
+        parts = list(SMSSubmit.encode_parts('+33612345678', 'a' * 400, reference=0x1FF, message_ref=0xFF))
+        messages, _ = self._join(parts, SMSSubmit)
+        self.assertEqual([message['message-ref'] for message in messages], [0xFF, 0, 1])
+        concatenations = [message['user_data']['header']['elements'][0]['data'] for message in messages]
+        self.assertEqual(concatenations, [
+            {'reference': 0xFF, 'parts_count': 3, 'part_number': 1},
+            {'reference': 0xFF, 'parts_count': 3, 'part_number': 2},
+            {'reference': 0xFF, 'parts_count': 3, 'part_number': 3},
+        ])
+
+
+class NationalLanguageTestCase(unittest.TestCase):
+    def elements(self, message):
+        return [(element['iei'], element['data']) for element in message['user_data']['header']['elements']]
+
+    def test_encode(self):
+        for language, text, elements in (
+            ('turkish', 'Çağrı', [(0x25, '01')]),
+            # the locking shift table does not have 'è'
+            ('turkish', 'Ağaç è {€}', [(0x24, '01')]),
+            # the locking shift table does not have 'Ω', but encodes 'ã' with a single septet
+            (3, 'ã' * 10 + ' Ω', [(0x25, '03'), (0x24, '03')]),
+            ('spanish', 'Canción', [(0x24, '02')]),
+            ('portuguese', 'Ação', [(0x25, '03')]),
+        ):
+            message = SMSSubmit.decode(SMSSubmit.encode('+33612345678', text, language=language))
+            self.assertEqual(message['dcs']['encoding'], 'gsm')
+            self.assertEqual(message['user_data']['data'], text)
+            self.assertEqual(self.elements(message), elements, text)
+
+    def test_default_alphabet(self):
+        # texts that the default alphabet encodes do not use shift tables
+        message = SMSDeliver.decode(SMSDeliver.encode('+33612345678', 'Hello', language='turkish'))
+        self.assertIsNone(message['user_data']['header'])
+        # nor texts that the shift tables can not encode
+        message = SMSDeliver.decode(SMSDeliver.encode('+33612345678', 'Привет', language='turkish'))
+        self.assertEqual(message['dcs']['encoding'], 'ucs2')
+        with self.assertRaises(ValueError):
+            SMSDeliver.encode('+33612345678', 'Hello', language=14)
+        with self.assertRaises(KeyError):
+            SMSDeliver.encode('+33612345678', 'Hello', language='klingon')
+
+    def test_parts(self):
+        text = 'Günaydın, nasılsınız? ' * 10
+        parts = list(SMSDeliver.encode_parts('+33612345678', text, language='turkish', elements=[(0x0A, b'\x01')]))
+        messages = [SMSDeliver.decode(part) for part in parts]
+        self.assertEqual(len(parts), 2)
+        self.assertEqual(''.join(message['user_data']['data'] for message in messages), text)
+        for message in messages:
+            self.assertEqual([iei for iei, _ in self.elements(message)], [0x00, 0x0A, 0x25])
+        self.assertEqual(SMSDeliver.decode_record(parts[1]).user_data.data, messages[1]['user_data']['data'])
+
+    def test_explicit_elements(self):
+        pdu = SMSDeliver.encode('+33612345678', 'Ağaç', elements=[(0x25, b'\x01')])
+        self.assertEqual(SMSDeliver.decode(pdu)['user_data']['data'], 'Ağaç')
+        # unknown tables are replaced by the default ones
+        pdu = SMSDeliver.encode('+33612345678', 'Hello', elements=[(0x25, b'\x63'), (0x24, b'\x63')])
+        self.assertEqual(SMSDeliver.decode(pdu)['user_data']['data'], 'Hello')
+
+    def test_national_languages(self):
+        self.assertEqual(UserDataHeader.national_languages(bytes.fromhex('050003CC0201')), (0, 0))
+        self.assertEqual(UserDataHeader.national_languages(bytes.fromhex('03240102')), (0, 2))
+        # truncated elements are ignored
+        self.assertEqual(UserDataHeader.national_languages(bytes.fromhex('0225')), (0, 0))
+
+
+class SMSStatusReportTestCase(unittest.TestCase):
+    def test_decode(self):
+        self.assertEqual(SMSStatusReport.decode(STATUS_REPORT_PDU), {
+            'smsc': {'length': 7, 'toa': {'ton': 'international', 'npi': 'isdn'}, 'number': '46705008999'},
+            'header': {'udhi': False, 'srq': False, 'lp': False, 'mms': True, 'mti': 'status-report'},
+            'message-ref': 42,
+            'recipient': {'length': 11, 'toa': {'ton': 'international', 'npi': 'isdn'}, 'number': '46705930301'},
+            'scts': datetime(2098, 12, 22, 12, 4, 41, tzinfo=timezone.utc),
+            'dt': datetime(2098, 12, 22, 12, 5, 41, tzinfo=timezone.utc),
+            'status': {'value': 0, 'category': 'completed', 'reason': 'received'},
+        })
+        self.assertEqual(SMSStatusReport.decode(STATUS_REPORT_PDU, 'timestamp')['dt'], 4070088341)
+
+    def test_dates(self):
+        # the format of dates is checked even when the TP-DU has none
+        for decode, pdu in ((SMSStatusReport.decode, STATUS_REPORT_PDU), (SMSDeliver.decode, DELIVER_PDU),
+                            (SMSSubmit.decode, SUBMIT_PDU),
+                            (SMSSubmit.decode, '0001000B916407281553F80000')):
+            with self.assertRaisesRegex(ValueError, 'Unknown format of dates "iso"'):
+                decode(pdu, 'iso')
+
+    def test_parameter_indicator(self):
+        # protocol identifier, data coding scheme and user data
+        report = SMSStatusReport.decode(STATUS_REPORT_PDU + '07000004D4E2940A')
+        self.assertEqual((report['pid'], report['dcs'], report['user_data']),
+                         (0, {'encoding': 'gsm'}, {'header': None, 'data': 'TEST'}))
+        # user data only, in the default alphabet, after an extension octet of the parameter indicator
+        report = SMSStatusReport.decode(STATUS_REPORT_PDU + '840004D4E2940A')
+        self.assertEqual(report['user_data']['data'], 'TEST')
+        self.assertNotIn('pid', report)
+        # empty parameter indicator
+        self.assertNotIn('user_data', SMSStatusReport.decode(STATUS_REPORT_PDU + '00'))
+        with self.assertRaises(ValueError):
+            SMSStatusReport.decode(STATUS_REPORT_PDU + '01')
+
+    def test_stream(self):
+        # the parameter indicator is looked for without reading the rest of the stream
+        stream = StringIO(STATUS_REPORT_PDU + '00ZZ')
+        self.assertEqual(SMSStatusReport.decode(stream), SMSStatusReport.decode(STATUS_REPORT_PDU))
+        self.assertEqual(stream.read(), 'ZZ')
+        stream = StringIO(STATUS_REPORT_PDU)
+        self.assertEqual(SMSStatusReport.decode(stream), SMSStatusReport.decode(STATUS_REPORT_PDU))
+        self.assertEqual(stream.tell(), len(STATUS_REPORT_PDU))
+
+    def test_record(self):
+        for pdu in (STATUS_REPORT_PDU, STATUS_REPORT_PDU + '07000004D4E2940A', STATUS_REPORT_PDU + '0400'):
+            record = SMSStatusReport.decode_record(pdu)
+            self.assertEqual(record.to_dict(), SMSStatusReport.decode(pdu))
+        self.assertIs(record.status, SMSStatusReport.decode_record(STATUS_REPORT_PDU).status)
+
+    def test_truncated(self):
+        with self.assertRaises(ValueError):
+            SMSStatusReport.decode(STATUS_REPORT_PDU[:-2])
+
+    def test_status(self):
+        self.assertEqual(Status.decode('02'), {'value': 2, 'category': 'completed', 'reason': 'replaced'})
+        self.assertEqual(Status.decode('65'), {'value': 101, 'category': 'temporary-error', 'reason': 'sme-error'})
+        self.assertEqual(Status.decode('1F'), {'value': 31, 'category': 'completed', 'reason': None})
+        self.assertEqual(Status.decode('80'), {'value': 128, 'category': 'reserved', 'reason': None})
+
+
+class DecodeAnyTestCase(unittest.TestCase):
+    def test_dispatch(self):
+        self.assertEqual(decode_any(DELIVER_PDU), DELIVER_RESULT)
+        self.assertEqual(decode_any(SUBMIT_PDU), SMSSubmit.decode(SUBMIT_PDU))
+        self.assertEqual(decode_any(bytes.fromhex(STATUS_REPORT_PDU), 'incoming', 'timestamp'),
+                         SMSStatusReport.decode(STATUS_REPORT_PDU, 'timestamp'))
+
+    def test_direction(self):
+        self.assertIs(decoder_for_tpdu(DELIVER_PDU, 'incoming'), SMSDeliver)
+        self.assertIs(decoder_for_tpdu(SUBMIT_PDU, 'outgoing'), SMSSubmit)
+        with self.assertRaisesRegex(ValueError, 'Message Type Indicator'):
+            decoder_for_tpdu(SUBMIT_PDU, 'incoming')
+        with self.assertRaisesRegex(ValueError, 'Message Type Indicator'):
+            decode_any(DELIVER_PDU, 'outgoing')
+
+    def test_stream(self):
+        # the stream is left where it was, ready to be decoded
+        stream = StringIO(SUBMIT_PDU)
+        self.assertIs(decoder_for_tpdu(stream), SMSSubmit)
+        self.assertEqual(stream.tell(), 0)
+        self.assertEqual(SMSSubmit.decode(stream), SMSSubmit.decode(SUBMIT_PDU))
+        self.assertEqual(decode_any(StringIO(DELIVER_PDU)), DELIVER_RESULT)
+        with self.assertRaises(ValueError):
+            decode_any(DELIVER_PDU, 'sideways')
+
+    def test_stream(self):
+        stream = StringIO(SUBMIT_PDU + 'FF')
+        self.assertEqual(decode_any(stream)['recipient']['number'], '46708251358')
+        self.assertEqual(stream.read(), 'FF')
+
+    def test_truncated(self):
+        for pdu in ('', '07', '0791'):
+            with self.assertRaisesRegex(ValueError, 'Unexpected end of PDU'):
+                decode_any(pdu)
@@ -0,0 +1,94 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from smspdudecoder.elements import Date
+from smspdudecoder.fields import Address, SMSDeliver, SMSSubmit, _DATE_DECODERS
+from smspdudecoder.instrumentation import Histogram, Hook, Profile, add_hook, instrumented, remove_hook
+
+
+DELIVER_PDU = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+SUBMIT_PDU = '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+
+
+class RecordingHook(Hook):
+    def __init__(self):
+        self.timings = []
+        self.counts = []
+
+    def timing(self, name, nanoseconds):
+        self.timings.append(name)
+
+    def count(self, counter, value):
+        self.counts.append((counter, value))
+
+
+class InstrumentationTestCase(unittest.TestCase):
+    def test_timings(self):
+        with instrumented(RecordingHook()) as hook:
+            SMSDeliver.decode(DELIVER_PDU)
+        self.assertEqual(hook.timings, [
+            'SMSC.read', 'Address.read', 'DCS.read', 'Date.decode_components', 'Date.decode', 'UserData.read',
+            'SMSDeliver.read',
+        ])
+        self.assertEqual(hook.counts, [('ton', 'international'), ('encoding', 'gsm')])
+
+    def test_records(self):
+        pdu = SMSDeliver.encode('MMoney', 'Hello', elements=[(0x00, b'\x01\x02\x01')])
+        with instrumented(Profile()) as profile:
+            SMSDeliver.decode_record(pdu)
+            SMSSubmit.decode(SUBMIT_PDU, 'timestamp')
+        self.assertEqual(profile.counters['ton'], {'alphanumeric': 1, 'international': 1})
+        self.assertEqual(profile.counters['iei'], {0x00: 1})
+        self.assertEqual(profile.histograms['SMSDeliver.read_record'].count, 1)
+        self.assertEqual(profile.histograms['UserDataHeader.read_record'].count, 1)
+        self.assertEqual(profile.histograms['SMSSubmit.read'].count, 1)
+
+    def test_errors(self):
+        with instrumented(Profile()) as profile:
+            for pdu in (DELIVER_PDU[:20] + '11' + DELIVER_PDU[22:], '00'):
+                with self.assertRaises(Exception):
+                    SMSDeliver.decode(pdu)
+        self.assertEqual(profile.counters['error'], {'ValueError': 2})
+        self.assertEqual(profile.histograms['SMSDeliver.read'].count, 2)
+
+    def test_restored(self):
+        methods = dict(vars(Address)), dict(vars(Date)), dict(_DATE_DECODERS)
+        first, second = RecordingHook(), RecordingHook()
+        add_hook(first)
+        add_hook(second)
+        self.assertIsNot(vars(Address)['read'], methods[0]['read'])
+        remove_hook(first)
+        Address.decode('0B915155214365F7')
+        remove_hook(second)
+        self.assertEqual((dict(vars(Address)), dict(vars(Date)), dict(_DATE_DECODERS)), methods)
+        Address.decode('0B915155214365F7')
+        self.assertEqual(first.timings, [])
+        self.assertEqual(second.timings, ['Address.read'])
+        with self.assertRaises(ValueError):
+            remove_hook(second)
+
+    def test_summary(self):
+        with instrumented(Profile()) as profile:
+            for _ in range(10):
+                SMSDeliver.decode(DELIVER_PDU)
+        summary = profile.summary()['SMSDeliver.read']
+        self.assertEqual(summary['count'], 10)
+        self.assertLessEqual(summary['p50'], summary['p99'])
+        self.assertLessEqual(summary['p99'], summary['max'])
+
+
+class HistogramTestCase(unittest.TestCase):
+    def test_empty(self):
+        histogram = Histogram()
+        self.assertEqual((histogram.mean, histogram.quantile(0.5)), (0.0, 0))
+
+    def test_quantiles(self):
+        histogram = Histogram()
+        for nanoseconds in range(1, 101):
+            histogram.add(nanoseconds)
+        self.assertEqual(histogram.buckets[:8], [0, 1, 2, 4, 8, 16, 32, 37])
+        self.assertEqual(histogram.quantile(0.1), 15)
+        self.assertEqual(histogram.quantile(0.99), 100)
+        self.assertEqual((histogram.min, histogram.max), (1, 100))
@@ -0,0 +1,152 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from io import BytesIO, StringIO
+
+from smspdudecoder.modem import ModemError, ModemStreamParser, read_modem_output
+
+
+DELIVER_PDU = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+SUBMIT_PDU = '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+STATUS_REPORT_PDU = '07916407058099F9062A0B916407950303F1892122214014008921222150140000'
+
+
+class ReadModemOutputTestCase(unittest.TestCase):
+    def test_listing(self):
+        output = StringIO(
+            'AT+CMGL=4\r\n'
+            f'+CMGL: 1,0,"John, Doe",24\r\n{DELIVER_PDU}\r\n'
+            f'+CMGL: 7,2,,23\r\n{SUBMIT_PDU}\r\n'
+            '\r\nOK\r\n'
+        )
+        messages = list(read_modem_output(output))
+        self.assertEqual([(index, status) for index, status, _ in messages], [(1, 'rec-unread'), (7, 'sto-unsent')])
+        self.assertEqual(messages[0][2]['sender']['number'], '46705930301')
+        self.assertEqual(messages[1][2]['recipient']['number'], '46708251358')
+
+    def test_binary_stream(self):
+        output = BytesIO(f'+CMGR: 1,,24\r\n{DELIVER_PDU}\r\nOK\r\n+CMT: ,24\r\n{DELIVER_PDU}\r\n'.encode())
+        messages = list(read_modem_output(output))
+        self.assertEqual([(index, status) for index, status, _ in messages], [(None, 'rec-read'), (None, None)])
+
+    def test_lazy(self):
+        def lines():
+            yield '+CMT: ,24'
+            yield DELIVER_PDU
+            raise AssertionError("Should not be read")
+        messages = read_modem_output(lines())
+        self.assertEqual(next(messages)[2]['user_data']['data'], 'TEST')
+
+    def test_status_reports(self):
+        # status reports are stored with a received status, or reported with +CDS
+        output = ['+CMGL: 3,1,,26', STATUS_REPORT_PDU, '+CDS: 26', STATUS_REPORT_PDU, 'OK']
+        messages = list(read_modem_output(output))
+        self.assertEqual([(index, status) for index, status, _ in messages], [(3, 'rec-read'), (None, None)])
+        self.assertEqual([message['status']['reason'] for _, _, message in messages], ['received', 'received'])
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ModemError, '321'):
+            list(read_modem_output(['+CMGR: 1,,24', '+CMS ERROR: 321']))
+        with self.assertRaises(ModemError):
+            list(read_modem_output(['ERROR']))
+
+    def test_invalid_pdu(self):
+        output = ['+CMGL: 1,1,,3', '0011', '+CMGL: 2,1,,24', DELIVER_PDU, 'OK']
+        with self.assertRaises(ValueError):
+            list(read_modem_output(output))
+        self.assertEqual([index for index, _, _ in read_modem_output(output, strict=False)], [2])
+
+    def test_invalid_header(self):
+        # headers of text mode, whose next line is text
+        output = ['+CMGL: 1,"REC READ","+336",,"23"', 'Hello', '+CMGR: "REC READ","+336"', 'Hello',
+                  '+CMGL: 2,1,,24', DELIVER_PDU, 'OK']
+        with self.assertRaisesRegex(ValueError, 'Invalid message header'):
+            list(read_modem_output(output))
+        self.assertEqual([index for index, _, _ in read_modem_output(output, strict=False)], [2])
+        self.assertEqual(len(list(read_modem_output(['+CMT: ,²', DELIVER_PDU]))), 1)
+
+
+class ModemStreamParserTestCase(unittest.TestCase):
+    OUTPUT = (
+        'AT+CMGL=4\r\n'
+        f'+CMGL: 1,0,"John, Doe",23\r\n{DELIVER_PDU}\r\n'
+        f'+CMGL: 7,2,,23\r\n{SUBMIT_PDU}\r\n'
+        '+CMGL: 8,1,,3\r\n0011\r\n'
+        f'+CDS: 26\r\n{STATUS_REPORT_PDU}\r\n'
+        '\r\nOK\r\n+CMS ERROR: 321\r\n'
+    ).encode()
+
+    def feed(self, parser, data, size):
+        events = []
+        for position in range(0, len(data), size):
+            events.extend(parser.feed(data[position:position + size]))
+        return events + parser.feed_eof()
+
+    def test_chunks(self):
+        expected = [('pdu', 1, 'rec-unread', DELIVER_PDU), ('pdu', 7, 'sto-unsent', SUBMIT_PDU),
+                    ('pdu', 8, 'rec-read', '0011'), ('pdu', None, None, STATUS_REPORT_PDU), ('ok',),
+                    ('error', '+CMS ERROR: 321')]
+        for size in (1, 2, 3, 7, 64, len(self.OUTPUT)):
+            self.assertEqual(self.feed(ModemStreamParser(decode=None), self.OUTPUT, size), expected, size)
+
+    def test_decoded(self):
+        events = self.feed(ModemStreamParser(), self.OUTPUT, 5)
+        self.assertEqual([event[:3] for event in events[:4]],
+                         [('message', 1, 'rec-unread'), ('message', 7, 'sto-unsent'), ('invalid', 8, 'rec-read'),
+                          ('message', None, None)])
+        self.assertEqual(events[0][3]['user_data']['data'], 'TEST')
+        self.assertEqual(events[3][3]['status']['reason'], 'received')
+        self.assertEqual(events[2][3], '0011')
+        self.assertIsInstance(events[2][4], ValueError)
+
+    def test_early(self):
+        # PDUs are complete before the end of their line
+        parser = ModemStreamParser(decode=None)
+        self.assertEqual(parser.needed, 1)
+        self.assertEqual(parser.feed(b'+CMT: ,23\r\n'), [])
+        self.assertEqual(parser.needed, 48)
+        self.assertEqual(parser.feed(DELIVER_PDU[:10].encode()), [])
+        self.assertEqual(parser.needed, 52)
+        self.assertEqual(parser.feed(DELIVER_PDU[10:].encode()), [('pdu', None, None, DELIVER_PDU)])
+        self.assertEqual(parser.needed, 1)
+        self.assertEqual(parser.feed(b'\r\nOK'), [])
+        self.assertEqual(parser.feed(b'\r\n'), [('ok',)])
+
+    def test_wrong_length(self):
+        # PDUs are read up to the end of their line when the length of their header is wrong
+        for length in (10, 22, 24, 100):
+            parser = ModemStreamParser(decode=None)
+            self.assertEqual(parser.feed(f'+CMT: ,{length}\r\n{DELIVER_PDU}'.encode()), [])
+            self.assertEqual(parser.feed(b'\n'), [('pdu', None, None, DELIVER_PDU)], length)
+
+    def test_line_too_long(self):
+        parser = ModemStreamParser(max_line_length=100)
+        events = parser.feed(b'+CMGR: 1,,23\r\n' + b'A' * 60)
+        self.assertEqual(events, [])
+        events = parser.feed(b'A' * 60)
+        self.assertEqual(events[0][:4], ('invalid', None, 'rec-read', None))
+        self.assertEqual(parser.feed(b'A' * 1000 + b'\r\nOK\r\n'), [('ok',)])
+
+    def test_invalid_lines(self):
+        parser = ModemStreamParser(decode=None)
+        header = '+CMGL: 1,"REC READ","+336",,"23"'
+        events = parser.feed(f'{header}\r\nHello\r\n+CMT: ,23\r\n{DELIVER_PDU}\r\n'.encode())
+        self.assertEqual([event[:4] for event in events],
+                         [('invalid', None, None, header), ('pdu', None, None, DELIVER_PDU)])
+        self.assertIsInstance(events[0][4], ValueError)
+
+    def test_failing_line(self):
+        # a line that fails to parse is dropped, and does not fail the next chunks
+        parser = ModemStreamParser(decode=None)
+        feed_line = parser._lines.feed_line
+
+        def failing(line):
+            if line.startswith('+CMGR'):
+                raise RuntimeError("Failed")
+            return feed_line(line)
+        parser._lines.feed_line = failing
+        events = parser.feed(b'+CMGR: 1,,23\r\n')
+        self.assertEqual(events[0][:4], ('invalid', None, None, '+CMGR: 1,,23'))
+        self.assertEqual(parser.feed(f'+CMT: ,23\r\n{DELIVER_PDU}\r\n'.encode()), [('pdu', None, None, DELIVER_PDU)])
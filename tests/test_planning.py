@@ -0,0 +1,88 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from smspdudecoder.fields import SMSSubmit
+from smspdudecoder.planning import TRANSLITERATION, capacity, plan_segments, split_units
+
+
+class PlanSegmentsTestCase(unittest.TestCase):
+    def assertPlanEncodes(self, text, **kwargs):
+        # the plan gives the parts that SMSSubmit.encode_parts encodes
+        plan = plan_segments(text, **kwargs)
+        messages = [SMSSubmit.decode(part) for part in SMSSubmit.encode_parts('+33612345678', text, **kwargs)]
+        self.assertEqual([message['dcs']['encoding'] for message in messages], [plan.encoding] * plan.parts_count)
+        self.assertEqual([message['user_data']['data'] for message in messages],
+                         [text[start:end] for start, end in plan.segments])
+        return plan
+
+    def test_single_part(self):
+        for text, encoding, units in (('', 'gsm', 0), ('Hello', 'gsm', 5), ('{€}', 'gsm', 6), ('a' * 160, 'gsm', 160),
+                                      ('Été ☀', 'ucs2', 5), ('😀', 'ucs2', 2)):
+            plan = self.assertPlanEncodes(text)
+            self.assertEqual((plan.encoding, plan.units, plan.segments), (encoding, units, ((0, len(text)),)))
+
+    def test_gsm_parts(self):
+        self.assertEqual(self.assertPlanEncodes('a' * 161).segments, ((0, 153), (153, 161)))
+        self.assertEqual(self.assertPlanEncodes('a' * 306).segments, ((0, 153), (153, 306)))
+        # characters of the extended alphabet take two septets, and are not split
+        plan = self.assertPlanEncodes('a' + '€' * 80)
+        self.assertEqual((plan.units, plan.segments), (161, ((0, 77), (77, 81))))
+        plan = self.assertPlanEncodes('€' * 100, reference_bits=16)
+        self.assertEqual(plan.segments, ((0, 76), (76, 100)))
+
+    def test_ucs2_parts(self):
+        self.assertEqual(self.assertPlanEncodes('ж' * 71).segments, ((0, 67), (67, 71)))
+        # surrogate pairs are not split
+        plan = self.assertPlanEncodes('a' + '😀' * 40)
+        self.assertEqual((plan.units, plan.segments), (81, ((0, 34), (34, 41))))
+        self.assertPlanEncodes('Été ☀ ' * 30 + '😀' * 20, elements=[(0x0A, b'\x01')])
+
+    def test_encoding(self):
+        plan = self.assertPlanEncodes('Hello', encoding='ucs2')
+        self.assertEqual((plan.encoding, plan.units), ('ucs2', 5))
+        self.assertEqual(self.assertPlanEncodes('Hello ' * 30, encoding='gsm').parts_count, 2)
+        with self.assertRaises(ValueError):
+            plan_segments('Привет', encoding='gsm')
+        with self.assertRaises(ValueError):
+            plan_segments('Hello', encoding='binary')
+        with self.assertRaises(ValueError):
+            plan_segments('Hello ' * 30, reference_bits=12)
+
+    def test_language(self):
+        plan = self.assertPlanEncodes('Günaydın, nasılsınız? ' * 10, language='turkish')
+        self.assertEqual((plan.encoding, plan.languages, plan.parts_count), ('gsm', (1, 0), 2))
+        self.assertEqual(plan.elements, [(0x25, b'\x01')])
+        plan = self.assertPlanEncodes('Ağaç è {€}', language='turkish')
+        self.assertEqual(plan.languages, (0, 1))
+        # texts of the default alphabet do not need shift tables
+        plan = self.assertPlanEncodes('Hello', language='turkish')
+        self.assertEqual((plan.languages, plan.elements), ((0, 0), []))
+        # shift tables given by Information Elements
+        plan = self.assertPlanEncodes('Çağrı', elements=[(0x25, b'\x01')])
+        self.assertEqual((plan.encoding, plan.languages, plan.elements), ('gsm', (1, 0), [(0x25, b'\x01')]))
+        self.assertEqual(self.assertPlanEncodes('Привет', language='turkish').encoding, 'ucs2')
+        plan = self.assertPlanEncodes('नमस्ते, आप कैसे हैं? ' * 5, language='hindi')
+        self.assertEqual((plan.encoding, plan.languages, plan.parts_count), ('gsm', (6, 0), 1))
+        with self.assertRaises(ValueError):
+            plan_segments('Hello', language=14)
+
+    def test_transliteration(self):
+        text = '“Ça va?” — Très bien… ' * 4
+        self.assertEqual(plan_segments(text).encoding, 'ucs2')
+        plan = plan_segments(text, transliteration=TRANSLITERATION)
+        self.assertEqual((plan.encoding, plan.text, plan.parts_count), ('gsm', text.translate(TRANSLITERATION), 1))
+        self.assertEqual(plan.text[:20], '"Ça va?" - Très bien')
+        # the text is kept when transliteration does not save parts
+        plan = plan_segments('Été ☀ “ok”', transliteration=TRANSLITERATION)
+        self.assertEqual((plan.encoding, plan.text), ('ucs2', 'Été ☀ “ok”'))
+        plan = plan_segments('Ação', language='portuguese', transliteration=TRANSLITERATION)
+        self.assertEqual((plan.text, plan.languages), ('Ação', (3, 0)))
+
+    def test_split_units(self):
+        self.assertEqual(split_units(b'', 'gsm', 153), [])
+        self.assertEqual(split_units(b'abcdef', 'binary', 4), [(0, 4), (4, 6)])
+        self.assertEqual(split_units('😀a😀'.encode('utf-16be'), 'ucs2', 6), [(0, 6), (6, 10)])
+        self.assertEqual(split_units(b'ab\x1be', 'gsm', 3), [(0, 2), (2, 4)])
+        self.assertEqual(capacity('binary', 6), 134)
@@ -0,0 +1,82 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from smspdudecoder.reassembly import Reassembler
+
+
+def part(content, reference='1-3', number=1, count=3, sender='+33600000000'):
+    return {
+        'sender': sender,
+        'date': number,
+        'content': content,
+        'partial': {'reference': reference, 'parts_count': count, 'part_number': number},
+    }
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ReassemblerTestCase(unittest.TestCase):
+    def test_out_of_order(self):
+        reassembler = Reassembler()
+        self.assertIsNone(reassembler.add(part('c', number=3)))
+        self.assertIsNone(reassembler.add(part('a', number=1)))
+        self.assertIsNone(reassembler.add(part('a', number=1)))
+        self.assertEqual(reassembler.parts_count, 2)
+        sms = reassembler.add(part('b', number=2))
+        self.assertEqual(sms, {'sender': '+33600000000', 'date': 1, 'content': 'abc', 'partial': False})
+        self.assertEqual((len(reassembler), reassembler.parts_count), (0, 0))
+        self.assertEqual((reassembler.completed, reassembler.duplicates, reassembler.dropped), (1, 1, 0))
+
+    def test_groups(self):
+        reassembler = Reassembler()
+        reassembler.add(part('a1', sender='a'))
+        reassembler.add(part('b1', sender='b'))
+        reassembler.add(part('a2', sender='a', number=2))
+        self.assertIsNone(reassembler.add(part('b2', sender='b', number=2, count=2, reference='1-2')))
+        self.assertEqual(len(reassembler), 3)
+        self.assertEqual(reassembler.add(part('a3', sender='a', number=3))['content'], 'a1a2a3')
+
+    def test_binary(self):
+        reassembler = Reassembler()
+        reassembler.add(part(b'\x01', number=1, count=2))
+        self.assertEqual(reassembler.add(part(b'\x02', number=2, count=2))['content'], b'\x01\x02')
+
+    def test_ttl(self):
+        clock = Clock()
+        reassembler = Reassembler(ttl=10, clock=clock)
+        reassembler.add(part('a', sender='a'))
+        clock.now = 5
+        reassembler.add(part('b', sender='b'))
+        clock.now = 9
+        reassembler.add(part('a', sender='a', number=2))
+        clock.now = 16
+        reassembler.expire()
+        self.assertEqual(len(reassembler), 1)
+        self.assertEqual(reassembler.expired, 1)
+        clock.now = 19
+        reassembler.add(part('c', sender='c'))
+        self.assertEqual(len(reassembler), 1)
+        self.assertEqual((reassembler.expired, reassembler.parts_count), (2, 1))
+
+    def test_bounds(self):
+        reassembler = Reassembler(max_groups=2, max_parts=3)
+        reassembler.add(part('a', sender='a'))
+        reassembler.add(part('b', sender='b'))
+        reassembler.add(part('a', sender='a', number=2))
+        reassembler.add(part('c', sender='c'))
+        self.assertEqual(sorted(key[0] for key in reassembler.groups), ['a', 'c'])
+        reassembler.add(part('c', sender='c', number=2))
+        self.assertEqual(sorted(key[0] for key in reassembler.groups), ['c'])
+        self.assertEqual((reassembler.evicted, reassembler.parts_count), (2, 2))
+
+    def test_invalid_part(self):
+        with self.assertRaises(ValueError):
+            Reassembler().add(part('a', number=4))
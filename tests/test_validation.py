@@ -0,0 +1,103 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from datetime import timedelta
+
+from smspdudecoder.fields import SMSDeliver, SMSSubmit
+from smspdudecoder.validation import Verdict, validate
+
+
+DELIVER_PDU = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+SUBMIT_PDU = '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+STATUS_REPORT_PDU = '07916407058099F9062A0B916407950303F1892122214014008921222150140000'
+
+
+class ValidateTestCase(unittest.TestCase):
+    def test_valid(self):
+        pdus = [
+            DELIVER_PDU,
+            SMSDeliver.encode('MMoney', 'Hello', smsc='+33609001390'),
+            SMSDeliver.encode('+33612345678', 'Été ☀', elements=[(0x00, b'\x01\x02\x01')]),
+            SMSDeliver.encode('+33612345678', b'\x00\x01\x02'),
+        ]
+        for pdu in pdus:
+            self.assertEqual(validate(pdu), Verdict(True))
+            self.assertTrue(validate(bytes.fromhex(pdu)))
+            self.assertTrue(validate(memoryview(bytes.fromhex(pdu))))
+
+    def test_valid_submit(self):
+        pdus = [SUBMIT_PDU]
+        pdus.extend(SMSSubmit.encode_parts('+33612345678', 'x' * 200))
+        for validity in (None, 12, timedelta(days=3)):
+            pdus.extend(SMSSubmit.encode_parts('+33612345678', 'Hello', validity=validity))
+        for pdu in pdus:
+            self.assertTrue(validate(pdu, 'submit'), pdu)
+            self.assertFalse(validate(pdu))
+
+    def test_truncated(self):
+        for pdu in (DELIVER_PDU, SMSDeliver.encode('+33612345678', 'Hi', elements=[(0x08, b'\x01\x02\x02\x01')])):
+            for length in range(0, len(pdu), 2):
+                verdict = validate(pdu[:length])
+                self.assertFalse(verdict, length)
+                self.assertLessEqual(verdict.offset, length // 2)
+
+    def test_hex(self):
+        self.assertEqual(validate(DELIVER_PDU[:-1]), (False, 30, "Odd number of hex digits"))
+        self.assertEqual(validate(DELIVER_PDU[:10] + 'G' + DELIVER_PDU[11:]), (False, 5, "Invalid hex digit"))
+
+    def test_lengths(self):
+        # SMS-C information longer than 11 octets
+        self.assertEqual(validate('0C' + DELIVER_PDU[2:]), (False, 0, "SMS-C information too long"))
+        # sender of 33 semi-octets
+        self.assertEqual(validate(DELIVER_PDU[:18] + '21' + DELIVER_PDU[20:]), (False, 9, "Address too long"))
+        # 161 septets
+        self.assertEqual(validate(DELIVER_PDU[:52] + 'A1' + DELIVER_PDU[54:]),
+                         (False, 26, "User Data Length too long"))
+
+    def test_type_of_address(self):
+        self.assertEqual(validate('0711' + DELIVER_PDU[4:]), (False, 1, "Invalid SMS-C type of address"))
+        self.assertEqual(validate(DELIVER_PDU[:20] + '11' + DELIVER_PDU[22:]), (False, 10, "Invalid type of address"))
+
+    def test_message_type(self):
+        self.assertEqual(validate(DELIVER_PDU[:16] + '06' + DELIVER_PDU[18:]),
+                         (False, 8, "Unexpected Message Type Indicator"))
+        self.assertEqual(validate(DELIVER_PDU, 'submit'), (False, 8, "Unexpected Message Type Indicator"))
+        self.assertEqual(validate(DELIVER_PDU[:16] + '07' + DELIVER_PDU[18:], 'any'),
+                         (False, 8, "Unsupported Message Type Indicator"))
+        with self.assertRaises(ValueError):
+            validate(DELIVER_PDU, 'submit-report')
+
+    def test_status_report(self):
+        for pdu in (STATUS_REPORT_PDU, STATUS_REPORT_PDU + '00', STATUS_REPORT_PDU + '07000004D4E2940A',
+                    STATUS_REPORT_PDU + '8100000A'):
+            self.assertTrue(validate(pdu, 'status-report'), pdu)
+            self.assertTrue(validate(pdu, 'any'), pdu)
+        for length in range(0, len(STATUS_REPORT_PDU), 2):
+            self.assertFalse(validate(STATUS_REPORT_PDU[:length], 'status-report'), length)
+        # parameter indicator of a data coding scheme, which is missing
+        self.assertEqual(validate(STATUS_REPORT_PDU + '02', 'status-report'),
+                         (False, 34, "Missing protocol identifier or data coding scheme"))
+        self.assertEqual(validate(STATUS_REPORT_PDU + '070000', 'status-report'),
+                         (False, 36, "Missing User Data Length"))
+        self.assertEqual(validate(STATUS_REPORT_PDU + '07000005D4E2940A', 'status-report'),
+                         (False, 36, "User Data Length exceeds the remaining octets"))
+
+    def test_header(self):
+        pdu = SMSDeliver.encode('+33612345678', 'Hi', elements=[(0x00, b'\x01\x02\x01')])
+        self.assertTrue(validate(pdu))
+        # header length of 9 octets, longer than the 8 octets of user data
+        udl = len(pdu) - 18
+        self.assertEqual(validate(pdu[:udl + 2] + '09' + pdu[udl + 4:]),
+                         (False, udl // 2 + 1, "User Data Header Length exceeds the User Data"))
+        # information element of 4 octets, in a header of 5 octets
+        self.assertEqual(validate(pdu[:udl + 6] + '04' + pdu[udl + 8:]),
+                         (False, udl // 2 + 2, "Information element exceeds the User Data Header"))
+        # concatenation information element of 2 octets
+        pdu = SMSDeliver.encode('+33612345678', 'Hi', elements=[(0x00, b'\x01\x02'), (0x01, b'\x00')])
+        self.assertEqual(validate(pdu)[2], "Invalid length of concatenation information element")
+
+    def test_garbage(self):
+        for pdu in ('', '00', 'FFFFFFFF', 'OK', '+CMTI: "SM",3'):
+            self.assertFalse(validate(pdu), pdu)
@@ -0,0 +1,59 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import random
+import unittest
+
+from smspdudecoder.codecs import GSM
+from smspdudecoder.fields import SMSDeliver
+from smspdudecoder.views import DeliverView
+from smspdudecoder.vectorized import decode_gsm_many, gsm_user_data, has_numpy
+
+
+def _messages():
+    rng = random.Random(0)
+    alphabet = GSM.ALPHABET.replace('\x1b', '') + ''.join(GSM.ALPHABET_EXT.values())
+    pdus = []
+    for length in list(range(0, 20)) + [rng.randrange(150, 400) for _ in range(20)]:
+        text = ''.join(rng.choice(alphabet) for _ in range(length))
+        pdus.extend(SMSDeliver.encode_parts('+33600000000', text, encoding='gsm', reference=rng.randrange(256)))
+    # escapes at the end of the text, and escaped escapes
+    for septets in (b'ab\x1b', b'a\x1b\x1be', b'\x1b\x1b', b'\x1b\x01'):
+        user_data = bytes((len(septets),)) + GSM.pack_septets(septets)
+        pdus.append(SMSDeliver.encode('+33600000000', '')[:-2] + user_data.hex().upper())
+    return pdus
+
+
+class DecodeGSMManyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.pdus = _messages()
+        self.expected = [SMSDeliver.decode(pdu)['user_data']['data'] for pdu in self.pdus]
+        self.buffers, self.counts, self.skips = zip(*[gsm_user_data(DeliverView(pdu)) for pdu in self.pdus])
+        self.assertTrue(any(self.skips))
+
+    def check(self, backend):
+        self.assertEqual(decode_gsm_many(self.buffers, self.counts, self.skips, backend=backend), self.expected)
+        columns = decode_gsm_many(self.buffers, self.counts, self.skips, columnar=True, backend=backend)
+        self.assertEqual(columns.texts(), self.expected)
+        self.assertEqual(len(columns.offsets), len(self.pdus) + 1)
+        self.assertEqual(len(columns.codepoints), sum(map(len, self.expected)))
+        self.assertEqual(decode_gsm_many([], [], backend=backend), [])
+
+    def test_python(self):
+        self.check('python')
+
+    @unittest.skipUnless(has_numpy(), "NumPy is not installed")
+    def test_numpy(self):
+        self.check('numpy')
+
+    def test_default(self):
+        self.assertEqual(decode_gsm_many(self.buffers, self.counts, self.skips), self.expected)
+
+    def test_errors(self):
+        for backend in ('python', 'numpy') if has_numpy() else ('python',):
+            with self.assertRaises(ValueError):
+                decode_gsm_many([b'\x00'], [2], backend=backend)
+        with self.assertRaises(ValueError):
+            decode_gsm_many([b'\x00'], [1, 2])
+        with self.assertRaises(ValueError):
+            decode_gsm_many([b'\x00'], [1], backend='fortran')
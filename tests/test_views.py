@@ -0,0 +1,52 @@
+# Copyright (c) Qotto, 2018-2023
+# Open-source software, see LICENSE file for details
+
+import unittest
+
+from smspdudecoder.fields import SMSDeliver, SMSSubmit
+from smspdudecoder.views import DeliverView, SubmitView
+
+
+DELIVER_PDU = '07916407058099F9040B916407950303F100008921222140140004D4E2940A'
+CONCATENATED_PDU = (
+    '0791448720003023440C91449703529096000050015132532240A00500037A020190E9339A9D3EA3E920FA1B1466B341E47219'
+    '3E079DD3EE73D85DA7EB41E7B41C1407C1CBF43228CC26E3416137390F3AABCFEAB3FAAC3EABCFEAB3FAAC3EABCFEAB3FAAC3E'
+    'ABCFEAB3FADC3EB7CFED73FBDC3EBF5D4416D9457411596457137D87B7E16438194E86BBCF6D16D9055D429548A28BE822BA88'
+    '2E6370196C2A8950E291E822BA88'
+)
+SUBMIT_PDU = '0011000B916407281553F80000AA0AE8329BFD4697D9EC37'
+
+
+class DeliverViewTestCase(unittest.TestCase):
+    def test_to_dict(self):
+        for pdu in (DELIVER_PDU, CONCATENATED_PDU):
+            self.assertEqual(DeliverView(pdu).to_dict(), SMSDeliver.decode(pdu))
+            self.assertEqual(DeliverView(bytes.fromhex(pdu)).to_dict(), SMSDeliver.decode(pdu))
+
+    def test_lazy(self):
+        view = DeliverView(CONCATENATED_PDU)
+        self.assertEqual(view.concatenation, {'reference': 122, 'parts_count': 2, 'part_number': 1})
+        self.assertNotIn('user_data', view.__dict__)
+        self.assertNotIn('sender', view.__dict__)
+        self.assertEqual(view.sender['number'], '447930250969')
+        self.assertIs(view.sender, view.sender)
+        self.assertIsNone(DeliverView(DELIVER_PDU).concatenation)
+
+    def test_user_data_octets(self):
+        self.assertEqual(bytes(DeliverView(DELIVER_PDU).user_data_octets), bytes.fromhex('D4E2940A'))
+
+    def test_truncated(self):
+        with self.assertRaises(ValueError):
+            DeliverView(DELIVER_PDU[:30])
+        with self.assertRaises(ValueError):
+            DeliverView(DELIVER_PDU[:-10])
+
+
+class SubmitViewTestCase(unittest.TestCase):
+    def test_to_dict(self):
+        self.assertEqual(SubmitView(SUBMIT_PDU).to_dict(), SMSSubmit.decode(SUBMIT_PDU))
+
+    def test_fields(self):
+        view = SubmitView(SUBMIT_PDU)
+        self.assertEqual((view.vpf, view.vp, view.message_ref), (2, 0xAA, 0))
+        self.assertEqual(view.text, 'hellohello')